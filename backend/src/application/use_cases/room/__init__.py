@@ -3,6 +3,7 @@ from .create_room import CreateRoomUseCase
 from .join_room import JoinRoomUseCase
 from .leave_room import LeaveRoomUseCase
 from .get_room_info import GetRoomInfoUseCase
+from .get_room_snapshot import GetRoomSnapshotUseCase
 from .list_active_rooms import ListActiveRoomsUseCase
 
 __all__ = [
@@ -10,5 +11,6 @@ __all__ = [
     "JoinRoomUseCase",
     "LeaveRoomUseCase",
     "GetRoomInfoUseCase",
+    "GetRoomSnapshotUseCase",
     "ListActiveRoomsUseCase",
 ]
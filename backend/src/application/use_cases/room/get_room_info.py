@@ -1,6 +1,6 @@
 """Get room info use case"""
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 from ....domain.entities.room import Room
 from ....domain.repositories.room_repository import RoomRepository
 from ....domain.exceptions import RoomNotFoundException
@@ -12,15 +12,22 @@ class GetRoomInfoUseCase:
     def __init__(self, room_repository: RoomRepository):
         self.room_repository = room_repository
 
-    async def execute(self, room_id: UUID) -> tuple[Room, List[int]]:
+    async def execute(
+        self,
+        room_id: UUID,
+        known_version: Optional[int] = None
+    ) -> tuple[Room, Optional[List[int]]]:
         """
         Get room information with participants
 
         Args:
             room_id: ID of the room
+            known_version: Room version the caller already has, if any
 
         Returns:
-            Tuple of (Room entity, list of participant user IDs)
+            Tuple of (Room entity, list of participant user IDs). The
+            participants are not loaded, and None, if the room is still at
+            known_version.
 
         Raises:
             RoomNotFoundException: If room doesn't exist
@@ -28,6 +35,8 @@ class GetRoomInfoUseCase:
         room = await self.room_repository.get_by_id(room_id)
         if not room:
             raise RoomNotFoundException(f"Room with id {room_id} not found")
+        if room.version == known_version:
+            return room, None
 
         participants = await self.room_repository.get_participants(room_id)
 
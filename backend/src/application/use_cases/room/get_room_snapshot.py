@@ -0,0 +1,32 @@
+"""Get room snapshot use case"""
+from uuid import UUID
+from typing import List
+from ....domain.entities.room import Room, RoomParticipant
+from ....domain.repositories.room_repository import RoomRepository
+from ....domain.exceptions import RoomNotFoundException
+
+
+class GetRoomSnapshotUseCase:
+    """Use case for getting a room together with its participants' profiles"""
+
+    def __init__(self, room_repository: RoomRepository):
+        self.room_repository = room_repository
+
+    async def execute(self, room_id: UUID) -> tuple[Room, List[RoomParticipant]]:
+        """
+        Get room with the profiles and join times of its participants
+
+        Args:
+            room_id: ID of the room
+
+        Returns:
+            Tuple of (Room entity, participants in join order)
+
+        Raises:
+            RoomNotFoundException: If room doesn't exist
+        """
+        snapshot = await self.room_repository.get_with_participants(room_id)
+        if snapshot is None:
+            raise RoomNotFoundException(f"Room with id {room_id} not found")
+
+        return snapshot
@@ -1,5 +1,5 @@
 """List active rooms use case"""
-from typing import List
+from typing import List, Tuple
 from ....domain.entities.room import Room
 from ....domain.repositories.room_repository import RoomRepository
 
@@ -10,11 +10,13 @@ class ListActiveRoomsUseCase:
     def __init__(self, room_repository: RoomRepository):
         self.room_repository = room_repository
 
-    async def execute(self) -> List[Room]:
+    async def execute(self) -> List[Tuple[Room, List[int]]]:
         """
-        List all active rooms
+        List all active rooms with their participants
 
         Returns:
-            List of active room entities
+            List of (Room entity, list of participant user IDs)
         """
-        return await self.room_repository.list_active()
+        rooms = await self.room_repository.list_active()
+        participants = await self.room_repository.get_participants_many([room.id for room in rooms])
+        return [(room, participants[room.id]) for room in rooms]
@@ -1,7 +1,7 @@
 """Create user use case"""
+from typing import Tuple
 from ....domain.entities.user import User
 from ....domain.repositories.user_repository import UserRepository
-from ....domain.exceptions import UserAlreadyExistsException
 from ...dto.user_dto import CreateUserDTO
 
 
@@ -9,14 +9,14 @@ class CreateUserUseCase:
     """
     Use case for creating or retrieving a user
 
-    If user with telegram_id already exists, returns existing user.
-    Otherwise creates new user.
+    If user with telegram_id already exists, returns existing user with
+    its profile refreshed from the given data. Otherwise creates new user.
     """
 
     def __init__(self, user_repository: UserRepository):
         self.user_repository = user_repository
 
-    async def execute(self, dto: CreateUserDTO) -> User:
+    async def execute(self, dto: CreateUserDTO) -> Tuple[User, bool]:
         """
         Create or get existing user
 
@@ -24,17 +24,11 @@ class CreateUserUseCase:
             dto: User creation data
 
         Returns:
-            User entity
+            Tuple of (User entity, True if the user was just created)
 
         Raises:
             ValueError: If user data is invalid
         """
-        # Check if user already exists
-        existing_user = await self.user_repository.get_by_telegram_id(dto.telegram_id)
-        if existing_user:
-            return existing_user
-
-        # Create new user
         user = User(
             telegram_id=dto.telegram_id,
             username=dto.username,
@@ -44,5 +38,5 @@ class CreateUserUseCase:
             is_online=False
         )
 
-        created_user = await self.user_repository.create(user)
-        return created_user
+        # Single atomic insert-or-update, safe against concurrent logins
+        return await self.user_repository.upsert(user)
@@ -1,5 +1,5 @@
 """Get user use case"""
-from typing import Optional
+from typing import List, Optional
 from ....domain.entities.user import User
 from ....domain.repositories.user_repository import UserRepository
 from ....domain.exceptions import UserNotFoundException
@@ -29,6 +29,18 @@ class GetUserUseCase:
             raise UserNotFoundException(f"User with id {user_id} not found")
         return user
 
+    async def execute_many(self, user_ids: List[int]) -> List[User]:
+        """
+        Get several users by internal ID
+
+        Args:
+            user_ids: Internal user IDs
+
+        Returns:
+            Users in the order of user_ids, without unknown IDs
+        """
+        return await self.user_repository.get_many(user_ids)
+
     async def execute_by_telegram_id(self, telegram_id: int) -> User:
         """
         Get user by Telegram ID
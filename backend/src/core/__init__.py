@@ -1,12 +1,14 @@
 """Core application configuration and utilities"""
-from .config import settings, Settings
-from .logger import get_logger, logger
-from . import security
+from .config import settings, Settings, get_settings
+from .logger import get_logger, logger, configure_logging
 
+# security is imported as a submodule (from .core import security): it
+# builds caches sized from settings, so importing it here would load them
 __all__ = [
     "settings",
     "Settings",
+    "get_settings",
     "get_logger",
     "logger",
-    "security",
+    "configure_logging",
 ]
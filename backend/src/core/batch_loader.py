@@ -0,0 +1,87 @@
+"""Coalescing of lookups made in the same event loop tick"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Iterable, List, Optional, Set, Tuple, TypeVar
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class BatchLoader(Generic[K, V]):
+    """
+    Loads values by key in batches
+
+    load() calls made before the event loop next runs scheduled callbacks,
+    e.g. from coroutines gathered together, are collected and answered by
+    one batch_load call with the distinct keys. Results are kept for the
+    loader's lifetime, so a loader should be scoped to one request or
+    session; writes must clear() the keys they change.
+
+    Attributes:
+        batch_load: Coroutine function mapping keys to the values found
+        max_batch_size: Largest number of keys passed to one batch_load call
+    """
+
+    def __init__(
+        self,
+        batch_load: Callable[[List[K]], Awaitable[Dict[K, V]]],
+        max_batch_size: int = 500
+    ):
+        self.batch_load = batch_load
+        self.max_batch_size = max_batch_size
+        # key -> future of its value, once requested
+        self._futures: Dict[K, asyncio.Future] = {}
+        self._queue: List[Tuple[K, asyncio.Future]] = []
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+
+    async def load(self, key: K) -> Optional[V]:
+        """Get the value of a key, None if not found"""
+        future = self._futures.get(key)
+        if future is None:
+            future = self._enqueue(key)
+        # Other callers may share the future; a cancelled caller must not cancel it
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[K]) -> List[Optional[V]]:
+        """Get the values of several keys in order, None for those not found"""
+        futures = [self._futures.get(key) or self._enqueue(key) for key in keys]
+        return [await asyncio.shield(future) for future in futures]
+
+    def clear(self, key: K) -> None:
+        """Forget the value of a key, so that the next load fetches it again"""
+        self._futures.pop(key, None)
+
+    def _enqueue(self, key: K) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = self._futures[key] = loop.create_future()
+        if not self._queue:
+            loop.call_soon(self._dispatch)
+        self._queue.append((key, future))
+        return future
+
+    def _dispatch(self) -> None:
+        """Start batch loads for the keys queued during this tick"""
+        queued, self._queue = self._queue, []
+        for start in range(0, len(queued), self.max_batch_size):
+            task = asyncio.ensure_future(self._load_batch(queued[start:start + self.max_batch_size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _load_batch(self, queued: List[Tuple[K, asyncio.Future]]) -> None:
+        self.batches += 1
+        try:
+            values = await self.batch_load([key for key, _ in queued])
+        except Exception as e:
+            for key, future in queued:
+                if self._futures.get(key) is future:
+                    # Let a later load retry
+                    del self._futures[key]
+                if not future.done():
+                    future.set_exception(e)
+                    # Mark as retrieved in case nobody awaits it any more
+                    future.exception()
+            return
+
+        for key, future in queued:
+            if not future.done():
+                future.set_result(values.get(key))
@@ -1,5 +1,6 @@
 """Application configuration"""
-from typing import List
+from functools import lru_cache
+from typing import Any, List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,21 +14,122 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
 
+    # Entity cache (in-process LRU + Redis)
+    CACHE_ENABLED: bool = True
+    CACHE_LOCAL_MAX_SIZE: int = 10_000
+    CACHE_LOCAL_TTL_SECONDS: int = 30
+    CACHE_REDIS_TTL_SECONDS: int = 300
+
+    # Bulk user lookups: most IDs per GET /users?ids= and per batched query
+    USERS_BATCH_MAX_IDS: int = 100
+
+    # Room reconciler (closes DB participations without a live socket)
+    ROOM_RECONCILER_ENABLED: bool = True
+    ROOM_RECONCILER_INTERVAL_SECONDS: int = 60
+    ROOM_RECONCILER_GRACE_SECONDS: int = 120
+    ROOM_RECONCILER_BATCH_SIZE: int = 500
+    ROOM_RECONCILER_MAX_BATCHES: int = 20
+
+    # Call session persistence
+    CALL_SESSION_FLUSH_INTERVAL_SECONDS: float = 2.0
+    CALL_SESSION_BATCH_SIZE: int = 500
+    CALL_SESSION_MAX_PENDING: int = 50_000
+
+    # Call quality stats aggregation
+    CALL_STATS_MAX_ROOMS: int = 10_000
+    CALL_STATS_MAX_PAIRS_PER_ROOM: int = 64
+    CALL_STATS_RELATIVE_ACCURACY: float = 0.01
+
+    # Mesh negotiation (server picks the offerer of every peer pair)
+    SIGNALING_MAX_MESH_SIZE: int = 8
+    SIGNALING_OFFER_STAGGER_MS: int = 150
+    SIGNALING_PENDING_OFFER_TIMEOUT_SECONDS: float = 10.0
+
+    # Outbound priority lanes: control, SDP, ICE, background (weighted round robin)
+    OUTBOUND_LANE_WEIGHTS: List[int] = [8, 4, 2, 1]
+    OUTBOUND_MAX_PENDING: int = 1000
+
+    # Inbound pipeline: messages to different peers are handled concurrently
+    INBOUND_MAX_PENDING: int = 64
+    INBOUND_DRAIN_TIMEOUT_SECONDS: float = 1.0
+
+    # Lobby subscriptions (subscribe-rooms): room list changes are pushed once per window
+    ROOM_FEED_WINDOW_SECONDS: float = 0.25
+
+    # Call invitations; offline callees get a message from the bot
+    CALL_INVITE_MAX_USERS: int = 7
+    CALL_INVITE_NOTIFICATIONS_ENABLED: bool = True
+    # Invite button link, {room_id} is replaced (e.g. https://t.me/<bot>/<app>?startapp={room_id})
+    CALL_INVITE_URL: Optional[str] = None
+    TELEGRAM_API_URL: str = "https://api.telegram.org"
+    NOTIFICATION_PER_CHAT_INTERVAL_SECONDS: float = 1.0
+    NOTIFICATION_MAX_PER_SECOND: float = 25.0
+    NOTIFICATION_BATCH_SIZE: int = 25
+    NOTIFICATION_MAX_ATTEMPTS: int = 5
+    NOTIFICATION_DEDUP_TTL_SECONDS: int = 300
+    NOTIFICATION_MAX_PENDING: int = 10_000
+
+    # Admission control: new sockets get 1013 with a retry hint while overloaded
+    ADMISSION_MAX_CONNECTIONS: int = 10_000
+    ADMISSION_MAX_LOOP_LAG_MS: float = 50.0
+    ADMISSION_MAX_DB_POOL_UTILIZATION: float = 0.9
+    ADMISSION_ACCEPTS_PER_SECOND: float = 200.0
+    ADMISSION_RETRY_AFTER_MIN_SECONDS: float = 2.0
+    ADMISSION_RETRY_AFTER_MAX_SECONDS: float = 60.0
+    # Online status writes, postponed while overloaded
+    PRESENCE_FLUSH_INTERVAL_SECONDS: float = 1.0
+    PRESENCE_BATCH_SIZE: int = 1000
+    PRESENCE_MAX_DEFER_SECONDS: float = 30.0
+
+    # Graceful drain before restarts (POST /ws/drain)
+    DRAIN_RECONNECT_MAX_DELAY_SECONDS: float = 10.0
+    DRAIN_SEND_TIMEOUT_SECONDS: float = 5.0
+    # Room membership handed over to the next process through Redis
+    ROOM_SNAPSHOT_ENABLED: bool = True
+    ROOM_SNAPSHOT_TTL_SECONDS: int = 120
+
+    # Tracing of signaling frames, written as OTLP/JSON lines
+    TRACING_SAMPLE_RATIO: float = 0.0
+    TRACING_EXPORTER: str = "file"  # file, console or none
+    TRACING_FILE_PATH: str = "logs/traces.jsonl"
+
+    # Event loop diagnostics (GET /admin/loop-lag, GET /admin/profile)
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.25
+    LOOP_MONITOR_STALL_THRESHOLD_SECONDS: float = 0.1
+    LOOP_MONITOR_WINDOW_SECONDS: float = 60.0
+    PROFILER_MAX_SECONDS: float = 60.0
+
     # TURN/STUN Configuration
     TURN_URLS: List[str] = ["turn:localhost:3478"]
     STUN_URLS: List[str] = ["stun:stun.l.google.com:19302"]
+    # Static credentials, only used when TURN_SECRET is not set
     TURN_USERNAME: str = "username"
     TURN_PASSWORD: str = "password"
+    # coturn static-auth-secret for time-limited credentials (use-auth-secret)
+    TURN_SECRET: Optional[str] = None
+    TURN_CREDENTIAL_TTL_SECONDS: int = 60 * 60 * 12  # 12 hours
+    TURN_CREDENTIAL_CACHE_SIZE: int = 10_000
+    # Client cache lifetime of GET /config when it does not hold per-user credentials
+    CONFIG_CACHE_MAX_AGE_SECONDS: int = 60 * 60
 
     # Security
     SECRET_KEY: str
     TELEGRAM_BOT_TOKEN: str
+    TELEGRAM_INIT_DATA_MAX_AGE_SECONDS: int = 60 * 60 * 24  # 1 day
+    TELEGRAM_INIT_DATA_CACHE_SIZE: int = 10_000
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 1 week
+    ACCESS_TOKEN_CACHE_SIZE: int = 10_000
+    ACCESS_TOKEN_CACHE_TTL_SECONDS: int = 300
+    # Shared secret for operator endpoints (X-Admin-Token); disabled if unset
+    ADMIN_TOKEN: Optional[str] = None
 
     # CORS
     ALLOWED_ORIGINS: List[str] = ["*"]
@@ -39,5 +141,18 @@ class Settings(BaseSettings):
     )
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load settings from the environment on first use"""
+    return Settings()
+
+
+class _LazySettings:
+    """Proxy that defers loading Settings until an attribute is first read"""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_settings(), name)
+
+
+# Global settings instance, loaded on first attribute access
+settings: Settings = _LazySettings()  # type: ignore[assignment]
@@ -1,19 +1,36 @@
 """Dependency injection for FastAPI"""
-from typing import AsyncGenerator
-from fastapi import Depends
+from typing import AsyncGenerator, Optional
+import hmac
+from fastapi import Depends, Header, HTTPException, status
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..infrastructure.database.base import get_db
 from ..infrastructure.database.repositories.user_repository_impl import UserRepositoryImpl
 from ..infrastructure.database.repositories.room_repository_impl import RoomRepositoryImpl
+from ..infrastructure.cache import (
+    entity_cache,
+    CachedUserRepository,
+    CachedRoomRepository,
+    BatchingUserRepository,
+)
+from ..infrastructure.websocket import PublishingRoomRepository, room_feed
 from ..application.use_cases.user.create_user import CreateUserUseCase
 from ..application.use_cases.user.get_user import GetUserUseCase
 from ..application.use_cases.user.list_online_users import ListOnlineUsersUseCase
 from ..application.use_cases.room.create_room import CreateRoomUseCase
 from ..application.use_cases.room.get_room_info import GetRoomInfoUseCase
+from ..application.use_cases.room.get_room_snapshot import GetRoomSnapshotUseCase
 from ..application.use_cases.room.list_active_rooms import ListActiveRoomsUseCase
 from ..application.use_cases.room.join_room import JoinRoomUseCase
 from ..application.use_cases.room.leave_room import LeaveRoomUseCase
+from ..domain.repositories.user_repository import UserRepository
+from ..domain.repositories.room_repository import RoomRepository
+from .config import settings
+from .security import get_user_id_from_token
+
+# Bearer token extractor (errors are raised by get_current_user_id)
+bearer_scheme = HTTPBearer(auto_error=False)
 
 
 # Database session dependency
@@ -23,68 +40,148 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+# Auth dependencies
+async def get_current_user_id(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+) -> int:
+    """
+    Get authenticated user ID from bearer token
+
+    Identity comes from the token alone, without a database lookup.
+    """
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    user_id = get_user_id_from_token(credentials.credentials)
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user_id
+
+
+async def get_optional_current_user_id(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+) -> Optional[int]:
+    """Get user ID from bearer token if a valid one is present"""
+    if credentials is None:
+        return None
+    return get_user_id_from_token(credentials.credentials)
+
+
+async def require_admin_token(
+    x_admin_token: Optional[str] = Header(None, description="Operator token (ADMIN_TOKEN)")
+) -> None:
+    """
+    Allow operator endpoints only with the configured ADMIN_TOKEN
+
+    Operator endpoints are hidden (404) while ADMIN_TOKEN is not set.
+    """
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
+
+
+def build_user_repository(session: AsyncSession) -> UserRepository:
+    """
+    Build user repository, wrapped in the entity cache if enabled
+
+    ID lookups made together through the repository are batched into
+    one query, see BatchingUserRepository.
+    """
+    repository: UserRepository = UserRepositoryImpl(session)
+    if settings.CACHE_ENABLED:
+        repository = CachedUserRepository(repository, entity_cache)
+    return BatchingUserRepository(repository, max_batch_size=settings.USERS_BATCH_MAX_IDS)
+
+
+def build_room_repository(session: AsyncSession) -> RoomRepository:
+    """
+    Build room repository, wrapped in the entity cache if enabled
+
+    Committed room changes are published to lobby subscribers, see
+    RoomFeed.
+    """
+    repository: RoomRepository = RoomRepositoryImpl(session)
+    if settings.CACHE_ENABLED:
+        repository = CachedRoomRepository(repository, entity_cache)
+    return PublishingRoomRepository(repository, session, room_feed)
+
+
 # User dependencies
 async def get_user_repository(
     session: AsyncSession = Depends(get_db_session)
-) -> AsyncGenerator[UserRepositoryImpl, None]:
+) -> AsyncGenerator[UserRepository, None]:
     """Get user repository instance"""
-    yield UserRepositoryImpl(session)
+    yield build_user_repository(session)
 
 
+# User use cases share the request's repository, and with it its batching loader
 async def get_create_user_use_case(
-    session: AsyncSession = Depends(get_db_session)
+    user_repo: UserRepository = Depends(get_user_repository)
 ) -> AsyncGenerator[CreateUserUseCase, None]:
     """Get CreateUser use case instance"""
-    user_repo = UserRepositoryImpl(session)
     yield CreateUserUseCase(user_repo)
 
 
 async def get_get_user_use_case(
-    session: AsyncSession = Depends(get_db_session)
+    user_repo: UserRepository = Depends(get_user_repository)
 ) -> AsyncGenerator[GetUserUseCase, None]:
     """Get GetUser use case instance"""
-    user_repo = UserRepositoryImpl(session)
     yield GetUserUseCase(user_repo)
 
 
 async def get_list_online_users_use_case(
-    session: AsyncSession = Depends(get_db_session)
+    user_repo: UserRepository = Depends(get_user_repository)
 ) -> AsyncGenerator[ListOnlineUsersUseCase, None]:
     """Get ListOnlineUsers use case instance"""
-    user_repo = UserRepositoryImpl(session)
     yield ListOnlineUsersUseCase(user_repo)
 
 
 # Room dependencies
 async def get_room_repository(
     session: AsyncSession = Depends(get_db_session)
-) -> AsyncGenerator[RoomRepositoryImpl, None]:
+) -> AsyncGenerator[RoomRepository, None]:
     """Get room repository instance"""
-    yield RoomRepositoryImpl(session)
+    yield build_room_repository(session)
 
 
 async def get_create_room_use_case(
     session: AsyncSession = Depends(get_db_session)
 ) -> AsyncGenerator[CreateRoomUseCase, None]:
     """Get CreateRoom use case instance"""
-    room_repo = RoomRepositoryImpl(session)
-    user_repo = UserRepositoryImpl(session)
-    yield CreateRoomUseCase(room_repo, user_repo)
+    room_repo = build_room_repository(session)
+    yield CreateRoomUseCase(room_repo)
 
 
 async def get_get_room_info_use_case(
     session: AsyncSession = Depends(get_db_session)
 ) -> AsyncGenerator[GetRoomInfoUseCase, None]:
     """Get GetRoomInfo use case instance"""
-    room_repo = RoomRepositoryImpl(session)
+    room_repo = build_room_repository(session)
     yield GetRoomInfoUseCase(room_repo)
 
 
+async def get_get_room_snapshot_use_case(
+    session: AsyncSession = Depends(get_db_session)
+) -> AsyncGenerator[GetRoomSnapshotUseCase, None]:
+    """Get GetRoomSnapshot use case instance"""
+    room_repo = build_room_repository(session)
+    yield GetRoomSnapshotUseCase(room_repo)
+
+
 async def get_list_active_rooms_use_case(
     session: AsyncSession = Depends(get_db_session)
 ) -> AsyncGenerator[ListActiveRoomsUseCase, None]:
     """Get ListActiveRooms use case instance"""
-    room_repo = RoomRepositoryImpl(session)
+    room_repo = build_room_repository(session)
     yield ListActiveRoomsUseCase(room_repo)
 
 
@@ -92,14 +189,14 @@ async def get_join_room_use_case(
     session: AsyncSession = Depends(get_db_session)
 ) -> AsyncGenerator[JoinRoomUseCase, None]:
     """Get JoinRoom use case instance"""
-    room_repo = RoomRepositoryImpl(session)
-    user_repo = UserRepositoryImpl(session)
-    yield JoinRoomUseCase(room_repo, user_repo)
+    room_repo = build_room_repository(session)
+    # Same limit as the signaling mesh the room's call runs in
+    yield JoinRoomUseCase(room_repo, max_participants=settings.SIGNALING_MAX_MESH_SIZE)
 
 
 async def get_leave_room_use_case(
     session: AsyncSession = Depends(get_db_session)
 ) -> AsyncGenerator[LeaveRoomUseCase, None]:
     """Get LeaveRoom use case instance"""
-    room_repo = RoomRepositoryImpl(session)
+    room_repo = build_room_repository(session)
     yield LeaveRoomUseCase(room_repo)
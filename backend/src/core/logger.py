@@ -3,32 +3,50 @@ import logging
 import sys
 from pathlib import Path
 
-# Create logs directory if it doesn't exist
-log_dir = Path("logs")
-log_dir.mkdir(exist_ok=True)
-
 # Configure logging format
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
-# Create formatter
-formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
+_configured = False
+
+
+def configure_logging(log_dir: Path = Path("logs")) -> None:
+    """
+    Attach console and file handlers to the root logger
+
+    Called from the application lifespan rather than at import, so that
+    importing modules has no filesystem side effects. Safe to call more
+    than once.
+    """
+    global _configured
+    if _configured:
+        return
+
+    # Create logs directory if it doesn't exist
+    log_dir.mkdir(exist_ok=True)
+
+    # Create formatter
+    formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
+
+    # Console handler
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(formatter)
+    console_handler.setLevel(logging.INFO)
 
-# Console handler
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setFormatter(formatter)
-console_handler.setLevel(logging.INFO)
+    # File handler
+    file_handler = logging.FileHandler(log_dir / "app.log")
+    file_handler.setFormatter(formatter)
+    file_handler.setLevel(logging.DEBUG)
 
-# File handler
-file_handler = logging.FileHandler(log_dir / "app.log")
-file_handler.setFormatter(formatter)
-file_handler.setLevel(logging.DEBUG)
+    # Configure root logger
+    logging.basicConfig(
+        level=logging.INFO,
+        handlers=[console_handler, file_handler]
+    )
+    # httpx logs every request URL at INFO; Bot API URLs contain the bot token
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    _configured = True
 
-# Configure root logger
-logging.basicConfig(
-    level=logging.INFO,
-    handlers=[console_handler, file_handler]
-)
 
 # Get logger function
 def get_logger(name: str) -> logging.Logger:
@@ -0,0 +1,260 @@
+"""
+Event loop diagnostics: on-demand sampling profiler and loop lag monitor
+
+The lag monitor costs the loop a short sleep per measurement and takes
+stack snapshots from a watchdog thread; the profiler only runs on demand.
+"""
+import asyncio
+import heapq
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .logger import get_logger
+from .sketch import QuantileSketch
+
+logger = get_logger(__name__)
+
+
+def _frame_label(code) -> str:
+    """Label of a function in a folded stack, e.g. handle_message (websocket/signaling_handler.py:52)"""
+    path = code.co_filename
+    parent, name = os.path.split(path)
+    return f"{code.co_name} ({os.path.basename(parent)}/{name}:{code.co_firstlineno})"
+
+
+def _fold_stack(frame) -> str:
+    """Stack of a frame, outermost first, joined with ';'"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return ";".join(labels)
+
+
+class ProfilerBusyError(Exception):
+    """Raised when a profile is requested while another one is running"""
+
+
+class ProfilerUnavailableError(Exception):
+    """Raised when the event loop cannot be profiled in this process"""
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler of the event loop thread
+
+    An interval timer on consumed CPU time (ITIMER_PROF) interrupts the
+    loop thread, and the signal handler counts the interrupted stack.
+    Sampling from another thread would only ever see the loop where it
+    releases the GIL, i.e. waiting in select(). The result is in the
+    folded format ("a;b;c count" per line) read by flamegraph.pl, inferno
+    and speedscope. Only one profile runs at a time and its duration is
+    capped, so it is safe to expose to operators in production.
+
+    Signals are delivered to the main thread, so the loop must run there
+    (as under uvicorn) on a platform with setitimer().
+
+    Attributes:
+        max_seconds: Longest profile allowed
+    """
+
+    def __init__(self, max_seconds: float = 60.0, min_interval: float = 0.001):
+        self.max_seconds = max_seconds
+        self.min_interval = min_interval
+        self.running = False
+
+    async def profile_loop(self, seconds: float, interval: float = 0.005) -> str:
+        """
+        Profile the running event loop for a number of seconds
+
+        Args:
+            seconds: Profile duration, capped at max_seconds
+            interval: CPU time between samples
+
+        Returns:
+            Profile in the folded format
+        """
+        if self.running:
+            raise ProfilerBusyError("A profile is already running")
+        if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+            raise ProfilerUnavailableError("The event loop does not run in the main thread")
+
+        stacks: Counter = Counter()
+
+        def on_sample(signum, frame) -> None:
+            stacks[_fold_stack(frame)] += 1
+
+        interval = max(interval, self.min_interval)
+        self.running = True
+        previous = signal.signal(signal.SIGPROF, on_sample)
+        try:
+            signal.setitimer(signal.ITIMER_PROF, interval, interval)
+            await asyncio.sleep(min(max(seconds, 0.0), self.max_seconds))
+        finally:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, previous)
+            self.running = False
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+@dataclass(order=True)
+class LoopStall:
+    """Period in which the event loop did not run scheduled callbacks"""
+    duration_ms: float
+    at: float = field(compare=False)
+    # Stack of the loop thread while it was stalled, innermost last
+    stack: List[str] = field(compare=False, default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"duration_ms": round(self.duration_ms, 1), "at": self.at, "stack": self.stack}
+
+
+class LoopLagMonitor:
+    """
+    Measures how late the event loop runs scheduled callbacks
+
+    A task sleeps for interval and records how much later than requested
+    it woke up; the lag of a healthy loop is well under a millisecond.
+    Percentiles cover the current and previous window of window_seconds.
+
+    A watchdog thread checks that the task woke up in time. When the
+    loop is stalled for longer than stall_threshold, the watchdog takes a
+    snapshot of the loop thread's stack, which shows the callback that
+    blocks it; the stall is logged with the stack once the loop recovers,
+    and the slowest max_stalls are kept for stats().
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.25,
+        stall_threshold: float = 0.1,
+        window_seconds: float = 60.0,
+        max_stalls: int = 20,
+        stack_depth: int = 30
+    ):
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.window_seconds = window_seconds
+        self.max_stalls = max_stalls
+        self.stack_depth = stack_depth
+        self._current = QuantileSketch()
+        self._previous = QuantileSketch()
+        self._window_started = time.monotonic()
+        # Exponentially weighted lag of recent wakeups, for load decisions
+        self.recent_lag_ms = 0.0
+        # Slowest stalls, as a min-heap
+        self._stalls: List[LoopStall] = []
+        self.stall_count = 0
+        # Monotonic time by which the task should have woken up
+        self._due: Optional[float] = None
+        # Due time and stack snapshot of the stall in progress, taken by the watchdog
+        self._stall_stack: Optional[Tuple[float, List[str]]] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        """Start measuring the running loop"""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop measuring"""
+        self._stopping.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    async def _run(self) -> None:
+        """Lag measurement loop"""
+        while True:
+            due = self._due = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, time.monotonic() - due), due)
+
+    def record(self, lag: float, due: Optional[float] = None) -> None:
+        """Record the lag of one wakeup, in seconds"""
+        now = time.monotonic()
+        if now - self._window_started >= self.window_seconds:
+            self._previous = self._current
+            self._current = QuantileSketch()
+            self._window_started = now
+        self._current.add(lag * 1000)
+        self.recent_lag_ms += (lag * 1000 - self.recent_lag_ms) * 0.3
+
+        snapshot, self._stall_stack = self._stall_stack, None
+        # A snapshot taken just after the loop recovered belongs to no stall
+        stack = snapshot[1] if snapshot is not None and snapshot[0] == due else None
+        if lag >= self.stall_threshold:
+            self.stall_count += 1
+            stall = LoopStall(duration_ms=lag * 1000, at=time.time(), stack=stack or [])
+            if len(self._stalls) < self.max_stalls:
+                heapq.heappush(self._stalls, stall)
+            elif stall > self._stalls[0]:
+                heapq.heapreplace(self._stalls, stall)
+            logger.warning(
+                f"Event loop stalled for {stall.duration_ms:.0f}ms"
+                + (":\n" + "".join(stack) if stack else "")
+            )
+
+    def _watch(self) -> None:
+        """Watchdog thread: snapshot the loop thread's stack during stalls"""
+        check_every = max(self.stall_threshold / 2, 0.005)
+        captured_for = None
+        while not self._stopping.wait(check_every):
+            due = self._due
+            if due is None or due == captured_for:
+                continue
+            if time.monotonic() - due < self.stall_threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self._stall_stack = (due, traceback.format_stack(frame, limit=self.stack_depth))
+            captured_for = due
+            del frame
+
+    def stats(self) -> Dict[str, Any]:
+        """Get lag percentiles in milliseconds and the slowest stalls"""
+        window = QuantileSketch()
+        window.merge(self._previous)
+        window.merge(self._current)
+
+        def quantile(q: float) -> Optional[float]:
+            value = window.quantile(q)
+            return round(value, 2) if value is not None else None
+
+        return {
+            "running": self._task is not None,
+            "samples": window.count,
+            "recent_lag_ms": round(self.recent_lag_ms, 2),
+            "lag_ms": {
+                "p50": quantile(0.5),
+                "p90": quantile(0.9),
+                "p99": quantile(0.99),
+                "max": round(window.max, 2) if window.count else None,
+            },
+            "stalls": self.stall_count,
+            "slowest_stalls": [stall.to_dict() for stall in sorted(self._stalls, reverse=True)],
+        }
@@ -1,13 +1,27 @@
 """Security utilities"""
+import base64
+import hashlib
+import hmac
+import json
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, Tuple
+from urllib.parse import parse_qsl
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from .cache import TTLCache
 from .config import settings
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Decoded and verified access tokens: sha256(token) -> payload
+_token_cache: TTLCache[Dict[str, Any]] = TTLCache(
+    maxsize=settings.ACCESS_TOKEN_CACHE_SIZE,
+    ttl=settings.ACCESS_TOKEN_CACHE_TTL_SECONDS
+)
+
 
 def hash_password(password: str) -> str:
     """Hash a password"""
@@ -34,21 +48,191 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
 
 
 def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
-    """Decode JWT access token"""
+    """
+    Decode JWT access token
+
+    Verified payloads are cached by token digest for at most
+    ACCESS_TOKEN_CACHE_TTL_SECONDS and never past the token expiry, so the
+    signature check runs once per token rather than once per request.
+    The returned dict is shared with the cache and must not be modified.
+    """
+    cache_key = hashlib.sha256(token.encode()).digest()
+    payload = _token_cache.get(cache_key)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
 
+    ttl = settings.ACCESS_TOKEN_CACHE_TTL_SECONDS
+    if "exp" in payload:
+        ttl = min(ttl, payload["exp"] - time.time())
+    _token_cache.set(cache_key, payload, ttl=ttl)
+    return payload
+
+
+def create_user_access_token(user_id: int, telegram_id: int) -> str:
+    """Create access token identifying a user"""
+    return create_access_token({"sub": str(user_id), "tg": telegram_id})
+
+
+def get_user_id_from_token(token: str) -> Optional[int]:
+    """Get user ID from access token, or None if token is invalid or expired"""
+    payload = decode_access_token(token)
+    if not payload:
+        return None
+    try:
+        return int(payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+# Allowed clock skew for auth_date in the future
+INIT_DATA_CLOCK_SKEW_SECONDS = 60
+
+# Verified init data: sha256(init_data) -> parsed fields
+_init_data_cache: TTLCache[Dict[str, Any]] = TTLCache(
+    maxsize=settings.TELEGRAM_INIT_DATA_CACHE_SIZE,
+    ttl=settings.TELEGRAM_INIT_DATA_MAX_AGE_SECONDS
+)
+
+
+@lru_cache(maxsize=1)
+def get_webapp_secret_key() -> bytes:
+    """
+    Get Mini App secret key derived from the bot token
+
+    Computed once: HMAC-SHA256 of the bot token with "WebAppData" as key.
+    """
+    return hmac.new(
+        b"WebAppData",
+        settings.TELEGRAM_BOT_TOKEN.encode(),
+        hashlib.sha256
+    ).digest()
+
 
-def verify_telegram_init_data(init_data: str) -> bool:
+def verify_telegram_init_data(init_data: str) -> Optional[Dict[str, Any]]:
     """
     Verify Telegram Mini App init data
 
-    This is a placeholder - actual implementation should verify the hash
-    according to Telegram Mini App documentation:
+    Checks the hash according to Telegram Mini App documentation:
     https://core.telegram.org/bots/webapps#validating-data-received-via-the-mini-app
+    and rejects data whose auth_date is older than
+    TELEGRAM_INIT_DATA_MAX_AGE_SECONDS. Successfully verified strings are
+    cached until they expire, so repeat verifications skip the HMAC.
+
+    Args:
+        init_data: Raw Telegram.WebApp.initData query string
+
+    Returns:
+        Parsed init data fields (with "user" decoded from JSON and
+        "auth_date" as int) if valid, otherwise None. The returned dict
+        is shared with the cache and must not be modified.
+    """
+    now = time.time()
+    max_age = settings.TELEGRAM_INIT_DATA_MAX_AGE_SECONDS
+    cache_key = hashlib.sha256(init_data.encode()).digest()
+
+    cached = _init_data_cache.get(cache_key)
+    if cached is not None:
+        return cached if now - cached["auth_date"] <= max_age else None
+
+    fields = dict(parse_qsl(init_data, keep_blank_values=True))
+    received_hash = fields.pop("hash", None)
+    if not received_hash:
+        return None
+
+    data_check_string = "\n".join(f"{key}={fields[key]}" for key in sorted(fields))
+    expected_hash = hmac.new(
+        get_webapp_secret_key(),
+        data_check_string.encode(),
+        hashlib.sha256
+    ).hexdigest()
+    if not hmac.compare_digest(expected_hash, received_hash):
+        return None
+
+    try:
+        auth_date = int(fields["auth_date"])
+        if "user" in fields:
+            fields["user"] = json.loads(fields["user"])
+    except (KeyError, ValueError):
+        return None
+
+    age = now - auth_date
+    if age > max_age or age < -INIT_DATA_CLOCK_SKEW_SECONDS:
+        return None
+
+    fields["auth_date"] = auth_date
+    _init_data_cache.set(cache_key, fields, ttl=max_age - max(age, 0))
+    return fields
+
+
+# TURN credentials: (user_id, window) -> (username, credential, expires_at)
+_turn_credentials_cache: TTLCache[Tuple[str, str, int]] = TTLCache(
+    maxsize=settings.TURN_CREDENTIAL_CACHE_SIZE,
+    ttl=settings.TURN_CREDENTIAL_TTL_SECONDS
+)
+
+
+def generate_turn_credentials(user_id: int, expires_at: int, secret: str) -> Tuple[str, str]:
+    """
+    Generate coturn use-auth-secret (TURN REST API) credentials
+
+    The username is "<expiry unix time>:<user_id>" and the credential is
+    base64(HMAC-SHA1(secret, username)), which coturn recomputes with its
+    static-auth-secret.
+
+    Returns:
+        (username, credential)
+    """
+    username = f"{expires_at}:{user_id}"
+    digest = hmac.new(secret.encode(), username.encode(), hashlib.sha1).digest()
+    return username, base64.b64encode(digest).decode()
+
+
+def verify_turn_credentials(
+    username: str,
+    credential: str,
+    secret: str,
+    now: Optional[float] = None
+) -> bool:
+    """Check TURN credentials the way coturn does with use-auth-secret"""
+    expiry, _, _ = username.partition(":")
+    try:
+        if int(expiry) <= (time.time() if now is None else now):
+            return False
+    except ValueError:
+        return False
+
+    digest = hmac.new(secret.encode(), username.encode(), hashlib.sha1).digest()
+    return hmac.compare_digest(base64.b64encode(digest).decode(), credential)
+
+
+def get_turn_credentials(user_id: int) -> Tuple[str, str, int]:
     """
-    # TODO: Implement proper Telegram init data verification
-    return True
+    Get time-limited TURN credentials for a user
+
+    Time is split into windows of TURN_CREDENTIAL_TTL_SECONDS. Credentials
+    issued in a window expire at the end of the following one, so they
+    stay valid for at least one full TTL, and are computed once per user
+    per window.
+
+    Returns:
+        (username, credential, expires_at)
+    """
+    ttl = settings.TURN_CREDENTIAL_TTL_SECONDS
+    now = int(time.time())
+    window = now // ttl
+    cache_key = (user_id, window)
+
+    cached = _turn_credentials_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    expires_at = (window + 2) * ttl
+    username, credential = generate_turn_credentials(user_id, expires_at, settings.TURN_SECRET)
+    credentials = (username, credential, expires_at)
+    _turn_credentials_cache.set(cache_key, credentials, ttl=(window + 1) * ttl - now)
+    return credentials
@@ -0,0 +1,101 @@
+"""Streaming quantile estimation"""
+import heapq
+import math
+from typing import Dict, Optional
+
+# Values at or below this are counted in the zero bucket
+_MIN_INDEXABLE = 1e-9
+
+
+class QuantileSketch:
+    """
+    Relative-error quantile sketch with bounded memory (DDSketch)
+
+    Values are counted in logarithmically sized buckets, so any quantile
+    is estimated within relative_accuracy of the true value while memory
+    stays bounded by max_buckets regardless of how many values are added.
+    When the bound is hit, the lowest buckets are merged, which only
+    degrades accuracy of the lowest quantiles. Only non-negative values
+    are supported.
+
+    Attributes:
+        count: Number of values added
+        min: Smallest value added
+        max: Largest value added
+    """
+
+    __slots__ = (
+        "relative_accuracy", "max_buckets", "_gamma", "_log_gamma",
+        "_buckets", "zero_count", "count", "min", "max",
+    )
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 1024):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        if max_buckets <= 0:
+            raise ValueError("max_buckets must be positive")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        # bucket index -> count; bucket i covers (gamma^(i-1), gamma^i]
+        self._buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """Add a non-negative value"""
+        if value > _MIN_INDEXABLE:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            buckets = self._buckets
+            buckets[index] = buckets.get(index, 0) + 1
+            if len(buckets) > self.max_buckets:
+                self._collapse()
+        else:
+            self.zero_count += 1
+
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add all values of another sketch with the same accuracy"""
+        if other._gamma != self._gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for index, bucket_count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + bucket_count
+        while len(self._buckets) > self.max_buckets:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-quantile (0 <= q <= 1), or None if empty"""
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if not self.count:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return max(self.min, 0.0)
+
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if rank < seen:
+                # Midpoint of the bucket in relative terms
+                estimate = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def _collapse(self) -> None:
+        """Merge the two lowest buckets to stay within max_buckets"""
+        lowest, second = heapq.nsmallest(2, self._buckets)
+        self._buckets[second] += self._buckets.pop(lowest)
@@ -0,0 +1,303 @@
+"""
+Lightweight tracing with OpenTelemetry-compatible export
+
+Spans are grouped into one trace per unit of work (e.g. an inbound
+WebSocket frame). The sampling decision is made once when the trace
+starts; unsampled traces allocate nothing, and span() outside a sampled
+trace returns a shared no-op context manager. The current span is kept
+in a context variable, so nested code and tasks spawned from it pick up
+the parent without passing it around.
+
+Finished traces are written as OTLP/JSON ExportTraceServiceRequest
+documents, one per line, which the OpenTelemetry Collector can ingest
+with its otlpjsonfile receiver.
+"""
+import json
+import os
+import random
+import sys
+import time
+from contextvars import ContextVar
+from itertools import count
+from pathlib import Path
+from typing import Any, Dict, IO, List, Optional
+
+# Random per-process prefix, so that counter-based trace ids stay unique
+# across processes without generating 128 random bits per frame
+_TRACE_ID_PREFIX = random.getrandbits(64)
+_trace_counter = count(1)
+
+
+def new_correlation_id() -> str:
+    """Get a unique id in the format of an OpenTelemetry trace id"""
+    return f"{_TRACE_ID_PREFIX:016x}{next(_trace_counter):016x}"
+
+
+class Span:
+    """Timed operation within a trace"""
+
+    __slots__ = ("tracer", "trace", "name", "span_id", "parent_id", "start_ns", "end_ns",
+                 "attributes", "_token")
+
+    def __init__(self, tracer: "Tracer", trace: "Trace", name: str,
+                 parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.trace = trace
+        self.name = name
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self._token = None
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set span attribute"""
+        self.attributes[key] = value
+
+    def child(self, name: str, **attributes: Any) -> "Span":
+        """Start a child span without making it current"""
+        return Span(self.tracer, self.trace, name, self.span_id, attributes)
+
+    def end(self) -> None:
+        """Finish the span; finishing the root span exports the trace"""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        self.trace.finish(self)
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is not None:
+            self.attributes["error"] = f"{exc_type.__name__}: {exc}"
+        self.end()
+        _current_span.reset(self._token)
+
+
+class Trace:
+    """Spans sharing a trace id, exported together when the root finishes"""
+
+    __slots__ = ("tracer", "trace_id", "root", "spans", "exported")
+
+    def __init__(self, tracer: "Tracer", trace_id: str):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.root: Optional[Span] = None
+        self.spans: List[Span] = []
+        self.exported = False
+
+    def finish(self, span: Span) -> None:
+        if self.exported:
+            # Finished after the root, e.g. in a task spawned by the frame
+            self.tracer.export([span])
+            return
+        self.spans.append(span)
+        if span is self.root:
+            self.exported = True
+            self.tracer.export(self.spans)
+
+
+class _NoopSpan:
+    """Context manager used when the current work is not sampled"""
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """Get the active span, None outside a sampled trace"""
+    return _current_span.get()
+
+
+class SpanExporter:
+    """Writes finished spans as OTLP/JSON lines"""
+
+    def __init__(self, stream: IO[str], service_name: str, flush_every: int = 1):
+        self.stream = stream
+        self.flush_every = flush_every
+        self._resource = {
+            "attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]
+        }
+        self._unflushed = 0
+
+    def export(self, spans: List[Span]) -> None:
+        """Write one ExportTraceServiceRequest for the spans"""
+        document = {
+            "resourceSpans": [{
+                "resource": self._resource,
+                "scopeSpans": [{
+                    "scope": {"name": "telegram-calls.signaling"},
+                    "spans": [_span_to_otlp(span) for span in spans],
+                }],
+            }]
+        }
+        self.stream.write(json.dumps(document, separators=(",", ":")) + "\n")
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        self.stream.flush()
+        self._unflushed = 0
+
+    def shutdown(self) -> None:
+        """Flush and release the sink"""
+        self.flush()
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends OTLP/JSON lines to a local file"""
+
+    def __init__(self, path: Path, service_name: str, flush_every: int = 64):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(open(path, "a", encoding="utf-8"), service_name, flush_every)
+
+    def shutdown(self) -> None:
+        super().shutdown()
+        self.stream.close()
+
+
+class ConsoleSpanExporter(SpanExporter):
+    """Writes OTLP/JSON lines to stdout"""
+
+    def __init__(self, service_name: str):
+        super().__init__(sys.stdout, service_name)
+
+
+def _attribute_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # OTLP/JSON encodes 64-bit integers as strings
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _span_to_otlp(span: Span) -> Dict[str, Any]:
+    data = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 2 if span.parent_id is None else 1,  # SERVER for roots, else INTERNAL
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [
+            {"key": key, "value": _attribute_value(value)}
+            for key, value in span.attributes.items()
+        ],
+    }
+    if span.parent_id is not None:
+        data["parentSpanId"] = span.parent_id
+    if "error" in span.attributes:
+        data["status"] = {"code": 2, "message": str(span.attributes["error"])}
+    return data
+
+
+class Tracer:
+    """
+    Head-sampled tracer
+
+    Attributes:
+        sample_ratio: Fraction of traces recorded, 0 disables tracing
+    """
+
+    def __init__(self, exporter: Optional[SpanExporter] = None, sample_ratio: float = 0.0):
+        self.exporter: Optional[SpanExporter] = None
+        self.sample_ratio = 0.0
+        self.exported_spans = 0
+        self.configure(exporter, sample_ratio)
+
+    def configure(self, exporter: Optional[SpanExporter], sample_ratio: float) -> None:
+        """Set the sink and sampling ratio; without an exporter nothing is sampled"""
+        self.exporter = exporter
+        self.sample_ratio = min(max(sample_ratio, 0.0), 1.0) if exporter is not None else 0.0
+
+    def start_trace(self, name: str, correlation_id: Optional[str] = None,
+                    **attributes: Any) -> Optional[Span]:
+        """
+        Start the root span of a trace, if this trace is sampled
+
+        Returns:
+            Root span to use as a context manager, None when not sampled
+        """
+        if not self.sample_ratio or random.random() >= self.sample_ratio:
+            return None
+        trace = Trace(self, correlation_id or new_correlation_id())
+        trace.root = Span(self, trace, name, None, attributes)
+        return trace.root
+
+    def span(self, name: str, **attributes: Any):
+        """Start a child span of the current span, or a no-op outside a sampled trace"""
+        parent = _current_span.get()
+        if parent is None:
+            return _NOOP
+        return Span(self, parent.trace, name, parent.span_id, attributes)
+
+    def start_span(self, name: str, **attributes: Any) -> Optional[Span]:
+        """
+        Start a child span of the current span without making it current
+
+        For spans ended elsewhere, e.g. time spent waiting in a queue;
+        returns None outside a sampled trace.
+        """
+        parent = _current_span.get()
+        if parent is None:
+            return None
+        return parent.child(name, **attributes)
+
+    def export(self, spans: List[Span]) -> None:
+        if self.exporter is None:
+            return
+        try:
+            self.exporter.export(spans)
+            self.exported_spans += len(spans)
+        except (OSError, ValueError):
+            # A broken sink must not break signaling
+            pass
+
+    def shutdown(self) -> None:
+        """Flush and detach the exporter, which disables tracing"""
+        exporter = self.exporter
+        self.configure(None, 0.0)
+        if exporter is not None:
+            exporter.shutdown()
+
+
+# Global tracer, disabled until configure_tracing() is called
+tracer = Tracer()
+
+
+def configure_tracing(exporter: str, sample_ratio: float, file_path: str, service_name: str) -> None:
+    """
+    Configure the global tracer
+
+    Args:
+        exporter: "file", "console" or "none"
+        sample_ratio: Fraction of traces recorded, 0 disables tracing
+        file_path: OTLP/JSON lines file of the file exporter
+        service_name: service.name resource attribute
+    """
+    tracer.shutdown()
+    if exporter == "none" or sample_ratio <= 0:
+        tracer.configure(None, 0.0)
+    elif exporter == "console":
+        tracer.configure(ConsoleSpanExporter(service_name), sample_ratio)
+    else:
+        path = Path(os.path.expanduser(file_path))
+        tracer.configure(FileSpanExporter(path, service_name), sample_ratio)
@@ -1,13 +1,15 @@
 """Domain layer - Business logic and entities"""
-from .entities import User, Room, CallSession
-from .repositories import UserRepository, RoomRepository
+from .entities import User, Room, RoomParticipant, CallSession
+from .repositories import UserRepository, RoomRepository, CallSessionRepository
 from . import exceptions
 
 __all__ = [
     "User",
     "Room",
+    "RoomParticipant",
     "CallSession",
     "UserRepository",
     "RoomRepository",
+    "CallSessionRepository",
     "exceptions",
 ]
@@ -1,6 +1,6 @@
 """Domain entities"""
 from .user import User
-from .room import Room
+from .room import Room, RoomParticipant
 from .call_session import CallSession
 
-__all__ = ["User", "Room", "CallSession"]
+__all__ = ["User", "Room", "RoomParticipant", "CallSession"]
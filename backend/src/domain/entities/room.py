@@ -4,6 +4,8 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
+from .user import User
+
 
 @dataclass
 class Room:
@@ -13,6 +15,8 @@ class Room:
     created_at: datetime
     closed_at: Optional[datetime] = None
     is_active: bool = True
+    # Incremented on every participant change and on close
+    version: int = 1
 
     def __post_init__(self):
         """Validate room data"""
@@ -34,3 +38,10 @@ class Room:
             raise ValueError("Room is already closed")
         self.closed_at = datetime.utcnow()
         self.is_active = False
+
+
+@dataclass
+class RoomParticipant:
+    """User currently in a room"""
+    user: User
+    joined_at: datetime
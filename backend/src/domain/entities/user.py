@@ -15,6 +15,8 @@ class User:
     id: Optional[int] = None
     created_at: Optional[datetime] = None
     is_online: bool = False
+    # Incremented on every profile or online status change
+    version: int = 1
 
     def __post_init__(self):
         """Validate user data"""
@@ -31,6 +31,11 @@ class ParticipantAlreadyInRoomException(DomainException):
     pass
 
 
+class RoomFullException(DomainException):
+    """Room has reached its participant limit exception"""
+    pass
+
+
 class ParticipantNotInRoomException(DomainException):
     """Participant not in room exception"""
     pass
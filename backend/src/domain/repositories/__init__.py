@@ -2,5 +2,6 @@
 from .base import BaseRepository
 from .user_repository import UserRepository
 from .room_repository import RoomRepository
+from .call_session_repository import CallSessionRepository
 
-__all__ = ["BaseRepository", "UserRepository", "RoomRepository"]
+__all__ = ["BaseRepository", "UserRepository", "RoomRepository", "CallSessionRepository"]
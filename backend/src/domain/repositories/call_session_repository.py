@@ -0,0 +1,18 @@
+"""Call session repository interface"""
+from abc import abstractmethod
+from typing import List
+from ..entities.call_session import CallSession
+
+
+class CallSessionRepository:
+    """Call session repository interface"""
+
+    @abstractmethod
+    async def create_many(self, sessions: List[CallSession]) -> None:
+        """Insert call sessions in bulk"""
+        pass
+
+    @abstractmethod
+    async def end_many(self, sessions: List[CallSession]) -> int:
+        """Set ended_at and duration of active call sessions in bulk, returning number updated"""
+        pass
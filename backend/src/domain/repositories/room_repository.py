@@ -1,8 +1,9 @@
 """Room repository interface"""
 from abc import abstractmethod
-from typing import Optional, List
+from datetime import timedelta
+from typing import Optional, List, Dict, Tuple, Iterable
 from uuid import UUID
-from ..entities.room import Room
+from ..entities.room import Room, RoomParticipant
 
 
 class RoomRepository:
@@ -13,11 +14,29 @@ class RoomRepository:
         """Create a new room"""
         pass
 
+    @abstractmethod
+    async def create_with_creator(self, room: Room) -> Room:
+        """Create a room with its creator as the first participant"""
+        pass
+
     @abstractmethod
     async def get_by_id(self, room_id: UUID) -> Optional[Room]:
         """Get room by ID"""
         pass
 
+    @abstractmethod
+    async def get_many(self, room_ids: List[UUID]) -> List[Room]:
+        """Get several rooms by ID in one query, skipping unknown IDs"""
+        pass
+
+    @abstractmethod
+    async def get_with_participants(
+        self,
+        room_id: UUID
+    ) -> Optional[Tuple[Room, List[RoomParticipant]]]:
+        """Get room with the profiles and join times of its participants in one query"""
+        pass
+
     @abstractmethod
     async def list_active(self) -> List[Room]:
         """List all active rooms"""
@@ -38,12 +57,57 @@ class RoomRepository:
         """Remove participant from room"""
         pass
 
+    @abstractmethod
+    async def join_room(
+        self,
+        room_id: UUID,
+        user_id: int,
+        max_participants: Optional[int] = None
+    ) -> None:
+        """Atomically check room, user and participant limit and add participant"""
+        pass
+
+    @abstractmethod
+    async def leave_room(self, room_id: UUID, user_id: int) -> bool:
+        """Atomically remove participant and close room if empty, returning True if closed"""
+        pass
+
     @abstractmethod
     async def get_participants(self, room_id: UUID) -> List[int]:
         """Get list of participant IDs in room"""
         pass
 
+    @abstractmethod
+    async def get_participants_many(self, room_ids: List[UUID]) -> Dict[UUID, List[int]]:
+        """Get participant IDs of several rooms in one query"""
+        pass
+
     @abstractmethod
     async def is_participant(self, room_id: UUID, user_id: int) -> bool:
         """Check if user is participant in room"""
         pass
+
+    @abstractmethod
+    async def list_open_participations(
+        self,
+        older_than: timedelta,
+        after: Optional[Tuple[UUID, int]],
+        limit: int
+    ) -> List[Tuple[UUID, int]]:
+        """List (room_id, user_id) of open participations, keyset-paginated"""
+        pass
+
+    @abstractmethod
+    async def close_participations(self, participations: List[Tuple[UUID, int]]) -> int:
+        """Set left_at on given open participations, returning number closed"""
+        pass
+
+    @abstractmethod
+    async def close_empty_rooms(
+        self,
+        older_than: timedelta,
+        exclude_room_ids: Iterable[UUID],
+        limit: int
+    ) -> List[UUID]:
+        """Close up to limit active rooms without open participations, returning their IDs"""
+        pass
@@ -1,6 +1,6 @@
 """User repository interface"""
 from abc import abstractmethod
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from ..entities.user import User
 
 
@@ -12,11 +12,21 @@ class UserRepository:
         """Create a new user"""
         pass
 
+    @abstractmethod
+    async def upsert(self, user: User) -> Tuple[User, bool]:
+        """Create user or refresh profile of existing one, returning (user, created)"""
+        pass
+
     @abstractmethod
     async def get_by_id(self, user_id: int) -> Optional[User]:
         """Get user by internal ID"""
         pass
 
+    @abstractmethod
+    async def get_many(self, user_ids: List[int]) -> List[User]:
+        """Get users by internal IDs in the given order, skipping unknown and repeated IDs"""
+        pass
+
     @abstractmethod
     async def get_by_telegram_id(self, telegram_id: int) -> Optional[User]:
         """Get user by Telegram ID"""
@@ -32,6 +42,11 @@ class UserRepository:
         """Update user's online status"""
         pass
 
+    @abstractmethod
+    async def set_online_status_many(self, user_ids: List[int], is_online: bool) -> int:
+        """Set online status of several users at once, returning the number updated"""
+        pass
+
     @abstractmethod
     async def exists_by_telegram_id(self, telegram_id: int) -> bool:
         """Check if user exists by Telegram ID"""
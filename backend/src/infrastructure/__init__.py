@@ -1,7 +1,7 @@
 """Infrastructure layer"""
 from .database import (
     Base,
-    engine,
+    get_engine,
     get_session,
     UserRepositoryImpl,
     RoomRepositoryImpl,
@@ -10,7 +10,7 @@ from .websocket import ConnectionManager, SignalingHandler
 
 __all__ = [
     "Base",
-    "engine",
+    "get_engine",
     "get_session",
     "UserRepositoryImpl",
     "RoomRepositoryImpl",
@@ -0,0 +1,13 @@
+"""Cache infrastructure"""
+from .entity_cache import EntityCache, entity_cache
+from .cached_user_repository import CachedUserRepository
+from .cached_room_repository import CachedRoomRepository
+from .batching_user_repository import BatchingUserRepository
+
+__all__ = [
+    "EntityCache",
+    "entity_cache",
+    "CachedUserRepository",
+    "CachedRoomRepository",
+    "BatchingUserRepository",
+]
@@ -0,0 +1,74 @@
+"""Batching decorator for user repository"""
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
+
+from ...core.batch_loader import BatchLoader
+from ...domain.entities.user import User
+from ...domain.repositories.user_repository import UserRepository
+
+
+class BatchingUserRepository(UserRepository):
+    """
+    User repository coalescing ID lookups made in the same event loop tick
+
+    get_by_id and get_many go through a BatchLoader, so lookups issued
+    together, e.g. one per participant from gathered coroutines, become a
+    single get_many call on the wrapped repository. Lookups are memoized
+    for the repository's lifetime, which is one request or session;
+    writes through this repository forget the users they change.
+    """
+
+    def __init__(self, repository: UserRepository, max_batch_size: int = 500):
+        self.repository = repository
+        self.loader: BatchLoader[int, User] = BatchLoader(self._load, max_batch_size)
+
+    async def _load(self, user_ids: List[int]) -> Dict[int, User]:
+        return {user.id: user for user in await self.repository.get_many(user_ids)}
+
+    async def create(self, user: User) -> User:
+        """Create a new user"""
+        created_user = await self.repository.create(user)
+        self.loader.clear(created_user.id)
+        return created_user
+
+    async def upsert(self, user: User) -> Tuple[User, bool]:
+        """Create user or refresh profile of existing one"""
+        saved_user, created = await self.repository.upsert(user)
+        self.loader.clear(saved_user.id)
+        return saved_user, created
+
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        """Get user by internal ID, batched with concurrent lookups"""
+        user = await self.loader.load(user_id)
+        # Hand out a copy so callers cannot mutate the memoized instance
+        return replace(user) if user else None
+
+    async def get_many(self, user_ids: List[int]) -> List[User]:
+        """Get several users, batched with concurrent lookups"""
+        user_ids = list(dict.fromkeys(user_ids))
+        users = await self.loader.load_many(user_ids)
+        return [replace(user) for user in users if user is not None]
+
+    async def get_by_telegram_id(self, telegram_id: int) -> Optional[User]:
+        """Get user by Telegram ID"""
+        return await self.repository.get_by_telegram_id(telegram_id)
+
+    async def list_online(self) -> List[User]:
+        """List all online users"""
+        return await self.repository.list_online()
+
+    async def update_online_status(self, user_id: int, is_online: bool) -> None:
+        """Update user's online status"""
+        await self.repository.update_online_status(user_id, is_online)
+        self.loader.clear(user_id)
+
+    async def set_online_status_many(self, user_ids: List[int], is_online: bool) -> int:
+        """Set online status of several users at once"""
+        updated = await self.repository.set_online_status_many(user_ids, is_online)
+        for user_id in user_ids:
+            self.loader.clear(user_id)
+        return updated
+
+    async def exists_by_telegram_id(self, telegram_id: int) -> bool:
+        """Check if user exists by Telegram ID"""
+        return await self.repository.exists_by_telegram_id(telegram_id)
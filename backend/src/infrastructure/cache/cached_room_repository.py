@@ -0,0 +1,172 @@
+"""Caching decorator for room repository"""
+from dataclasses import replace
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, Tuple, Iterable
+from uuid import UUID
+
+from ...domain.entities.room import Room, RoomParticipant
+from ...domain.repositories.room_repository import RoomRepository
+from ..database.repositories.room_repository_impl import RoomRepositoryImpl
+from .entity_cache import EntityCache
+from .invalidation import invalidate_after_commit, invalidate_many_after_commit
+
+NAMESPACE = "room"
+
+
+class CachedRoomRepository(RoomRepository):
+    """
+    Room repository with read-through caching of get_by_id
+
+    Room creation, participant changes and closing invalidate the room
+    immediately and again once the surrounding transaction commits.
+    """
+
+    def __init__(self, repository: RoomRepositoryImpl, cache: EntityCache):
+        self.repository = repository
+        self.cache = cache
+
+    async def create(self, room: Room) -> Room:
+        """Create a new room"""
+        created_room = await self.repository.create(room)
+        await self._invalidate(created_room.id)
+        return created_room
+
+    async def create_with_creator(self, room: Room) -> Room:
+        """Create a room with its creator as the first participant"""
+        # A freshly generated room ID cannot be cached yet, so there is
+        # nothing to invalidate on this critical path
+        return await self.repository.create_with_creator(room)
+
+    async def get_by_id(self, room_id: UUID) -> Optional[Room]:
+        """Get room by ID"""
+        room = await self.cache.get_or_load(
+            NAMESPACE,
+            room_id,
+            lambda: self.repository.get_by_id(room_id),
+            _encode_room,
+            _decode_room
+        )
+        # Hand out a copy so callers cannot mutate the cached instance
+        return replace(room) if room else None
+
+    async def get_many(self, room_ids: List[UUID]) -> List[Room]:
+        """Get several rooms by ID, read through"""
+        return await self.repository.get_many(room_ids)
+
+    async def get_with_participants(
+        self,
+        room_id: UUID
+    ) -> Optional[Tuple[Room, List[RoomParticipant]]]:
+        """Get room with its participants' profiles, read through to keep the version consistent"""
+        return await self.repository.get_with_participants(room_id)
+
+    async def list_active(self) -> List[Room]:
+        """List all active rooms"""
+        return await self.repository.list_active()
+
+    async def close_room(self, room_id: UUID) -> None:
+        """Close a room"""
+        await self.repository.close_room(room_id)
+        await self._invalidate(room_id)
+
+    async def add_participant(self, room_id: UUID, user_id: int) -> None:
+        """Add participant to room"""
+        await self.repository.add_participant(room_id, user_id)
+        await self._invalidate(room_id)
+
+    async def remove_participant(self, room_id: UUID, user_id: int) -> None:
+        """Remove participant from room"""
+        await self.repository.remove_participant(room_id, user_id)
+        await self._invalidate(room_id)
+
+    async def join_room(
+        self,
+        room_id: UUID,
+        user_id: int,
+        max_participants: Optional[int] = None
+    ) -> None:
+        """Atomically check room, user and participant limit and add participant"""
+        await self.repository.join_room(room_id, user_id, max_participants)
+        await self._invalidate(room_id)
+
+    async def leave_room(self, room_id: UUID, user_id: int) -> bool:
+        """Atomically remove participant and close room if empty"""
+        closed = await self.repository.leave_room(room_id, user_id)
+        await self._invalidate(room_id)
+        return closed
+
+    async def get_participants(self, room_id: UUID) -> List[int]:
+        """Get list of participant IDs in room"""
+        return await self.repository.get_participants(room_id)
+
+    async def get_participants_many(self, room_ids: List[UUID]) -> Dict[UUID, List[int]]:
+        """Get participant IDs of several rooms in one query"""
+        return await self.repository.get_participants_many(room_ids)
+
+    async def is_participant(self, room_id: UUID, user_id: int) -> bool:
+        """Check if user is participant in room"""
+        return await self.repository.is_participant(room_id, user_id)
+
+    async def list_open_participations(
+        self,
+        older_than: timedelta,
+        after: Optional[Tuple[UUID, int]],
+        limit: int
+    ) -> List[Tuple[UUID, int]]:
+        """List (room_id, user_id) of open participations, keyset-paginated"""
+        return await self.repository.list_open_participations(older_than, after, limit)
+
+    async def close_participations(self, participations: List[Tuple[UUID, int]]) -> int:
+        """Set left_at on given open participations"""
+        closed = await self.repository.close_participations(participations)
+        await self._invalidate_many(list({room_id for room_id, _ in participations}))
+        return closed
+
+    async def close_empty_rooms(
+        self,
+        older_than: timedelta,
+        exclude_room_ids: Iterable[UUID],
+        limit: int
+    ) -> List[UUID]:
+        """Close active rooms without open participations"""
+        room_ids = await self.repository.close_empty_rooms(older_than, exclude_room_ids, limit)
+        await self._invalidate_many(room_ids)
+        return room_ids
+
+    async def _invalidate(self, room_id: UUID) -> None:
+        """Invalidate room now and after commit"""
+        await self.cache.invalidate(NAMESPACE, room_id)
+        invalidate_after_commit(self.repository.session, self.cache, NAMESPACE, room_id)
+
+    async def _invalidate_many(self, room_ids: List[UUID]) -> None:
+        """Invalidate rooms now and after commit, one Redis round trip each time"""
+        if not room_ids:
+            return
+        await self.cache.invalidate_many(NAMESPACE, room_ids)
+        invalidate_many_after_commit(self.repository.session, self.cache, NAMESPACE, room_ids)
+
+
+def _encode_room(room: Room) -> Dict[str, Any]:
+    """Convert room entity to JSON-serializable dict"""
+    return {
+        "id": str(room.id),
+        "creator_id": room.creator_id,
+        "created_at": room.created_at.isoformat(),
+        "closed_at": room.closed_at.isoformat() if room.closed_at else None,
+        "is_active": room.is_active,
+        "version": room.version,
+    }
+
+
+def _decode_room(data: Dict[str, Any]) -> Room:
+    """Convert dict back to room entity"""
+    closed_at = data.get("closed_at")
+    return Room(
+        id=UUID(data["id"]),
+        creator_id=data["creator_id"],
+        created_at=datetime.fromisoformat(data["created_at"]),
+        closed_at=datetime.fromisoformat(closed_at) if closed_at else None,
+        is_active=data["is_active"],
+        # Entries written before rooms were versioned
+        version=data.get("version", 1)
+    )
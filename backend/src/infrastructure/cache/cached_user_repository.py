@@ -0,0 +1,126 @@
+"""Caching decorator for user repository"""
+from dataclasses import replace
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+
+from ...domain.entities.user import User
+from ...domain.repositories.user_repository import UserRepository
+from ..database.repositories.user_repository_impl import UserRepositoryImpl
+from .entity_cache import EntityCache
+from .invalidation import invalidate_after_commit, invalidate_many_after_commit
+
+NAMESPACE = "user"
+
+
+class CachedUserRepository(UserRepository):
+    """
+    User repository with read-through caching of get_by_id
+
+    Every write invalidates the affected user immediately and again once
+    the surrounding transaction commits, so concurrent readers cannot
+    re-populate the cache with pre-commit data.
+    """
+
+    def __init__(self, repository: UserRepositoryImpl, cache: EntityCache):
+        self.repository = repository
+        self.cache = cache
+
+    async def create(self, user: User) -> User:
+        """Create a new user"""
+        created_user = await self.repository.create(user)
+        await self._invalidate(created_user.id)
+        return created_user
+
+    async def upsert(self, user: User) -> Tuple[User, bool]:
+        """Create user or refresh profile of existing one"""
+        saved_user, created = await self.repository.upsert(user)
+        await self._invalidate(saved_user.id)
+        return saved_user, created
+
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        """Get user by internal ID"""
+        user = await self.cache.get_or_load(
+            NAMESPACE,
+            user_id,
+            lambda: self.repository.get_by_id(user_id),
+            _encode_user,
+            _decode_user
+        )
+        # Hand out a copy so callers cannot mutate the cached instance
+        return replace(user) if user else None
+
+    async def get_many(self, user_ids: List[int]) -> List[User]:
+        """Get several users, loading those not cached with one query"""
+        users = await self.cache.get_many_or_load(
+            NAMESPACE,
+            user_ids,
+            self._load_many,
+            _encode_user,
+            _decode_user
+        )
+        return [replace(users[user_id]) for user_id in dict.fromkeys(user_ids) if user_id in users]
+
+    async def _load_many(self, user_ids: List[int]) -> Dict[int, User]:
+        """Load users missing from the cache, by ID"""
+        return {user.id: user for user in await self.repository.get_many(user_ids)}
+
+    async def get_by_telegram_id(self, telegram_id: int) -> Optional[User]:
+        """Get user by Telegram ID"""
+        return await self.repository.get_by_telegram_id(telegram_id)
+
+    async def list_online(self) -> List[User]:
+        """List all online users"""
+        return await self.repository.list_online()
+
+    async def update_online_status(self, user_id: int, is_online: bool) -> None:
+        """Update user's online status"""
+        await self.repository.update_online_status(user_id, is_online)
+        await self._invalidate(user_id)
+
+    async def set_online_status_many(self, user_ids: List[int], is_online: bool) -> int:
+        """Set online status of several users at once"""
+        updated = await self.repository.set_online_status_many(user_ids, is_online)
+        await self.cache.invalidate_many(NAMESPACE, user_ids)
+        invalidate_many_after_commit(self.repository.session, self.cache, NAMESPACE, user_ids)
+        return updated
+
+    async def exists_by_telegram_id(self, telegram_id: int) -> bool:
+        """Check if user exists by Telegram ID"""
+        return await self.repository.exists_by_telegram_id(telegram_id)
+
+    async def _invalidate(self, user_id: int) -> None:
+        """Invalidate user now and after commit"""
+        await self.cache.invalidate(NAMESPACE, user_id)
+        invalidate_after_commit(self.repository.session, self.cache, NAMESPACE, user_id)
+
+
+def _encode_user(user: User) -> Dict[str, Any]:
+    """Convert user entity to JSON-serializable dict"""
+    return {
+        "id": user.id,
+        "telegram_id": user.telegram_id,
+        "username": user.username,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "photo_url": user.photo_url,
+        "is_online": user.is_online,
+        "created_at": user.created_at.isoformat() if user.created_at else None,
+        "version": user.version,
+    }
+
+
+def _decode_user(data: Dict[str, Any]) -> User:
+    """Convert dict back to user entity"""
+    created_at = data.get("created_at")
+    return User(
+        id=data["id"],
+        telegram_id=data["telegram_id"],
+        username=data.get("username"),
+        first_name=data["first_name"],
+        last_name=data.get("last_name"),
+        photo_url=data.get("photo_url"),
+        is_online=data.get("is_online", False),
+        created_at=datetime.fromisoformat(created_at) if created_at else None,
+        # Entries written before users were versioned
+        version=data.get("version", 1)
+    )
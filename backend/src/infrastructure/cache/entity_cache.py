@@ -0,0 +1,450 @@
+"""Two-tier entity cache: in-process LRU backed by Redis"""
+import asyncio
+import json
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, TypeVar
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from ...core.cache import TTLCache
+from ...core.config import settings
+from ...core.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar('T')
+
+# How long to bypass Redis after a connection failure
+REDIS_RETRY_DELAY_SECONDS = 5.0
+
+
+class EntityCache:
+    """
+    Read-through cache for domain entities
+
+    Lookups go to the in-process LRU first, then Redis, then the loader
+    (normally a repository query). Concurrent misses for the same key are
+    coalesced so that only one loader call runs at a time. Invalidations
+    are published over Redis pub/sub so that other processes drop their
+    local copies as well.
+
+    Attributes:
+        local: In-process LRU with TTL (first tier)
+        redis_ttl: Lifetime of entries in Redis in seconds (second tier)
+    """
+
+    INVALIDATION_CHANNEL = "cache:invalidate"
+
+    def __init__(
+        self,
+        redis_url: Optional[str],
+        local_maxsize: int = 10_000,
+        local_ttl: float = 30.0,
+        redis_ttl: int = 300,
+        key_prefix: str = "entity"
+    ):
+        self.local: TTLCache[Any] = TTLCache(maxsize=local_maxsize, ttl=local_ttl)
+        self.redis_ttl = redis_ttl
+        self.key_prefix = key_prefix
+        self._redis_url = redis_url
+        self._redis: Optional[aioredis.Redis] = None
+        self._redis_retry_at = 0.0
+        # key -> future of the load currently in flight
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._listener_task: Optional[asyncio.Task] = None
+        self._background_tasks: Set[asyncio.Task] = set()
+        # namespace -> counter name -> value
+        self._metrics: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.redis_errors = 0
+
+    def key(self, namespace: str, entity_id: Any) -> str:
+        """Build cache key for entity"""
+        return f"{self.key_prefix}:{namespace}:{entity_id}"
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        entity_id: Any,
+        loader: Callable[[], Awaitable[Optional[T]]],
+        encode: Callable[[T], Dict[str, Any]],
+        decode: Callable[[Dict[str, Any]], T]
+    ) -> Optional[T]:
+        """
+        Get entity from cache or load it
+
+        Args:
+            namespace: Entity namespace (e.g. "user", "room")
+            entity_id: Entity identifier
+            loader: Coroutine factory returning the entity or None
+            encode: Converts entity to JSON-serializable dict
+            decode: Converts dict back to entity
+
+        Returns:
+            Entity, or None if loader returned None (misses are not cached)
+        """
+        metrics = self._metrics[namespace]
+        key = self.key(namespace, entity_id)
+
+        value = self.local.get(key)
+        if value is not None:
+            metrics["local_hits"] += 1
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            # Stampede guard: wait for the load already in progress
+            metrics["coalesced"] += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # Owner of the load was cancelled - fall through and load ourselves
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._load(namespace, key, loader, encode, decode, future)
+        except BaseException as exc:
+            if not future.done():
+                if isinstance(exc, Exception):
+                    future.set_exception(exc)
+                    # Mark as retrieved so an unawaited future does not log a warning
+                    future.exception()
+                else:
+                    future.cancel()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        if not future.done():
+            future.set_result(value)
+        return value
+
+    async def _load(
+        self,
+        namespace: str,
+        key: str,
+        loader: Callable[[], Awaitable[Optional[T]]],
+        encode: Callable[[T], Dict[str, Any]],
+        decode: Callable[[Dict[str, Any]], T],
+        future: asyncio.Future
+    ) -> Optional[T]:
+        """Load entity from Redis or loader and populate caches"""
+        metrics = self._metrics[namespace]
+
+        raw = await self._redis_call("get", key)
+        if raw is not None:
+            metrics["redis_hits"] += 1
+            value = decode(json.loads(raw))
+        else:
+            metrics["misses"] += 1
+            value = await loader()
+            # Skip populating Redis if the key was invalidated during the load
+            if value is not None and self._inflight.get(key) is future:
+                await self._redis_call(
+                    "set", key, json.dumps(encode(value)), ex=self.redis_ttl
+                )
+
+        if value is not None and self._inflight.get(key) is future:
+            self.local.set(key, value)
+        return value
+
+    async def get_many_or_load(
+        self,
+        namespace: str,
+        entity_ids: Iterable[Any],
+        loader: Callable[[List[Any]], Awaitable[Dict[Any, T]]],
+        encode: Callable[[T], Dict[str, Any]],
+        decode: Callable[[Dict[str, Any]], T]
+    ) -> Dict[Any, T]:
+        """
+        Get several entities from cache, loading the missing ones in one call
+
+        Like get_or_load, but Redis is read with one MGET and the entities
+        found in neither tier are passed to a single loader call. Entities
+        another lookup is already loading are waited for instead.
+
+        Args:
+            namespace: Entity namespace (e.g. "user", "room")
+            entity_ids: Entity identifiers
+            loader: Coroutine function mapping missing IDs to the entities found
+            encode: Converts entity to JSON-serializable dict
+            decode: Converts dict back to entity
+
+        Returns:
+            Map of entity ID -> entity for the entities found
+        """
+        metrics = self._metrics[namespace]
+        found: Dict[Any, T] = {}
+        missing: List[Any] = []
+        for entity_id in dict.fromkeys(entity_ids):
+            value = self.local.get(self.key(namespace, entity_id))
+            if value is not None:
+                metrics["local_hits"] += 1
+                found[entity_id] = value
+            else:
+                missing.append(entity_id)
+        if not missing:
+            return found
+
+        waiting: Dict[Any, asyncio.Future] = {}
+        to_load: List[Any] = []
+        for entity_id in missing:
+            inflight = self._inflight.get(self.key(namespace, entity_id))
+            if inflight is not None:
+                metrics["coalesced"] += 1
+                waiting[entity_id] = inflight
+            else:
+                to_load.append(entity_id)
+
+        if to_load:
+            found.update(await self._load_many(namespace, to_load, loader, encode, decode))
+
+        orphaned: List[Any] = []
+        for entity_id, inflight in waiting.items():
+            try:
+                value = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # Owner of the load was cancelled - load it ourselves
+                orphaned.append(entity_id)
+                continue
+            if value is not None:
+                found[entity_id] = value
+
+        if orphaned:
+            found.update(await self._load_many(namespace, orphaned, loader, encode, decode))
+        return found
+
+    async def _load_many(
+        self,
+        namespace: str,
+        entity_ids: List[Any],
+        loader: Callable[[List[Any]], Awaitable[Dict[Any, T]]],
+        encode: Callable[[T], Dict[str, Any]],
+        decode: Callable[[Dict[str, Any]], T]
+    ) -> Dict[Any, T]:
+        """Load entities from Redis or one loader call and populate caches"""
+        metrics = self._metrics[namespace]
+        loop = asyncio.get_running_loop()
+        futures = {entity_id: loop.create_future() for entity_id in entity_ids}
+        keys = {entity_id: self.key(namespace, entity_id) for entity_id in entity_ids}
+        for entity_id, future in futures.items():
+            self._inflight[keys[entity_id]] = future
+
+        found: Dict[Any, T] = {}
+        try:
+            raws = await self._redis_call("mget", list(keys.values())) or [None] * len(keys)
+            not_cached = []
+            for entity_id, raw in zip(entity_ids, raws):
+                if raw is not None:
+                    metrics["redis_hits"] += 1
+                    found[entity_id] = decode(json.loads(raw))
+                else:
+                    not_cached.append(entity_id)
+
+            if not_cached:
+                metrics["misses"] += len(not_cached)
+                loaded = {
+                    entity_id: value
+                    for entity_id, value in (await loader(not_cached)).items()
+                    if entity_id in futures
+                }
+                # Skip populating Redis for entities invalidated during the load
+                await self._redis_set_many({
+                    keys[entity_id]: json.dumps(encode(value))
+                    for entity_id, value in loaded.items()
+                    if self._inflight.get(keys[entity_id]) is futures[entity_id]
+                })
+                found.update(loaded)
+        except BaseException as exc:
+            for entity_id, future in futures.items():
+                if not future.done():
+                    if isinstance(exc, Exception):
+                        future.set_exception(exc)
+                        future.exception()
+                    else:
+                        future.cancel()
+            raise
+        finally:
+            for entity_id, future in futures.items():
+                if self._inflight.get(keys[entity_id]) is future:
+                    if entity_id in found:
+                        self.local.set(keys[entity_id], found[entity_id])
+                    del self._inflight[keys[entity_id]]
+
+        for entity_id, future in futures.items():
+            if not future.done():
+                future.set_result(found.get(entity_id))
+        return found
+
+    async def invalidate(self, namespace: str, entity_id: Any) -> None:
+        """Drop entity from both tiers and notify other processes"""
+        key = self.evict_local(namespace, entity_id)
+        await self._redis_call("delete", key)
+        await self._redis_call("publish", self.INVALIDATION_CHANNEL, key)
+
+    async def invalidate_many(self, namespace: str, entity_ids: Iterable[Any]) -> None:
+        """Drop entities from both tiers and notify other processes with one message"""
+        keys = [self.evict_local(namespace, entity_id) for entity_id in entity_ids]
+        if not keys:
+            return
+        await self._redis_call("delete", *keys)
+        await self._redis_call("publish", self.INVALIDATION_CHANNEL, "\n".join(keys))
+
+    def evict_local(self, namespace: str, entity_id: Any) -> str:
+        """Drop entity from the in-process tier only, returning its key"""
+        key = self.key(namespace, entity_id)
+        self.local.delete(key)
+        # Detach any in-flight load so it does not store a stale value
+        self._inflight.pop(key, None)
+        self._metrics[namespace]["invalidations"] += 1
+        return key
+
+    def schedule_invalidate(self, namespace: str, entity_id: Any) -> None:
+        """
+        Invalidate entity from synchronous code
+
+        The local tier is evicted immediately; Redis is updated in a
+        background task on the running event loop.
+        """
+        self.evict_local(namespace, entity_id)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self.invalidate(namespace, entity_id))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def schedule_invalidate_many(self, namespace: str, entity_ids: List[Any]) -> None:
+        """Invalidate entities from synchronous code, like schedule_invalidate"""
+        for entity_id in entity_ids:
+            self.evict_local(namespace, entity_id)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self.invalidate_many(namespace, entity_ids))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def start(self) -> None:
+        """Start listening for invalidations from other processes"""
+        if self._redis_url and self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen_invalidations())
+
+    async def close(self) -> None:
+        """Stop the invalidation listener and close the Redis client"""
+        if self._listener_task:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    async def _listen_invalidations(self) -> None:
+        """Evict local entries invalidated by other processes"""
+        while True:
+            redis = self._get_redis()
+            if redis is None:
+                await asyncio.sleep(REDIS_RETRY_DELAY_SECONDS)
+                continue
+
+            pubsub = redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        # One key, or several separated by newlines
+                        for key in message["data"].split("\n"):
+                            self.local.delete(key)
+            except (RedisError, OSError) as e:
+                logger.warning(f"Cache invalidation listener error: {e}")
+                await asyncio.sleep(REDIS_RETRY_DELAY_SECONDS)
+            finally:
+                await pubsub.close()
+
+    def _get_redis(self) -> Optional[aioredis.Redis]:
+        """Get Redis client, or None if disabled or recently unreachable"""
+        if not self._redis_url or time.monotonic() < self._redis_retry_at:
+            return None
+        if self._redis is None:
+            self._redis = aioredis.from_url(
+                self._redis_url,
+                decode_responses=True,
+                socket_connect_timeout=0.5,
+                socket_timeout=0.5,
+            )
+        return self._redis
+
+    async def _redis_call(self, method: str, *args, **kwargs) -> Any:
+        """Run Redis command, degrading to a no-op if Redis is unavailable"""
+        redis = self._get_redis()
+        if redis is None:
+            return None
+        try:
+            return await getattr(redis, method)(*args, **kwargs)
+        except (RedisError, OSError) as e:
+            self._redis_failed(method, e)
+            return None
+
+    def _redis_failed(self, method: str, error: Exception) -> None:
+        """Bypass Redis for a while after a failed command"""
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_DELAY_SECONDS
+        self.redis_errors += 1
+        logger.warning(
+            f"Redis {method} failed, bypassing for {REDIS_RETRY_DELAY_SECONDS}s: {error}"
+        )
+
+    async def _redis_set_many(self, values: Dict[str, str]) -> None:
+        """Store several keys with redis_ttl in one round trip"""
+        redis = self._get_redis()
+        if redis is None or not values:
+            return
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for key, value in values.items():
+                    pipe.set(key, value, ex=self.redis_ttl)
+                await pipe.execute()
+        except (RedisError, OSError) as e:
+            self._redis_failed("pipeline set", e)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss metrics per namespace"""
+        namespaces = {}
+        for namespace, counters in self._metrics.items():
+            data = dict(counters)
+            lookups = sum(data.get(name, 0) for name in ("local_hits", "redis_hits", "misses"))
+            hits = data.get("local_hits", 0) + data.get("redis_hits", 0)
+            data["hit_ratio"] = round(hits / lookups, 4) if lookups else 0.0
+            namespaces[namespace] = data
+
+        return {
+            "local": self.local.stats(),
+            "inflight": len(self._inflight),
+            "redis_errors": self.redis_errors,
+            "namespaces": namespaces,
+        }
+
+
+# Global entity cache instance
+entity_cache = EntityCache(
+    redis_url=settings.REDIS_URL if settings.CACHE_ENABLED else None,
+    local_maxsize=settings.CACHE_LOCAL_MAX_SIZE,
+    local_ttl=settings.CACHE_LOCAL_TTL_SECONDS,
+    redis_ttl=settings.CACHE_REDIS_TTL_SECONDS,
+)
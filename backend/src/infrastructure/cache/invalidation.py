@@ -0,0 +1,37 @@
+"""Transaction-aware cache invalidation"""
+from typing import Any, List
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .entity_cache import EntityCache
+
+
+def invalidate_after_commit(
+    session: AsyncSession,
+    cache: EntityCache,
+    namespace: str,
+    entity_id: Any
+) -> None:
+    """
+    Invalidate cached entity again once the session commits
+
+    Closes the window in which a concurrent reader loads the old committed
+    row between the write and the commit and puts it back into the cache.
+    """
+    def _on_commit(_session) -> None:
+        cache.schedule_invalidate(namespace, entity_id)
+
+    event.listen(session.sync_session, "after_commit", _on_commit, once=True)
+
+
+def invalidate_many_after_commit(
+    session: AsyncSession,
+    cache: EntityCache,
+    namespace: str,
+    entity_ids: List[Any]
+) -> None:
+    """Invalidate cached entities again once the session commits"""
+    def _on_commit(_session) -> None:
+        cache.schedule_invalidate_many(namespace, entity_ids)
+
+    event.listen(session.sync_session, "after_commit", _on_commit, once=True)
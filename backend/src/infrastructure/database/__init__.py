@@ -1,18 +1,31 @@
 """Database infrastructure"""
-from .base import Base, engine, AsyncSessionLocal, get_db
+from .base import (
+    Base,
+    get_engine,
+    get_session_factory,
+    new_session,
+    dispose_engine,
+    get_db,
+    get_pool_utilization,
+)
 from .session import get_session
-from .models import UserModel, RoomModel, RoomParticipantModel
-from .repositories import UserRepositoryImpl, RoomRepositoryImpl
+from .models import UserModel, RoomModel, RoomParticipantModel, CallSessionModel
+from .repositories import UserRepositoryImpl, RoomRepositoryImpl, CallSessionRepositoryImpl
 
 __all__ = [
     "Base",
-    "engine",
-    "AsyncSessionLocal",
+    "get_engine",
+    "get_session_factory",
+    "new_session",
+    "dispose_engine",
     "get_db",
+    "get_pool_utilization",
     "get_session",
     "UserModel",
     "RoomModel",
     "RoomParticipantModel",
+    "CallSessionModel",
     "UserRepositoryImpl",
     "RoomRepositoryImpl",
+    "CallSessionRepositoryImpl",
 ]
@@ -1,23 +1,58 @@
 """Database base configuration"""
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from functools import lru_cache
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+    async_sessionmaker,
+)
 from sqlalchemy.orm import DeclarativeBase
 from ...core.config import settings
 
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True,
-)
 
-# Create async session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+@lru_cache(maxsize=1)
+def get_engine() -> AsyncEngine:
+    """Get async engine, created on first use"""
+    return create_async_engine(
+        settings.DATABASE_URL,
+        echo=settings.DEBUG,
+        future=True,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_session_factory() -> async_sessionmaker:
+    """Get async session factory bound to the engine"""
+    return async_sessionmaker(
+        get_engine(),
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+def new_session() -> AsyncSession:
+    """Open a new database session"""
+    return get_session_factory()()
+
+
+def get_pool_utilization() -> float:
+    """Share of database connections checked out, 0 before the engine is created"""
+    if not get_engine.cache_info().currsize:
+        return 0.0
+    capacity = settings.DATABASE_POOL_SIZE + settings.DATABASE_MAX_OVERFLOW
+    return get_engine().pool.checkedout() / capacity if capacity else 0.0
+
+
+async def dispose_engine() -> None:
+    """Close engine connections, if the engine was ever created"""
+    if get_engine.cache_info().currsize:
+        await get_engine().dispose()
+        get_session_factory.cache_clear()
+        get_engine.cache_clear()
 
 
 class Base(DeclarativeBase):
@@ -27,7 +62,7 @@ class Base(DeclarativeBase):
 
 async def get_db() -> AsyncSession:
     """Get database session"""
-    async with AsyncSessionLocal() as session:
+    async with new_session() as session:
         try:
             yield session
             await session.commit()
@@ -0,0 +1,160 @@
+"""Asynchronous batched writer for call sessions"""
+import asyncio
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...domain.entities.call_session import CallSession
+from ...domain.repositories.call_session_repository import CallSessionRepository
+from ...core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# (room_id, caller_id, callee_id, started_at)
+SessionKey = Tuple[UUID, int, int, datetime]
+
+
+class CallSessionWriter:
+    """
+    Buffers call session starts and ends in memory and flushes them in batches
+
+    Enqueueing is synchronous and O(1), so it can be called from the
+    signaling hot path. A background task flushes pending writes every
+    flush_interval seconds, or sooner once batch_size writes are pending,
+    as one multi-row INSERT plus one bulk UPDATE per transaction. A
+    session that starts and ends between two flushes is inserted already
+    ended. Flushes run one at a time, so the end of a session is never
+    committed before its insert.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        repository_factory: Callable[[AsyncSession], CallSessionRepository],
+        flush_interval: float = 2.0,
+        batch_size: int = 500,
+        max_pending: int = 50_000
+    ):
+        self.session_factory = session_factory
+        self.repository_factory = repository_factory
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._pending_inserts: Dict[SessionKey, CallSession] = {}
+        self._pending_ends: Dict[SessionKey, CallSession] = {}
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+
+    @staticmethod
+    def _key(session: CallSession) -> SessionKey:
+        # A pair may hang up and call again between two flushes, so the
+        # start time tells its sessions apart
+        return (session.room_id, session.caller_id, session.callee_id, session.started_at)
+
+    @property
+    def pending(self) -> int:
+        """Number of writes waiting to be flushed"""
+        return len(self._pending_inserts) + len(self._pending_ends)
+
+    def record_start(self, session: CallSession) -> None:
+        """Queue insert of a started call session"""
+        if self.pending >= self.max_pending:
+            self.dropped += 1
+            logger.warning(f"Call session queue full, dropping start of {self._key(session)}")
+            return
+        self._pending_inserts[self._key(session)] = session
+        self._maybe_wakeup()
+
+    def record_end(self, session: CallSession) -> None:
+        """Queue update of an ended call session"""
+        key = self._key(session)
+        if self._pending_inserts.get(key) is session:
+            # Not written yet - the pending insert already carries ended_at
+            return
+        if self.pending >= self.max_pending:
+            self.dropped += 1
+            logger.warning(f"Call session queue full, dropping end of {key}")
+            return
+        self._pending_ends[key] = session
+        self._maybe_wakeup()
+
+    def _maybe_wakeup(self) -> None:
+        if self.pending >= self.batch_size:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        """Start background flushing"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop background flushing and write everything still pending"""
+        if self._task:
+            # Let the loop finish its current flush instead of cancelling
+            # it, which would lose the batch already taken off the queue
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+            self._stopping = False
+        while self.pending:
+            if not await self.flush():
+                break
+
+    async def _run(self) -> None:
+        """Flush loop"""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            while self.pending:
+                if not await self.flush() or self.pending < self.batch_size:
+                    break
+
+    async def flush(self) -> bool:
+        """
+        Write one batch of pending sessions
+
+        Returns:
+            False if the write failed and the batch was put back
+        """
+        async with self._flush_lock:
+            inserts = self._take(self._pending_inserts)
+            ends = self._take(self._pending_ends)
+            if not inserts and not ends:
+                return True
+
+            try:
+                async with self.session_factory() as session:
+                    repository = self.repository_factory(session)
+                    await repository.create_many(inserts)
+                    await repository.end_many(ends)
+                    await session.commit()
+            except Exception as e:
+                logger.error(f"Failed to write {len(inserts) + len(ends)} call sessions: {e}")
+                self._requeue(inserts, ends)
+                return False
+
+            self.written += len(inserts) + len(ends)
+            return True
+
+    def _take(self, pending: Dict[SessionKey, CallSession]) -> List[CallSession]:
+        """Remove up to batch_size sessions from a pending map"""
+        keys = list(pending)[:self.batch_size]
+        return [pending.pop(key) for key in keys]
+
+    def _requeue(self, inserts: List[CallSession], ends: List[CallSession]) -> None:
+        """Put a failed batch back, unless the queue is already full"""
+        for pending, sessions in ((self._pending_inserts, inserts), (self._pending_ends, ends)):
+            for session in sessions:
+                if self.pending >= self.max_pending:
+                    self.dropped += 1
+                    continue
+                pending.setdefault(self._key(session), session)
@@ -7,7 +7,12 @@ from alembic import context
 
 # Import models and base
 from src.infrastructure.database.base import Base
-from src.infrastructure.database.models import UserModel, RoomModel, RoomParticipantModel
+from src.infrastructure.database.models import (
+    UserModel,
+    RoomModel,
+    RoomParticipantModel,
+    CallSessionModel,
+)
 from src.core.config import settings
 
 # this is the Alembic Config object
@@ -0,0 +1,54 @@
+"""Add the call_sessions table
+
+Revision ID: 2f7a9e4c8b13
+Revises: 4b1d0c6e2f10
+Create Date: 2026-10-19 12:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '2f7a9e4c8b13'
+down_revision: Union[str, Sequence[str], None] = '4b1d0c6e2f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'call_sessions',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('room_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('caller_id', sa.Integer(), nullable=False),
+        sa.Column('callee_id', sa.Integer(), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('ended_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('duration_seconds', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['caller_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['callee_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_call_sessions_room_id'), 'call_sessions', ['room_id'], unique=False)
+    op.create_index(op.f('ix_call_sessions_caller_id'), 'call_sessions', ['caller_id'], unique=False)
+    op.create_index(op.f('ix_call_sessions_callee_id'), 'call_sessions', ['callee_id'], unique=False)
+    op.create_index(
+        'ix_call_sessions_active_pair',
+        'call_sessions',
+        ['room_id', 'caller_id', 'callee_id', 'started_at'],
+        unique=False,
+        postgresql_where=sa.text('ended_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_call_sessions_active_pair', table_name='call_sessions')
+    op.drop_index(op.f('ix_call_sessions_callee_id'), table_name='call_sessions')
+    op.drop_index(op.f('ix_call_sessions_caller_id'), table_name='call_sessions')
+    op.drop_index(op.f('ix_call_sessions_room_id'), table_name='call_sessions')
+    op.drop_table('call_sessions')
@@ -0,0 +1,29 @@
+"""Add users.version
+
+Revision ID: 6e8b2d4f9a37
+Revises: 9c3e5a7d1b24
+Create Date: 2026-10-19 12:15:00.000000
+
+Adding a NOT NULL column with a constant default only changes the
+catalog on PostgreSQL 11+, so the users table is not rewritten.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '6e8b2d4f9a37'
+down_revision: Union[str, Sequence[str], None] = '9c3e5a7d1b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'version')
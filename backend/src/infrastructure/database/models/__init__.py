@@ -1,5 +1,6 @@
 """Database models"""
 from .user import UserModel
 from .room import RoomModel, RoomParticipantModel
+from .call_session import CallSessionModel
 
-__all__ = ["UserModel", "RoomModel", "RoomParticipantModel"]
+__all__ = ["UserModel", "RoomModel", "RoomParticipantModel", "CallSessionModel"]
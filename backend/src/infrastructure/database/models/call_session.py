@@ -0,0 +1,33 @@
+"""Call session database model"""
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from ..base import Base
+
+
+class CallSessionModel(Base):
+    """Call session database model"""
+    __tablename__ = "call_sessions"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # Signaling rooms are not guaranteed to be persisted, so no foreign key
+    room_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    caller_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    callee_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    ended_at = Column(DateTime(timezone=True), nullable=True)
+    duration_seconds = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        # Lookup of the active session when it ends
+        Index(
+            "ix_call_sessions_active_pair",
+            "room_id", "caller_id", "callee_id", "started_at",
+            postgresql_where=ended_at.is_(None)
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<CallSession(id={self.id}, room_id={self.room_id}, "
+            f"caller_id={self.caller_id}, callee_id={self.callee_id})>"
+        )
@@ -16,6 +16,8 @@ class RoomModel(Base):
     is_active = Column(Boolean, default=True, nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     closed_at = Column(DateTime(timezone=True), nullable=True)
+    # Incremented on every participant change and on close
+    version = Column(Integer, default=1, server_default="1", nullable=False)
 
     # Relationships
     participants = relationship(
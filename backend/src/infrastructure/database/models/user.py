@@ -15,6 +15,8 @@ class UserModel(Base):
     last_name = Column(String(255), nullable=True)
     photo_url = Column(String(512), nullable=True)
     is_online = Column(Boolean, default=False, nullable=False)
+    # Incremented on every profile or online status change
+    version = Column(Integer, default=1, server_default="1", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(
         DateTime(timezone=True),
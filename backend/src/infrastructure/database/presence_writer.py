@@ -0,0 +1,135 @@
+"""Asynchronous batched writer for users' online status"""
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...domain.repositories.user_repository import UserRepository
+from ...core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PresenceWriter:
+    """
+    Buffers online status changes in memory and flushes them in batches
+
+    Recording is synchronous and O(1) and keeps only the latest status
+    per user, so a user who reconnects between two flushes costs nothing.
+    A background task flushes every flush_interval seconds with one bulk
+    UPDATE per status. Presence is not critical, so while should_defer()
+    says the node is overloaded, flushes are postponed for up to
+    max_defer seconds, leaving the database to signaling and calls.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        repository_factory: Callable[[AsyncSession], UserRepository],
+        flush_interval: float = 1.0,
+        batch_size: int = 1000,
+        max_defer: float = 30.0,
+        should_defer: Optional[Callable[[], bool]] = None
+    ):
+        self.session_factory = session_factory
+        self.repository_factory = repository_factory
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_defer = max_defer
+        self.should_defer = should_defer
+        # user_id -> latest online status
+        self._pending: Dict[int, bool] = {}
+        # Monotonic time of the oldest unflushed change
+        self._pending_since: Optional[float] = None
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.deferred = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of users whose status waits to be written"""
+        return len(self._pending)
+
+    def record(self, user_id: int, is_online: bool) -> None:
+        """Queue a status change of a user"""
+        if self._pending_since is None:
+            self._pending_since = time.monotonic()
+        self._pending[user_id] = is_online
+
+    def start(self) -> None:
+        """Start background flushing"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop background flushing and write everything still pending"""
+        if self._task:
+            # Let the loop finish its current flush instead of cancelling
+            # it, which would lose the batch already taken off the queue
+            self._stopping.set()
+            await self._task
+            self._task = None
+            self._stopping.clear()
+        while self._pending:
+            if not await self.flush():
+                break
+
+    async def _run(self) -> None:
+        """Flush loop"""
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.flush_interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            if not self._pending:
+                continue
+            if (
+                self.should_defer is not None
+                and self.should_defer()
+                and time.monotonic() - self._pending_since < self.max_defer
+            ):
+                self.deferred += 1
+                continue
+            while self._pending:
+                if not await self.flush():
+                    break
+
+    async def flush(self) -> bool:
+        """
+        Write one batch of pending status changes
+
+        Returns:
+            False if the write failed and the batch was put back
+        """
+        user_ids = list(self._pending)[:self.batch_size]
+        if not user_ids:
+            return True
+        batch = {user_id: self._pending.pop(user_id) for user_id in user_ids}
+        if not self._pending:
+            self._pending_since = None
+
+        online: List[int] = [user_id for user_id, is_online in batch.items() if is_online]
+        offline: List[int] = [user_id for user_id, is_online in batch.items() if not is_online]
+        try:
+            async with self.session_factory() as session:
+                repository = self.repository_factory(session)
+                await repository.set_online_status_many(online, True)
+                await repository.set_online_status_many(offline, False)
+                await session.commit()
+        except Exception as e:
+            logger.error(f"Failed to write online status of {len(batch)} users: {e}")
+            # Changes recorded meanwhile are newer than the failed batch
+            for user_id, is_online in batch.items():
+                self._pending.setdefault(user_id, is_online)
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            return False
+
+        self.written += len(batch)
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Get writer counters"""
+        return {"pending": self.pending, "written": self.written, "deferred": self.deferred}
@@ -1,5 +1,6 @@
 """Repository implementations"""
 from .user_repository_impl import UserRepositoryImpl
 from .room_repository_impl import RoomRepositoryImpl
+from .call_session_repository_impl import CallSessionRepositoryImpl
 
-__all__ = ["UserRepositoryImpl", "RoomRepositoryImpl"]
+__all__ = ["UserRepositoryImpl", "RoomRepositoryImpl", "CallSessionRepositoryImpl"]
@@ -0,0 +1,75 @@
+"""Call session repository implementation"""
+from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert, update, values, column, Integer, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+
+from ....domain.entities.call_session import CallSession
+from ....domain.repositories.call_session_repository import CallSessionRepository
+from ..models.call_session import CallSessionModel
+
+
+class CallSessionRepositoryImpl(CallSessionRepository):
+    """Call session repository implementation using SQLAlchemy"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_many(self, sessions: List[CallSession]) -> None:
+        """Insert call sessions with one multi-row INSERT"""
+        if not sessions:
+            return
+
+        await self.session.execute(
+            insert(CallSessionModel).values([
+                {
+                    "room_id": call.room_id,
+                    "caller_id": call.caller_id,
+                    "callee_id": call.callee_id,
+                    "started_at": call.started_at,
+                    "ended_at": call.ended_at,
+                    "duration_seconds": call.duration_seconds,
+                }
+                for call in sessions
+            ])
+        )
+
+    async def end_many(self, sessions: List[CallSession]) -> int:
+        """
+        End active call sessions with one UPDATE ... FROM (VALUES ...)
+
+        Sessions are matched by room, peer pair and start time, so ending
+        a session never ends a later one of the same pair.
+        """
+        if not sessions:
+            return 0
+
+        ended = values(
+            column("room_id", UUID(as_uuid=True)),
+            column("caller_id", Integer),
+            column("callee_id", Integer),
+            column("started_at", DateTime(timezone=True)),
+            column("ended_at", DateTime(timezone=True)),
+            column("duration_seconds", Integer),
+            name="ended",
+        ).data([
+            (
+                call.room_id, call.caller_id, call.callee_id, call.started_at,
+                call.ended_at, call.duration_seconds
+            )
+            for call in sessions
+        ])
+
+        result = await self.session.execute(
+            update(CallSessionModel)
+            .where(
+                CallSessionModel.room_id == ended.c.room_id,
+                CallSessionModel.caller_id == ended.c.caller_id,
+                CallSessionModel.callee_id == ended.c.callee_id,
+                CallSessionModel.started_at == ended.c.started_at,
+                CallSessionModel.ended_at.is_(None)
+            )
+            .values(ended_at=ended.c.ended_at, duration_seconds=ended.c.duration_seconds)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
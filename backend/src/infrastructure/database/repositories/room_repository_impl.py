@@ -1,19 +1,28 @@
 """Room repository implementation"""
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple, Iterable
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import (
+    select, update, and_, case, exists, func, true, cast, literal, tuple_, any_, bindparam
+)
+from sqlalchemy.orm import aliased
+from sqlalchemy.dialects.postgresql import insert, ARRAY, UUID as PG_UUID
 from sqlalchemy.exc import IntegrityError
 
-from ....domain.entities.room import Room
+from ....domain.entities.room import Room, RoomParticipant
+from ....domain.entities.user import User
 from ....domain.repositories.room_repository import RoomRepository
 from ....domain.exceptions import (
     RoomNotFoundException,
+    UserNotFoundException,
+    RoomAlreadyClosedException,
+    RoomFullException,
     ParticipantAlreadyInRoomException,
     ParticipantNotInRoomException
 )
 from ..models.room import RoomModel, RoomParticipantModel
+from ..models.user import UserModel
 
 
 class RoomRepositoryImpl(RoomRepository):
@@ -37,6 +46,44 @@ class RoomRepositoryImpl(RoomRepository):
 
         return self._to_entity(db_room)
 
+    async def create_with_creator(self, room: Room) -> Room:
+        """
+        Create a room with its creator as the first participant
+
+        The creator check, the room insert and the participant insert run
+        as a single statement; the foreign key from the participant to the
+        new room is checked at the end of the statement.
+
+        Raises:
+            UserNotFoundException: If creator doesn't exist
+        """
+        creator = select(UserModel.id).where(UserModel.id == room.creator_id).cte("creator")
+        new_room = insert(RoomModel).from_select(
+            ["id", "creator_id", "is_active", "created_at", "closed_at"],
+            # Explicit casts: parameters in a SELECT list get no type from the target columns
+            select(
+                cast(literal(room.id), RoomModel.id.type),
+                creator.c.id,
+                cast(literal(room.is_active), RoomModel.is_active.type),
+                cast(literal(room.created_at), RoomModel.created_at.type),
+                cast(literal(room.closed_at), RoomModel.closed_at.type),
+            )
+        ).returning(*RoomModel.__table__.c).cte("new_room")
+        participant = insert(RoomParticipantModel).from_select(
+            ["room_id", "user_id", "joined_at"],
+            select(new_room.c.id, new_room.c.creator_id, new_room.c.created_at)
+        ).returning(RoomParticipantModel.user_id).cte("participant")
+
+        result = await self.session.execute(
+            select(new_room, participant.c.user_id)
+            .select_from(new_room.outerjoin(participant, true()))
+        )
+        row = result.one_or_none()
+        if row is None:
+            raise UserNotFoundException(f"User with id {room.creator_id} not found")
+
+        return self._to_entity(row)
+
     async def get_by_id(self, room_id: UUID) -> Optional[Room]:
         """Get room by ID"""
         result = await self.session.execute(
@@ -45,6 +92,58 @@ class RoomRepositoryImpl(RoomRepository):
         db_room = result.scalar_one_or_none()
         return self._to_entity(db_room) if db_room else None
 
+    async def get_many(self, room_ids: List[UUID]) -> List[Room]:
+        """Get several rooms with one = ANY(...) query, skipping unknown IDs"""
+        if not room_ids:
+            return []
+
+        result = await self.session.execute(
+            select(RoomModel).where(
+                RoomModel.id == any_(
+                    bindparam("room_ids", list(room_ids), type_=ARRAY(PG_UUID(as_uuid=True)))
+                )
+            )
+        )
+        return [self._to_entity(db_room) for db_room in result.scalars().all()]
+
+    async def get_with_participants(
+        self,
+        room_id: UUID
+    ) -> Optional[Tuple[Room, List[RoomParticipant]]]:
+        """
+        Get room with the profiles and join times of its participants
+
+        Room, open participations and their users come from one outer
+        join, so the room version always matches the participants read.
+
+        Returns:
+            Tuple of (Room entity, participants in join order), None if
+            the room doesn't exist
+        """
+        result = await self.session.execute(
+            select(RoomModel, RoomParticipantModel.joined_at, UserModel)
+            .outerjoin(
+                RoomParticipantModel,
+                and_(
+                    RoomParticipantModel.room_id == RoomModel.id,
+                    RoomParticipantModel.left_at.is_(None)
+                )
+            )
+            .outerjoin(UserModel, UserModel.id == RoomParticipantModel.user_id)
+            .where(RoomModel.id == room_id)
+            .order_by(RoomParticipantModel.joined_at, RoomParticipantModel.user_id)
+        )
+        rows = result.all()
+        if not rows:
+            return None
+
+        participants = [
+            RoomParticipant(user=_to_user(db_user), joined_at=joined_at)
+            for _, joined_at, db_user in rows
+            if db_user is not None
+        ]
+        return self._to_entity(rows[0][0]), participants
+
     async def list_active(self) -> List[Room]:
         """List all active rooms"""
         result = await self.session.execute(
@@ -65,6 +164,7 @@ class RoomRepositoryImpl(RoomRepository):
 
         db_room.is_active = False
         db_room.closed_at = datetime.utcnow()
+        db_room.version = RoomModel.version + 1
         await self.session.flush()
 
     async def add_participant(self, room_id: UUID, user_id: int) -> None:
@@ -81,6 +181,7 @@ class RoomRepositoryImpl(RoomRepository):
         )
         self.session.add(participant)
         await self.session.flush()
+        await self._bump_version(room_id)
 
     async def remove_participant(self, room_id: UUID, user_id: int) -> None:
         """Remove participant from room"""
@@ -102,6 +203,182 @@ class RoomRepositoryImpl(RoomRepository):
 
         participant.left_at = datetime.utcnow()
         await self.session.flush()
+        await self._bump_version(room_id)
+
+    async def join_room(
+        self,
+        room_id: UUID,
+        user_id: int,
+        max_participants: Optional[int] = None
+    ) -> None:
+        """
+        Add participant to room in a single statement
+
+        Checks that the room exists and is active, that the user exists and
+        that the room has fewer than max_participants open participations,
+        and inserts (or reopens, on rejoin) the participation row in one
+        CTE, bumping the room version. The room row is locked up front, so
+        a concurrent close cannot interleave and concurrent joins of the
+        same room queue instead of deadlocking on the version update. The
+        participant count is read from the statement's snapshot, so joins
+        racing for the last place may both get in.
+
+        Raises:
+            RoomNotFoundException: If room doesn't exist
+            RoomAlreadyClosedException: If room is closed
+            UserNotFoundException: If user doesn't exist
+            ParticipantAlreadyInRoomException: If user is already in room
+            RoomFullException: If room has max_participants participants
+        """
+        room = (
+            select(RoomModel.id, RoomModel.is_active)
+            .where(RoomModel.id == room_id)
+            .with_for_update(key_share=True)
+            .cte("room")
+        )
+        user = select(UserModel.id).where(UserModel.id == user_id).cte("usr")
+        open_participation = and_(
+            RoomParticipantModel.room_id == room_id,
+            RoomParticipantModel.left_at.is_(None)
+        )
+        has_room = true()
+        if max_participants is not None:
+            participants = (
+                select(func.count())
+                .select_from(RoomParticipantModel)
+                .where(open_participation)
+                .scalar_subquery()
+            )
+            has_room = participants < max_participants
+
+        insert_stmt = insert(RoomParticipantModel).from_select(
+            ["room_id", "user_id"],
+            select(room.c.id, user.c.id)
+            .select_from(room.join(user, true()))
+            .where(room.c.is_active, has_room)
+        )
+        joined = insert_stmt.on_conflict_do_update(
+            index_elements=[RoomParticipantModel.room_id, RoomParticipantModel.user_id],
+            set_={"joined_at": func.now(), "left_at": None},
+            # Only reopen a participation that was left; active ones stay untouched
+            where=RoomParticipantModel.left_at.is_not(None)
+        ).returning(RoomParticipantModel.user_id).cte("joined")
+        bumped = (
+            update(RoomModel)
+            .where(RoomModel.id == room_id, exists(select(joined.c.user_id)))
+            .values(version=RoomModel.version + 1)
+            .returning(RoomModel.id)
+            .cte("bumped")
+        )
+
+        result = await self.session.execute(
+            select(
+                select(room.c.is_active).scalar_subquery().label("room_active"),
+                exists(select(user.c.id)).label("user_exists"),
+                exists(select(joined.c.user_id)).label("joined"),
+                exists(select(bumped.c.id)).label("bumped"),
+                exists(
+                    select(RoomParticipantModel.user_id)
+                    .where(open_participation, RoomParticipantModel.user_id == user_id)
+                ).label("already_joined"),
+            )
+        )
+        row = result.one()
+
+        if row.room_active is None:
+            raise RoomNotFoundException(f"Room with id {room_id} not found")
+        if not row.room_active:
+            raise RoomAlreadyClosedException(f"Room {room_id} is closed")
+        if not row.user_exists:
+            raise UserNotFoundException(f"User with id {user_id} not found")
+        if not row.joined:
+            if row.already_joined:
+                raise ParticipantAlreadyInRoomException(
+                    f"User {user_id} is already in room {room_id}"
+                )
+            raise RoomFullException(
+                f"Room {room_id} is full ({max_participants} participants)"
+            )
+
+    async def leave_room(self, room_id: UUID, user_id: int) -> bool:
+        """
+        Remove participant and close room if it became empty, in a single statement
+
+        The room row is locked for the duration of the transaction and its
+        version is bumped by the same UPDATE that closes it. Two last
+        participants leaving at the same instant may both see the other as
+        still present and leave the room open; such empty rooms are closed
+        by the background reconciler.
+
+        Returns:
+            True if the room was closed
+
+        Raises:
+            RoomNotFoundException: If room doesn't exist
+            ParticipantNotInRoomException: If user is not in room
+        """
+        room = (
+            select(RoomModel.id, RoomModel.is_active)
+            .where(RoomModel.id == room_id)
+            .with_for_update()
+            .cte("room")
+        )
+        left = (
+            update(RoomParticipantModel)
+            .where(
+                RoomParticipantModel.room_id == room_id,
+                RoomParticipantModel.user_id == user_id,
+                RoomParticipantModel.left_at.is_(None),
+                exists(select(room.c.id))
+            )
+            .values(left_at=func.now())
+            .returning(RoomParticipantModel.user_id)
+            .cte("left_participant")
+        )
+        # All CTEs see the same snapshot, so the leaving user still looks
+        # active here and has to be excluded explicitly
+        others_remaining = exists(
+            select(RoomParticipantModel.user_id).where(
+                RoomParticipantModel.room_id == room_id,
+                RoomParticipantModel.user_id != user_id,
+                RoomParticipantModel.left_at.is_(None)
+            )
+        )
+        # A row can only be updated once per statement, so the version bump
+        # and the close share one UPDATE
+        closing = and_(RoomModel.is_active == True, ~others_remaining)
+        changed = (
+            update(RoomModel)
+            .where(RoomModel.id == room_id, exists(select(left.c.user_id)))
+            .values(
+                version=RoomModel.version + 1,
+                is_active=case((closing, False), else_=RoomModel.is_active),
+                closed_at=case((closing, func.now()), else_=RoomModel.closed_at)
+            )
+            .returning(RoomModel.id, RoomModel.is_active)
+            .cte("changed_room")
+        )
+        was_active = select(room.c.is_active).scalar_subquery()
+
+        result = await self.session.execute(
+            select(
+                exists(select(room.c.id)).label("room_exists"),
+                exists(select(left.c.user_id)).label("left"),
+                and_(
+                    was_active,
+                    exists(select(changed.c.id).where(~changed.c.is_active))
+                ).label("closed"),
+            )
+        )
+        row = result.one()
+
+        if not row.room_exists:
+            raise RoomNotFoundException(f"Room with id {room_id} not found")
+        if not row.left:
+            raise ParticipantNotInRoomException(
+                f"User {user_id} is not in room {room_id}"
+            )
+        return row.closed
 
     async def get_participants(self, room_id: UUID) -> List[int]:
         """Get list of participant IDs in room"""
@@ -115,6 +392,26 @@ class RoomRepositoryImpl(RoomRepository):
         )
         return list(result.scalars().all())
 
+    async def get_participants_many(self, room_ids: List[UUID]) -> Dict[UUID, List[int]]:
+        """Get participant IDs of several rooms with one = ANY(...) query"""
+        participants: Dict[UUID, List[int]] = {room_id: [] for room_id in room_ids}
+        if not room_ids:
+            return participants
+
+        result = await self.session.execute(
+            select(RoomParticipantModel.room_id, RoomParticipantModel.user_id).where(
+                and_(
+                    RoomParticipantModel.room_id == any_(
+                        bindparam("room_ids", room_ids, type_=ARRAY(PG_UUID(as_uuid=True)))
+                    ),
+                    RoomParticipantModel.left_at.is_(None)
+                )
+            )
+        )
+        for room_id, user_id in result:
+            participants[room_id].append(user_id)
+        return participants
+
     async def is_participant(self, room_id: UUID, user_id: int) -> bool:
         """Check if user is participant in room"""
         result = await self.session.execute(
@@ -128,6 +425,105 @@ class RoomRepositoryImpl(RoomRepository):
         )
         return result.scalar_one_or_none() is not None
 
+    async def list_open_participations(
+        self,
+        older_than: timedelta,
+        after: Optional[Tuple[UUID, int]],
+        limit: int
+    ) -> List[Tuple[UUID, int]]:
+        """List (room_id, user_id) of participations open for longer than older_than"""
+        query = select(RoomParticipantModel.room_id, RoomParticipantModel.user_id).where(
+            RoomParticipantModel.left_at.is_(None),
+            RoomParticipantModel.joined_at < func.now() - older_than
+        )
+        if after is not None:
+            query = query.where(
+                tuple_(RoomParticipantModel.room_id, RoomParticipantModel.user_id) > tuple_(*after)
+            )
+        query = query.order_by(
+            RoomParticipantModel.room_id,
+            RoomParticipantModel.user_id
+        ).limit(limit)
+
+        result = await self.session.execute(query)
+        return [(row.room_id, row.user_id) for row in result]
+
+    async def close_participations(self, participations: List[Tuple[UUID, int]]) -> int:
+        """Set left_at on given open participations and bump their rooms' versions in one statement"""
+        if not participations:
+            return 0
+
+        closed = (
+            update(RoomParticipantModel)
+            .where(
+                tuple_(RoomParticipantModel.room_id, RoomParticipantModel.user_id).in_(participations),
+                RoomParticipantModel.left_at.is_(None)
+            )
+            .values(left_at=func.now())
+            .returning(RoomParticipantModel.room_id)
+            .cte("closed_participations")
+        )
+        bumped = (
+            update(RoomModel)
+            .where(RoomModel.id.in_(select(closed.c.room_id)))
+            .values(version=RoomModel.version + 1)
+            .returning(RoomModel.id)
+            .cte("bumped_rooms")
+        )
+
+        result = await self.session.execute(
+            select(
+                select(func.count()).select_from(closed).scalar_subquery(),
+                select(func.count()).select_from(bumped).scalar_subquery()
+            )
+        )
+        return result.one()[0]
+
+    async def close_empty_rooms(
+        self,
+        older_than: timedelta,
+        exclude_room_ids: Iterable[UUID],
+        limit: int
+    ) -> List[UUID]:
+        """
+        Close up to limit active rooms without open participations
+
+        Rooms locked by concurrent joins or leaves are skipped rather than
+        waited for.
+        """
+        candidate = aliased(RoomModel)
+        open_participants = exists().where(
+            RoomParticipantModel.room_id == candidate.id,
+            RoomParticipantModel.left_at.is_(None)
+        )
+        candidates = select(candidate.id).where(
+            candidate.is_active == True,
+            candidate.created_at < func.now() - older_than,
+            ~open_participants
+        )
+        exclude_room_ids = list(exclude_room_ids)
+        if exclude_room_ids:
+            candidates = candidates.where(candidate.id.not_in(exclude_room_ids))
+        candidates = candidates.limit(limit).with_for_update(skip_locked=True)
+
+        result = await self.session.execute(
+            update(RoomModel)
+            .where(RoomModel.id.in_(candidates.scalar_subquery()))
+            .values(is_active=False, closed_at=func.now(), version=RoomModel.version + 1)
+            .returning(RoomModel.id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.scalars().all())
+
+    async def _bump_version(self, room_id: UUID) -> None:
+        """Increment room version after a participant change"""
+        await self.session.execute(
+            update(RoomModel)
+            .where(RoomModel.id == room_id)
+            .values(version=RoomModel.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
     def _to_entity(self, model: RoomModel) -> Room:
         """Convert database model to domain entity"""
         return Room(
@@ -135,5 +531,21 @@ class RoomRepositoryImpl(RoomRepository):
             creator_id=model.creator_id,
             created_at=model.created_at,
             closed_at=model.closed_at,
-            is_active=model.is_active
+            is_active=model.is_active,
+            version=model.version
         )
+
+
+def _to_user(model: UserModel) -> User:
+    """Convert joined user row to domain entity"""
+    return User(
+        id=model.id,
+        telegram_id=model.telegram_id,
+        username=model.username,
+        first_name=model.first_name,
+        last_name=model.last_name,
+        photo_url=model.photo_url,
+        is_online=model.is_online,
+        created_at=model.created_at,
+        version=model.version
+    )
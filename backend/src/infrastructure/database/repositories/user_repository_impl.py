@@ -1,7 +1,8 @@
 """User repository implementation"""
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, case, or_, func, literal, literal_column, any_, Integer
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.exc import IntegrityError
 
 from ....domain.entities.user import User
@@ -37,6 +38,53 @@ class UserRepositoryImpl(UserRepository):
                 f"User with telegram_id {user.telegram_id} already exists"
             )
 
+    async def upsert(self, user: User) -> Tuple[User, bool]:
+        """
+        Create user or refresh profile of existing one in a single statement
+
+        Uses INSERT ... ON CONFLICT (telegram_id) DO UPDATE ... RETURNING, so
+        concurrent logins of the same new user cannot race into an
+        IntegrityError. updated_at and version are only bumped if a profile
+        field changed.
+
+        Returns:
+            Tuple of (User entity, True if the user was created)
+        """
+        stmt = insert(UserModel).values(
+            telegram_id=user.telegram_id,
+            username=user.username,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            photo_url=user.photo_url,
+            is_online=user.is_online
+        )
+        excluded = stmt.excluded
+        profile_changed = or_(
+            UserModel.username.is_distinct_from(excluded.username),
+            UserModel.first_name.is_distinct_from(excluded.first_name),
+            UserModel.last_name.is_distinct_from(excluded.last_name),
+            UserModel.photo_url.is_distinct_from(excluded.photo_url),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserModel.telegram_id],
+            set_={
+                "username": excluded.username,
+                "first_name": excluded.first_name,
+                "last_name": excluded.last_name,
+                "photo_url": excluded.photo_url,
+                "updated_at": case((profile_changed, func.now()), else_=UserModel.updated_at),
+                "version": case((profile_changed, UserModel.version + 1), else_=UserModel.version),
+            }
+        ).returning(
+            *UserModel.__table__.c,
+            # xmax is 0 only for freshly inserted row versions
+            literal_column("xmax = 0").label("inserted")
+        )
+
+        result = await self.session.execute(stmt)
+        row = result.one()
+        return self._to_entity(row), row.inserted
+
     async def get_by_id(self, user_id: int) -> Optional[User]:
         """Get user by internal ID"""
         result = await self.session.execute(
@@ -45,6 +93,26 @@ class UserRepositoryImpl(UserRepository):
         db_user = result.scalar_one_or_none()
         return self._to_entity(db_user) if db_user else None
 
+    async def get_many(self, user_ids: List[int]) -> List[User]:
+        """
+        Get several users with one query
+
+        The IDs are bound as a single array parameter (WHERE id = ANY($1)),
+        so the statement is the same for any number of IDs.
+
+        Returns:
+            Users in the order of user_ids, skipping unknown IDs
+        """
+        ids = list(dict.fromkeys(user_ids))
+        if not ids:
+            return []
+
+        result = await self.session.execute(
+            select(UserModel).where(UserModel.id == any_(literal(ids, ARRAY(Integer))))
+        )
+        by_id = {db_user.id: db_user for db_user in result.scalars().all()}
+        return [self._to_entity(by_id[user_id]) for user_id in ids if user_id in by_id]
+
     async def get_by_telegram_id(self, telegram_id: int) -> Optional[User]:
         """Get user by Telegram ID"""
         result = await self.session.execute(
@@ -71,9 +139,24 @@ class UserRepositoryImpl(UserRepository):
         if not db_user:
             raise UserNotFoundException(f"User with id {user_id} not found")
 
-        db_user.is_online = is_online
+        if db_user.is_online != is_online:
+            db_user.is_online = is_online
+            db_user.version = UserModel.version + 1
         await self.session.flush()
 
+    async def set_online_status_many(self, user_ids: List[int], is_online: bool) -> int:
+        """Set online status of several users with one bulk UPDATE"""
+        if not user_ids:
+            return 0
+
+        result = await self.session.execute(
+            update(UserModel)
+            .where(UserModel.id.in_(user_ids), UserModel.is_online != is_online)
+            .values(is_online=is_online, version=UserModel.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
     async def exists_by_telegram_id(self, telegram_id: int) -> bool:
         """Check if user exists by Telegram ID"""
         result = await self.session.execute(
@@ -91,5 +174,6 @@ class UserRepositoryImpl(UserRepository):
             last_name=model.last_name,
             photo_url=model.photo_url,
             is_online=model.is_online,
-            created_at=model.created_at
+            created_at=model.created_at,
+            version=model.version
         )
@@ -1,7 +1,7 @@
 """Database session management"""
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession
-from .base import AsyncSessionLocal
+from .base import new_session
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -13,7 +13,7 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         async def endpoint(db: AsyncSession = Depends(get_session)):
             ...
     """
-    async with AsyncSessionLocal() as session:
+    async with new_session() as session:
         try:
             yield session
             await session.commit()
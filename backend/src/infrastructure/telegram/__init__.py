@@ -0,0 +1,10 @@
+"""Telegram Bot API infrastructure"""
+from .bot_api import TelegramBotApi, TelegramApiError
+from .notification_queue import NotificationQueue, Notification
+
+__all__ = [
+    "TelegramBotApi",
+    "TelegramApiError",
+    "NotificationQueue",
+    "Notification",
+]
@@ -0,0 +1,101 @@
+"""Telegram Bot API client"""
+from typing import Any, Dict, Optional
+
+import httpx
+
+
+class TelegramApiError(Exception):
+    """
+    Failed Bot API call
+
+    Attributes:
+        status_code: HTTP status, None if no response was received
+        retry_after: Seconds to wait before retrying, sent with 429
+    """
+
+    def __init__(
+        self,
+        description: str,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None
+    ):
+        super().__init__(description)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        """Rate limits, server errors and network failures can be retried"""
+        return self.status_code is None or self.status_code == 429 or self.status_code >= 500
+
+
+class TelegramBotApi:
+    """
+    Minimal async client for the Telegram Bot API
+
+    The HTTP transport is pluggable: pass an httpx transport (e.g.
+    httpx.ASGITransport of a local fake server, or httpx.MockTransport)
+    to run without reaching api.telegram.org.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        base_url: str = "https://api.telegram.org",
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        timeout: float = 10.0
+    ):
+        self._client = httpx.AsyncClient(
+            base_url=f"{base_url.rstrip('/')}/bot{token}",
+            transport=transport,
+            timeout=timeout,
+        )
+
+    async def call(self, method: str, payload: Dict[str, Any]) -> Any:
+        """
+        Call a Bot API method
+
+        Returns:
+            The "result" field of the response
+
+        Raises:
+            TelegramApiError: If the request failed or Telegram returned ok=false
+        """
+        try:
+            response = await self._client.post(f"/{method}", json=payload)
+        except httpx.HTTPError as e:
+            # The message can include the request URL, which holds the token
+            raise TelegramApiError(f"{method} request failed: {type(e).__name__}") from None
+
+        try:
+            data = response.json()
+        except ValueError:
+            raise TelegramApiError(
+                f"{method} returned HTTP {response.status_code}",
+                status_code=response.status_code,
+            ) from None
+
+        if not data.get("ok"):
+            parameters = data.get("parameters") or {}
+            raise TelegramApiError(
+                data.get("description", f"{method} failed"),
+                status_code=data.get("error_code", response.status_code),
+                retry_after=parameters.get("retry_after"),
+            )
+        return data.get("result")
+
+    async def send_message(
+        self,
+        chat_id: int,
+        text: str,
+        reply_markup: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Send a text message to a chat"""
+        payload: Dict[str, Any] = {"chat_id": chat_id, "text": text}
+        if reply_markup is not None:
+            payload["reply_markup"] = reply_markup
+        return await self.call("sendMessage", payload)
+
+    async def close(self) -> None:
+        """Close HTTP connections"""
+        await self._client.aclose()
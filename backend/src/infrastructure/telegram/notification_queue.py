@@ -0,0 +1,234 @@
+"""Outbound queue for Telegram bot messages"""
+import asyncio
+import random
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+from .bot_api import TelegramApiError, TelegramBotApi
+from ...core.cache import TTLCache
+from ...core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Notification:
+    """Message waiting to be sent to a chat"""
+    chat_id: int
+    text: str
+    reply_markup: Optional[Dict[str, Any]] = None
+    attempts: int = 0
+
+
+class NotificationQueue:
+    """
+    Sends bot messages from a background task
+
+    enqueue() is synchronous and O(1), so callers never wait on the Bot
+    API. The sender takes the head message of up to batch_size chats that
+    are ready and sends them concurrently, then waits long enough to stay
+    under max_per_second overall. A chat gets at most one message per
+    per_chat_interval seconds, in enqueue order.
+
+    Rate limits (429, honouring retry_after), server errors and network
+    failures are retried with exponential backoff and jitter, up to
+    max_attempts; other errors (e.g. the user blocked the bot) drop the
+    message. Messages with a dedup_key already enqueued for the same chat
+    within dedup_ttl seconds are skipped.
+    """
+
+    def __init__(
+        self,
+        bot: TelegramBotApi,
+        per_chat_interval: float = 1.0,
+        max_per_second: float = 25.0,
+        batch_size: int = 25,
+        max_attempts: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        dedup_ttl: float = 300.0,
+        max_pending: int = 10_000
+    ):
+        self.bot = bot
+        self.per_chat_interval = per_chat_interval
+        self.max_per_second = max_per_second
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_pending = max_pending
+        # chat_id -> messages in send order; chats in round-robin order
+        self._chats: "OrderedDict[int, Deque[Notification]]" = OrderedDict()
+        # chat_id -> monotonic time before which the chat must not be sent to
+        self._not_before: Dict[int, float] = {}
+        self._dedup: TTLCache[bool] = TTLCache(maxsize=max_pending, ttl=dedup_ttl)
+        self._pending = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self.deduplicated = 0
+        self.dropped = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of messages waiting to be sent"""
+        return self._pending
+
+    def enqueue(
+        self,
+        chat_id: int,
+        text: str,
+        reply_markup: Optional[Dict[str, Any]] = None,
+        dedup_key: Optional[str] = None
+    ) -> bool:
+        """
+        Queue a message
+
+        Returns:
+            False if the queue is full and the message was dropped; a
+            duplicate counts as queued
+        """
+        if dedup_key is not None and (chat_id, dedup_key) in self._dedup:
+            self.deduplicated += 1
+            return True
+
+        if self._pending >= self.max_pending:
+            self.dropped += 1
+            logger.warning(f"Notification queue full, dropping message to chat {chat_id}")
+            return False
+
+        if dedup_key is not None:
+            self._dedup.set((chat_id, dedup_key), True)
+
+        self._chats.setdefault(chat_id, deque()).append(Notification(chat_id, text, reply_markup))
+        self._pending += 1
+        self._wakeup.set()
+        return True
+
+    def start(self) -> None:
+        """Start background sending"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Stop background sending, trying to send what is ready within timeout"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        deadline = time.monotonic() + timeout
+        while self._pending and time.monotonic() < deadline:
+            if not await self.send_ready():
+                break
+        if self._pending:
+            logger.warning(f"Stopped with {self._pending} notifications unsent")
+
+    async def _run(self) -> None:
+        """Send loop"""
+        while True:
+            sent = await self.send_ready()
+            if sent:
+                # Stay under the bot-wide rate limit
+                await asyncio.sleep(sent / self.max_per_second)
+                continue
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._next_ready_in())
+            except asyncio.TimeoutError:
+                pass
+
+    def _next_ready_in(self) -> Optional[float]:
+        """Seconds until the next chat may be sent to, None if nothing is queued"""
+        if not self._chats:
+            return None
+        now = time.monotonic()
+        return max(0.0, min(self._not_before.get(chat_id, now) for chat_id in self._chats) - now)
+
+    async def send_ready(self) -> int:
+        """
+        Send the head message of up to batch_size ready chats
+
+        Returns:
+            Number of messages attempted
+        """
+        now = time.monotonic()
+        batch: List[Notification] = []
+        for chat_id in list(self._chats):
+            if self._not_before.get(chat_id, 0.0) > now:
+                continue
+            queue = self._chats[chat_id]
+            batch.append(queue.popleft())
+            self._pending -= 1
+            if queue:
+                self._chats.move_to_end(chat_id)
+            else:
+                del self._chats[chat_id]
+            if len(batch) >= self.batch_size:
+                break
+
+        if batch:
+            await asyncio.gather(*(self._send(notification) for notification in batch))
+        return len(batch)
+
+    async def _send(self, notification: Notification) -> None:
+        """Send one message, scheduling a retry if it may succeed later"""
+        chat_id = notification.chat_id
+        notification.attempts += 1
+        try:
+            await self.bot.send_message(chat_id, notification.text, notification.reply_markup)
+        except TelegramApiError as e:
+            if not e.retryable or notification.attempts >= self.max_attempts:
+                self.failed += 1
+                logger.warning(
+                    f"Giving up on message to chat {chat_id} after "
+                    f"{notification.attempts} attempts: {e}"
+                )
+                self._not_before[chat_id] = time.monotonic() + self.per_chat_interval
+                return
+
+            backoff = min(self.backoff_max, self.backoff_base * 2 ** (notification.attempts - 1))
+            delay = max(e.retry_after or 0.0, random.uniform(backoff / 2, backoff))
+            self._not_before[chat_id] = time.monotonic() + delay
+            self._chats.setdefault(chat_id, deque()).appendleft(notification)
+            self._pending += 1
+            self.retried += 1
+            logger.info(f"Retrying message to chat {chat_id} in {delay:.1f}s: {e}")
+            return
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Unexpected error sending message to chat {chat_id}: {e}")
+            return
+
+        self.sent += 1
+        self._not_before[chat_id] = time.monotonic() + self.per_chat_interval
+        self._forget_idle_chats()
+
+    def _forget_idle_chats(self) -> None:
+        """Drop rate limit entries of chats with nothing queued that expired"""
+        if len(self._not_before) <= self.max_pending:
+            return
+        now = time.monotonic()
+        for chat_id in [chat for chat, at in self._not_before.items() if at <= now]:
+            if chat_id not in self._chats:
+                del self._not_before[chat_id]
+
+    def stats(self) -> Dict[str, int]:
+        """Get queue counters"""
+        return {
+            "pending": self._pending,
+            "chats": len(self._chats),
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            "deduplicated": self.deduplicated,
+            "dropped": self.dropped,
+        }
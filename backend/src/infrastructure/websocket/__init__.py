@@ -1,5 +1,35 @@
 """WebSocket infrastructure"""
 from .connection_manager import ConnectionManager
+from .outbound_queue import OutboundQueue, Lane, lane_of
+from .inbound_pipeline import InboundPipeline, ordering_key
 from .signaling_handler import SignalingHandler
+from .room_reconciler import RoomReconciler, ReconcileReport
+from .call_session_tracker import CallSessionTracker
+from .call_stats import CallStatsAggregator
+from .room_snapshot_store import RoomSnapshotStore
+from .negotiation_coordinator import NegotiationCoordinator
+from .call_invites import CallInviteService
+from .admission_controller import AdmissionController
+from .room_feed import RoomFeed, room_feed
+from .publishing_room_repository import PublishingRoomRepository
 
-__all__ = ["ConnectionManager", "SignalingHandler"]
+__all__ = [
+    "ConnectionManager",
+    "OutboundQueue",
+    "Lane",
+    "lane_of",
+    "InboundPipeline",
+    "ordering_key",
+    "SignalingHandler",
+    "RoomReconciler",
+    "ReconcileReport",
+    "CallSessionTracker",
+    "CallStatsAggregator",
+    "RoomSnapshotStore",
+    "NegotiationCoordinator",
+    "CallInviteService",
+    "AdmissionController",
+    "RoomFeed",
+    "room_feed",
+    "PublishingRoomRepository",
+]
@@ -0,0 +1,130 @@
+"""Admission control of new signaling sockets"""
+import random
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .connection_manager import ConnectionManager
+from ...core.profiling import LoopLagMonitor
+from ...core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Accepts allowed in a burst, in seconds of accepts_per_second
+_BURST_SECONDS = 0.1
+
+
+class AdmissionController:
+    """
+    Decides whether the node takes a new signaling socket
+
+    The node is overloaded while connections, recent event loop lag or
+    database pool utilization reach their limit; it recovers once all of
+    them are back under recover_ratio of their limit. While overloaded,
+    every new socket is rejected. Otherwise a token bucket paces accepts
+    at accepts_per_second, so that a reconnect storm after an outage is
+    admitted gradually instead of all at once.
+
+    A rejected client is told when to retry: every rejection reserves the
+    next free accept slot, at least retry_after_min (scaled up with the
+    pressure) ahead, so rejected clients come back spread out at the rate
+    the node admits them instead of all retrying at once. Sockets that
+    are already connected are never affected.
+
+    Attributes:
+        loop_monitor: Source of event loop lag, ignored if None
+    """
+
+    def __init__(
+        self,
+        manager: ConnectionManager,
+        pool_utilization: Optional[Callable[[], float]] = None,
+        max_connections: int = 10_000,
+        max_loop_lag_ms: float = 50.0,
+        max_pool_utilization: float = 0.9,
+        accepts_per_second: float = 200.0,
+        retry_after_min: float = 2.0,
+        retry_after_max: float = 60.0,
+        recover_ratio: float = 0.8
+    ):
+        self.manager = manager
+        self.pool_utilization = pool_utilization
+        self.loop_monitor: Optional[LoopLagMonitor] = None
+        self.max_connections = max_connections
+        self.max_loop_lag_ms = max_loop_lag_ms
+        self.max_pool_utilization = max_pool_utilization
+        self.accepts_per_second = accepts_per_second
+        self.retry_after_min = retry_after_min
+        self.retry_after_max = retry_after_max
+        self.recover_ratio = recover_ratio
+        self._overloaded = False
+        self._burst = max(1.0, accepts_per_second * _BURST_SECONDS)
+        self._tokens = self._burst
+        # Monotonic time of the last accept slot handed out to a rejected client
+        self._next_slot = 0.0
+        self._updated_at = time.monotonic()
+        self.admitted = 0
+        self.rejected_overloaded = 0
+        self.rejected_rate = 0
+
+    def pressure(self) -> Dict[str, float]:
+        """Load of each signal as a share of its limit"""
+        pressure = {"connections": len(self.manager.active_connections) / self.max_connections}
+        if self.loop_monitor is not None:
+            pressure["loop_lag"] = self.loop_monitor.recent_lag_ms / self.max_loop_lag_ms
+        if self.pool_utilization is not None:
+            pressure["db_pool"] = self.pool_utilization() / self.max_pool_utilization
+        return pressure
+
+    @property
+    def overloaded(self) -> bool:
+        """Whether the node is overloaded, with hysteresis"""
+        peak = max(self.pressure().values())
+        if not self._overloaded and peak >= 1.0:
+            self._overloaded = True
+            logger.warning(f"Node overloaded, rejecting new sockets: {self.pressure()}")
+        elif self._overloaded and peak < self.recover_ratio:
+            self._overloaded = False
+            logger.info("Node recovered, accepting new sockets")
+        return self._overloaded
+
+    def admit(self) -> Optional[float]:
+        """
+        Decide on a new socket
+
+        Returns:
+            None if the socket may connect, otherwise seconds the client
+            should wait before retrying
+        """
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self._burst, self._tokens + elapsed * self.accepts_per_second)
+
+        if self.overloaded:
+            self.rejected_overloaded += 1
+        elif self._tokens < 1.0:
+            self.rejected_rate += 1
+        else:
+            self._tokens -= 1.0
+            self.admitted += 1
+            return None
+
+        return self._retry_after(now)
+
+    def _retry_after(self, now: float) -> float:
+        """Reserve an accept slot for a rejected client, returning the wait until it"""
+        slot_length = 1.0 / self.accepts_per_second
+        earliest = now + self.retry_after_min * max(1.0, max(self.pressure().values()))
+        self._next_slot = max(self._next_slot + slot_length, earliest)
+        wait = self._next_slot - now + random.uniform(0.0, slot_length)
+        return min(self.retry_after_max, wait)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get admission counters and current pressure"""
+        return {
+            "overloaded": self._overloaded,
+            "pressure": {name: round(value, 3) for name, value in self.pressure().items()},
+            "admitted": self.admitted,
+            "rejected_overloaded": self.rejected_overloaded,
+            "rejected_rate": self.rejected_rate,
+        }
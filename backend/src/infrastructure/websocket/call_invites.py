@@ -0,0 +1,141 @@
+"""Delivery of call invitations to online and offline callees"""
+import asyncio
+from typing import Callable, List, Optional, Set
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .connection_manager import ConnectionManager
+from ..telegram import NotificationQueue
+from ...domain.repositories.user_repository import UserRepository
+from ...core.logger import get_logger
+from ...core.tracing import Span, tracer
+
+logger = get_logger(__name__)
+
+
+class CallInviteService:
+    """
+    Fans a call invitation out to callees
+
+    Online callees get a call-invite over their socket. Offline callees
+    get a Telegram message from the bot through the notification queue,
+    deduplicated per room so repeated invites do not spam the chat. The
+    fan-out runs in a background task, so a group invite does not hold up
+    the inviter's message loop; the inviter gets a call-invite-status
+    with the outcome once it is done.
+
+    Attributes:
+        max_invitees: Maximum callees of one invitation
+    """
+
+    def __init__(
+        self,
+        manager: ConnectionManager,
+        session_factory: Callable[[], AsyncSession],
+        repository_factory: Callable[[AsyncSession], UserRepository],
+        notifications: Optional[NotificationQueue] = None,
+        invite_url: Optional[str] = None,
+        max_invitees: int = 7
+    ):
+        self.manager = manager
+        self.session_factory = session_factory
+        self.repository_factory = repository_factory
+        self.notifications = notifications
+        # Link of the invite button, with a {room_id} placeholder
+        self.invite_url = invite_url
+        self.max_invitees = max_invitees
+        self._tasks: Set[asyncio.Task] = set()
+
+    def invite(
+        self,
+        room_id: UUID,
+        inviter_id: int,
+        callee_ids: List[int],
+        video_enabled: bool = False
+    ) -> None:
+        """Start delivering an invitation in the background"""
+        queued = tracer.start_span("ws.queue", queue="call-invite")
+        task = asyncio.create_task(
+            self._fan_out(room_id, inviter_id, callee_ids, video_enabled, queued)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def stop(self) -> None:
+        """Wait for invitations being delivered"""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _fan_out(
+        self,
+        room_id: UUID,
+        inviter_id: int,
+        callee_ids: List[int],
+        video_enabled: bool,
+        queued: Optional[Span] = None
+    ) -> None:
+        """Deliver an invitation and report the outcome to the inviter"""
+        if queued is not None:
+            queued.end()
+        online = [user_id for user_id in callee_ids if self.manager.is_user_online(user_id)]
+        offline = [user_id for user_id in callee_ids if user_id not in online]
+
+        invite = {
+            "type": "call-invite",
+            "room_id": str(room_id),
+            "from_user_id": inviter_id,
+            "video_enabled": video_enabled,
+        }
+        await asyncio.gather(
+            *(self.manager.send_personal_message(invite, user_id) for user_id in online)
+        )
+
+        notified: List[int] = []
+        if offline and self.notifications is not None:
+            try:
+                notified = await self._notify_offline(room_id, inviter_id, offline)
+            except Exception as e:
+                logger.error(f"Failed to notify offline callees of room {room_id}: {e}")
+
+        await self.manager.send_personal_message(
+            {
+                "type": "call-invite-status",
+                "room_id": str(room_id),
+                "online": online,
+                "notified": notified,
+                "unreachable": [user_id for user_id in offline if user_id not in notified],
+            },
+            inviter_id
+        )
+        logger.info(
+            f"User {inviter_id} invited {len(callee_ids)} users to room {room_id}: "
+            f"{len(online)} online, {len(notified)} notified via Telegram"
+        )
+
+    async def _notify_offline(self, room_id: UUID, inviter_id: int, callee_ids: List[int]) -> List[int]:
+        """Queue Telegram messages to offline callees, returning those queued"""
+        async with self.session_factory() as session:
+            repository = self.repository_factory(session)
+            users = {user.id: user for user in await repository.get_many([inviter_id, *callee_ids])}
+
+        inviter = users.get(inviter_id)
+        callees = [users.get(user_id) for user_id in callee_ids]
+        caller = inviter.display_name if inviter else "Кто-то"
+        text = f"📞 {caller} звонит вам"
+        reply_markup = None
+        if self.invite_url:
+            reply_markup = {
+                "inline_keyboard": [[
+                    {"text": "Присоединиться к звонку", "url": self.invite_url.format(room_id=room_id)}
+                ]]
+            }
+
+        notified = []
+        for callee in callees:
+            if callee is None:
+                continue
+            if self.notifications.enqueue(
+                callee.telegram_id, text, reply_markup, dedup_key=f"call-invite:{room_id}"
+            ):
+                notified.append(callee.id)
+        return notified
@@ -0,0 +1,108 @@
+"""Derivation of call sessions from signaling events"""
+from datetime import datetime
+from typing import Dict, Optional, Set, Tuple
+from uuid import UUID
+
+from ...domain.entities.call_session import CallSession
+from ..database.call_session_writer import CallSessionWriter
+from ...core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# (room_id, lower user_id, higher user_id)
+PairKey = Tuple[UUID, int, int]
+
+
+class CallSessionTracker:
+    """
+    Tracks active calls between peer pairs from signaling messages
+
+    A session starts with the first answer to an offer between two peers
+    in a room, and ends when either peer leaves the room or disconnects.
+    Renegotiation offers and answers within an active session are
+    ignored. All bookkeeping is in memory; persistence is handed off to
+    the CallSessionWriter without awaiting.
+    """
+
+    def __init__(self, writer: CallSessionWriter):
+        self.writer = writer
+        # (offerer, target) -> room of the most recent unanswered offer
+        self._pending_offers: Dict[Tuple[int, int], UUID] = {}
+        self._active: Dict[PairKey, CallSession] = {}
+        self._by_user: Dict[int, Set[PairKey]] = {}
+
+    @staticmethod
+    def _pair_key(room_id: UUID, user_a: int, user_b: int) -> PairKey:
+        return (room_id, min(user_a, user_b), max(user_a, user_b))
+
+    @property
+    def active_count(self) -> int:
+        """Number of calls currently in progress"""
+        return len(self._active)
+
+    def on_offer(self, room_id: Optional[UUID], offerer_id: int, target_id: int) -> None:
+        """Remember an offer so the matching answer can start a session"""
+        if room_id is None or offerer_id == target_id:
+            return
+        self._pending_offers[(offerer_id, target_id)] = room_id
+
+    def on_answer(self, answerer_id: int, offerer_id: int) -> None:
+        """Start a session on the first answer between two peers"""
+        room_id = self._pending_offers.pop((offerer_id, answerer_id), None)
+        if room_id is None:
+            return
+
+        key = self._pair_key(room_id, offerer_id, answerer_id)
+        if key in self._active:
+            return
+
+        session = CallSession(
+            room_id=room_id,
+            caller_id=offerer_id,
+            callee_id=answerer_id,
+            started_at=datetime.utcnow()
+        )
+        self._active[key] = session
+        self._by_user.setdefault(offerer_id, set()).add(key)
+        self._by_user.setdefault(answerer_id, set()).add(key)
+        self.writer.record_start(session)
+
+        logger.info(f"Call started in room {room_id}: {offerer_id} -> {answerer_id}")
+
+    def on_leave(self, room_id: UUID, user_id: int) -> None:
+        """End the user's sessions in a room"""
+        self._end_sessions(user_id, lambda key: key[0] == room_id)
+        self._pending_offers = {
+            pair: offer_room
+            for pair, offer_room in self._pending_offers.items()
+            if not (offer_room == room_id and user_id in pair)
+        }
+
+    def on_disconnect(self, user_id: int) -> None:
+        """End all of the user's sessions"""
+        self._end_sessions(user_id, lambda key: True)
+        self._pending_offers = {
+            pair: offer_room
+            for pair, offer_room in self._pending_offers.items()
+            if user_id not in pair
+        }
+
+    def _end_sessions(self, user_id: int, matches) -> None:
+        """End and unindex the user's active sessions whose key matches"""
+        keys = [key for key in self._by_user.get(user_id, ()) if matches(key)]
+        for key in keys:
+            session = self._active.pop(key)
+            for participant_id in key[1:]:
+                participant_keys = self._by_user.get(participant_id)
+                if participant_keys is not None:
+                    participant_keys.discard(key)
+                    if not participant_keys:
+                        del self._by_user[participant_id]
+
+            session.end()
+            self.writer.record_end(session)
+
+            logger.info(
+                f"Call ended in room {session.room_id}: {session.caller_id} -> "
+                f"{session.callee_id} after {session.duration_seconds}s"
+            )
@@ -0,0 +1,172 @@
+"""Aggregation of client-reported call quality stats"""
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Set, Tuple
+from uuid import UUID
+
+from ...core.sketch import QuantileSketch
+
+# Metric name -> largest accepted value; anything above is treated as garbage
+CALL_STATS_METRICS: Dict[str, float] = {
+    "rtt_ms": 60_000.0,
+    "jitter_ms": 60_000.0,
+    "packet_loss_pct": 100.0,
+    "bitrate_kbps": 1_000_000.0,
+}
+
+QUANTILES = (0.5, 0.95)
+
+
+class MetricSketches:
+    """One quantile sketch per call stats metric"""
+
+    __slots__ = ("sketches",)
+
+    def __init__(self, relative_accuracy: float, max_buckets: int):
+        self.sketches = {
+            metric: QuantileSketch(relative_accuracy, max_buckets)
+            for metric in CALL_STATS_METRICS
+        }
+
+    def add(self, values: Mapping[str, float]) -> None:
+        """Add one sample per metric present"""
+        for metric, value in values.items():
+            self.sketches[metric].add(value)
+
+    def summary(self) -> Dict[str, Any]:
+        """Get count, p50 and p95 of every metric"""
+        return {
+            metric: {
+                "count": sketch.count,
+                **{f"p{int(q * 100)}": _round(sketch.quantile(q)) for q in QUANTILES},
+            }
+            for metric, sketch in self.sketches.items()
+        }
+
+
+class RoomCallStats:
+    """Call stats of one room, overall and per peer pair"""
+
+    __slots__ = ("room", "pairs", "reporters", "reports")
+
+    def __init__(self, room: MetricSketches):
+        self.room = room
+        self.pairs: Dict[Tuple[int, int], MetricSketches] = {}
+        # Users that sent reports, i.e. took part in the room's calls
+        self.reporters: Set[int] = set()
+        self.reports = 0
+
+
+class CallStatsAggregator:
+    """
+    Aggregates call-stats reports in constant memory
+
+    Every report is folded into fixed-size quantile sketches for its room
+    and for its (unordered) peer pair, so memory is bounded by the number
+    of tracked rooms and pairs, not by the number of reports. Rooms are
+    kept in LRU order; the least recently reported room is dropped when
+    max_rooms is exceeded, and new pairs beyond max_pairs_per_room are
+    ignored.
+
+    Ingestion is synchronous and does no I/O.
+    """
+
+    def __init__(
+        self,
+        max_rooms: int = 10_000,
+        max_pairs_per_room: int = 64,
+        relative_accuracy: float = 0.01,
+        max_buckets: int = 256
+    ):
+        self.max_rooms = max_rooms
+        self.max_pairs_per_room = max_pairs_per_room
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._rooms: "OrderedDict[UUID, RoomCallStats]" = OrderedDict()
+        self.accepted = 0
+        self.rejected = 0
+
+    def record(self, room_id: UUID, reporter_id: int, peer_id: int, report: Mapping[str, Any]) -> bool:
+        """
+        Fold one peer report into room and pair sketches
+
+        Returns:
+            False if the report carried no valid metric
+        """
+        values = _parse_metrics(report)
+        if not values or reporter_id == peer_id:
+            self.rejected += 1
+            return False
+
+        stats = self._rooms.get(room_id)
+        if stats is None:
+            stats = self._rooms[room_id] = RoomCallStats(self._new_sketches())
+            if len(self._rooms) > self.max_rooms:
+                self._rooms.popitem(last=False)
+        else:
+            self._rooms.move_to_end(room_id)
+
+        stats.room.add(values)
+
+        pair = (reporter_id, peer_id) if reporter_id < peer_id else (peer_id, reporter_id)
+        pair_stats = stats.pairs.get(pair)
+        if pair_stats is None and len(stats.pairs) < self.max_pairs_per_room:
+            pair_stats = stats.pairs[pair] = self._new_sketches()
+        if pair_stats is not None:
+            pair_stats.add(values)
+
+        stats.reporters.add(reporter_id)
+        stats.reports += 1
+        self.accepted += 1
+        return True
+
+    def discard_room(self, room_id: UUID) -> None:
+        """Drop stats of a room"""
+        self._rooms.pop(room_id, None)
+
+    def has_reporter(self, room_id: UUID, user_id: int) -> bool:
+        """Whether the user sent stats for the room"""
+        stats = self._rooms.get(room_id)
+        return stats is not None and user_id in stats.reporters
+
+    def get_room_summary(self, room_id: UUID) -> Optional[Dict[str, Any]]:
+        """Get p50/p95 of a room and each of its peer pairs, or None if unknown"""
+        stats = self._rooms.get(room_id)
+        if stats is None:
+            return None
+
+        return {
+            "room_id": str(room_id),
+            "reports": stats.reports,
+            "metrics": stats.room.summary(),
+            "pairs": [
+                {"user_ids": list(pair), "metrics": sketches.summary()}
+                for pair, sketches in stats.pairs.items()
+            ],
+        }
+
+    def stats(self) -> Dict[str, int]:
+        """Get ingestion counters"""
+        return {
+            "rooms": len(self._rooms),
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+        }
+
+    def _new_sketches(self) -> MetricSketches:
+        return MetricSketches(self.relative_accuracy, self.max_buckets)
+
+
+def _parse_metrics(report: Mapping[str, Any]) -> Dict[str, float]:
+    """Pick valid metric values out of a client report"""
+    values = {}
+    for metric, upper_bound in CALL_STATS_METRICS.items():
+        value = report.get(metric)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            # NaN and infinity fail the range check
+            if 0 <= value <= upper_bound:
+                values[metric] = float(value)
+    return values
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 3) if value is not None else None
@@ -1,8 +1,12 @@
 """WebSocket connection manager"""
-from typing import Dict, Set
+import asyncio
+import random
+from typing import Callable, Dict, List, Optional, Sequence, Set
 from uuid import UUID
-from fastapi import WebSocket
+from fastapi import WebSocket, status
 from ...core.logger import get_logger
+from ...core.tracing import tracer
+from .outbound_queue import DEFAULT_LANE_WEIGHTS, OutboundQueue, lane_of
 
 logger = get_logger(__name__)
 
@@ -14,13 +18,30 @@ class ConnectionManager:
     Attributes:
         active_connections: Map of user_id -> WebSocket
         rooms: Map of room_id -> Set of user_ids
+        draining: True once the process stopped accepting sockets
+        on_room_empty: Called with the ID of a room its last user left
+
+    Messages to a user are sent in priority order by the user's
+    OutboundQueue, see outbound_queue.py.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        lane_weights: Sequence[int] = DEFAULT_LANE_WEIGHTS,
+        max_pending_per_connection: int = 1000
+    ):
         # user_id -> WebSocket
         self.active_connections: Dict[int, WebSocket] = {}
+        # user_id -> outbound queue of the user's current socket
+        self._outbound: Dict[int, OutboundQueue] = {}
+        self.lane_weights = tuple(lane_weights)
+        self.max_pending_per_connection = max_pending_per_connection
         # room_id -> Set[user_id]
         self.rooms: Dict[UUID, Set[int]] = {}
+        self.draining = False
+        # user_id -> rooms restored from a snapshot, until the user reconnects
+        self._restored: Dict[int, Set[UUID]] = {}
+        self.on_room_empty: Optional[Callable[[UUID], None]] = None
 
     async def connect(self, websocket: WebSocket, user_id: int):
         """Accept and store WebSocket connection"""
@@ -28,8 +49,19 @@ class ConnectionManager:
         self.active_connections[user_id] = websocket
         logger.info(f"User {user_id} connected. Total connections: {len(self.active_connections)}")
 
+    def has_restored_rooms(self, user_id: int) -> bool:
+        """Whether the user was in a call kept over a restart and has not reconnected yet"""
+        return user_id in self._restored
+
+    def claim_restored_rooms(self, user_id: int) -> List[UUID]:
+        """Keep rooms restored for a reconnecting user, returning them"""
+        return sorted(self._restored.pop(user_id, ()), key=str)
+
     def disconnect(self, user_id: int):
         """Remove WebSocket connection"""
+        queue = self._outbound.pop(user_id, None)
+        if queue is not None:
+            queue.close()
         if user_id in self.active_connections:
             del self.active_connections[user_id]
             logger.info(f"User {user_id} disconnected. Total connections: {len(self.active_connections)}")
@@ -39,17 +71,65 @@ class ConnectionManager:
                 if user_id in self.rooms[room_id]:
                     self.rooms[room_id].discard(user_id)
                     if not self.rooms[room_id]:
-                        del self.rooms[room_id]
+                        self._drop_room(room_id)
 
-    async def send_personal_message(self, message: dict, user_id: int):
-        """Send message to specific user"""
-        if user_id in self.active_connections:
-            try:
-                await self.active_connections[user_id].send_json(message)
-                logger.debug(f"Sent message to user {user_id}: {message.get('type')}")
-            except Exception as e:
-                logger.error(f"Error sending message to user {user_id}: {e}")
-                self.disconnect(user_id)
+    async def send_personal_message(self, message: dict, user_id: int) -> bool:
+        """
+        Queue message to specific user
+
+        Returns once the message is queued; the user's outbound queue
+        sends it in priority order.
+
+        Returns:
+            False if the user is not connected or the message was dropped
+        """
+        websocket = self.active_connections.get(user_id)
+        if websocket is None:
+            return False
+
+        queue = self._outbound.get(user_id)
+        if queue is None or queue.websocket is not websocket:
+            if queue is not None:
+                queue.close()
+            queue = self._outbound[user_id] = OutboundQueue(
+                websocket,
+                on_error=lambda e: self._on_send_error(user_id, websocket, e),
+                weights=self.lane_weights,
+                max_pending=self.max_pending_per_connection,
+            )
+
+        lane = lane_of(message)
+        span = tracer.start_span(
+            "ws.queue", user_id=user_id, message_type=str(message.get("type")), lane=lane.name.lower()
+        )
+        if span is not None:
+            # Lets the receiving peer correlate its logs with the trace
+            message = {**message, "trace_id": span.trace_id}
+        if not queue.push(message, lane, span):
+            logger.warning(f"Outbound queue of user {user_id} full, dropped {message.get('type')}")
+            return False
+        return True
+
+    def _on_send_error(self, user_id: int, websocket: WebSocket, error: Exception) -> None:
+        """Drop a connection whose socket failed to send"""
+        logger.error(f"Error sending message to user {user_id}: {error}")
+        if self.active_connections.get(user_id) is websocket:
+            self.disconnect(user_id)
+
+    async def flush(self, timeout: float) -> None:
+        """Wait up to timeout seconds for queued messages to be sent"""
+        joins = [queue.join() for queue in self._outbound.values() if queue.pending]
+        if joins:
+            await asyncio.wait([asyncio.ensure_future(join) for join in joins], timeout=timeout)
+
+    def outbound_stats(self) -> Dict[str, int]:
+        """Get size of outbound queues of current connections"""
+        backlogged = [queue.pending for queue in self._outbound.values() if queue.pending]
+        return {
+            "queued": sum(backlogged),
+            "backlogged_connections": len(backlogged),
+            "max_queued": max(backlogged, default=0),
+        }
 
     async def broadcast_to_room(
         self,
@@ -93,9 +173,15 @@ class ConnectionManager:
 
             # Clean up empty room
             if not self.rooms[room_id]:
-                del self.rooms[room_id]
+                self._drop_room(room_id)
                 logger.info(f"Room {room_id} is now empty and removed")
 
+    def _drop_room(self, room_id: UUID) -> None:
+        """Forget a room its last user left"""
+        del self.rooms[room_id]
+        if self.on_room_empty is not None:
+            self.on_room_empty(room_id)
+
     def get_room_participants(self, room_id: UUID) -> Set[int]:
         """Get set of user IDs in room"""
         return self.rooms.get(room_id, set()).copy()
@@ -111,3 +197,81 @@ class ConnectionManager:
     def get_active_rooms_count(self) -> int:
         """Get count of active rooms"""
         return len(self.rooms)
+
+    def restore_rooms(self, rooms: Dict[UUID, Set[int]], reconnect_window: float) -> None:
+        """
+        Restore room membership saved by a previous process
+
+        Restored users count as room members right away. Those that have
+        not reconnected within reconnect_window seconds are removed.
+        """
+        for room_id, user_ids in rooms.items():
+            self.rooms.setdefault(room_id, set()).update(user_ids)
+            for user_id in user_ids:
+                if user_id not in self.active_connections:
+                    self._restored.setdefault(user_id, set()).add(room_id)
+
+        if self._restored:
+            asyncio.get_running_loop().call_later(reconnect_window, self._expire_restored)
+        logger.info(
+            f"Restored {len(rooms)} rooms with {len(self._restored)} users awaiting reconnect"
+        )
+
+    def _expire_restored(self) -> None:
+        """Remove restored users that did not reconnect"""
+        expired, self._restored = self._restored, {}
+        for user_id, room_ids in expired.items():
+            for room_id in room_ids:
+                members = self.rooms.get(room_id)
+                if members is not None:
+                    members.discard(user_id)
+                    if not members:
+                        self._drop_room(room_id)
+        if expired:
+            logger.info(f"Dropped {len(expired)} restored users that did not reconnect")
+
+    async def send_reconnect_hints(self, max_delay: float, timeout: float) -> int:
+        """
+        Ask every connected user to reconnect after a random delay
+
+        Delays are spread uniformly over [0, max_delay] seconds so that
+        clients do not all reconnect to the next process at once. Hints go
+        through the users' outbound queues on the control lane, so they
+        never race the queues' writes, and this waits up to timeout
+        seconds for the queues to be sent.
+
+        Returns:
+            Number of users the hint was queued for
+        """
+        queued = 0
+        for user_id in list(self.active_connections):
+            delay_ms = int(random.uniform(0, max_delay) * 1000)
+            hint = {"type": "reconnect", "reason": "server-restart", "delay_ms": delay_ms}
+            if await self.send_personal_message(hint, user_id):
+                queued += 1
+        await self.flush(timeout)
+        return queued
+
+    async def close_all(self, timeout: float) -> None:
+        """Send what is queued, then close every socket with 1012 (service restart)"""
+        await self.flush(timeout)
+        # Stop the senders first, so no write races the close frame
+        for queue in self._outbound.values():
+            queue.close()
+        self._outbound.clear()
+
+        async def close(user_id: int, websocket: WebSocket) -> None:
+            try:
+                await websocket.close(code=status.WS_1012_SERVICE_RESTART)
+            except Exception as e:
+                logger.debug(f"Failed to close socket of user {user_id}: {e}")
+
+        closes = [
+            asyncio.ensure_future(close(user_id, websocket))
+            for user_id, websocket in list(self.active_connections.items())
+        ]
+        if not closes:
+            return
+        _, pending = await asyncio.wait(closes, timeout=timeout)
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,185 @@
+"""Pipelined handling of a WebSocket connection's inbound messages"""
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Optional, Tuple
+
+from ...core.tracing import Span
+
+# Message types relayed to a single peer; other types act on rooms or the sender
+TARGETED_TYPES = frozenset({"offer", "answer", "ice-candidate", "call-rejected"})
+
+_NO_BARRIER = object()
+
+
+def ordering_key(message: Any) -> Optional[Hashable]:
+    """
+    Get the key an inbound message is ordered by
+
+    Returns:
+        Target user id of relayed messages, None for messages that must
+        run in order with everything else
+    """
+    if not isinstance(message, dict) or message.get("type") not in TARGETED_TYPES:
+        return None
+    target = message.get("target_user_id")
+    if isinstance(target, (int, str)) and not isinstance(target, bool):
+        return target
+    return None
+
+
+class _Segment:
+    """Keyed messages that may run concurrently, then an optional barrier"""
+
+    __slots__ = ("queues", "barrier")
+
+    def __init__(self):
+        self.queues: Dict[Hashable, Deque[Tuple[Any, Optional[Span]]]] = {}
+        self.barrier: Any = _NO_BARRIER
+
+
+class InboundPipeline:
+    """
+    Handles a connection's inbound messages without blocking its receive loop
+
+    Messages with the same key are handled one after another in arrival
+    order, while messages for different keys are handled concurrently,
+    by one task per key that runs while the key has messages queued.
+    A message without a key is a barrier: it starts once every earlier
+    message is handled, and later messages wait for it. The sender's
+    messages to one peer therefore keep their order, and room membership
+    changes stay ordered with the messages around them.
+
+    At most max_pending messages are queued or being handled; submit()
+    waits beyond that, so a connection that sends faster than it is
+    handled stops being read instead of queueing without bound.
+    """
+
+    def __init__(
+        self,
+        handle: Callable[[Any], Awaitable[None]],
+        on_error: Callable[[Exception], None],
+        max_pending: int = 64
+    ):
+        self.handle = handle
+        self.on_error = on_error
+        self.max_pending = max_pending
+        self._segments: Deque[_Segment] = deque()
+        # key -> task handling the first segment's messages of that key
+        self._workers: Dict[Hashable, asyncio.Task] = {}
+        self._barrier_task: Optional[asyncio.Task] = None
+        self._pending = 0
+        self._space = asyncio.Event()
+        self._space.set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._closed = False
+        self.handled = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of messages submitted and not handled yet"""
+        return self._pending
+
+    async def submit(self, message: Any, key: Optional[Hashable], span: Optional[Span] = None) -> None:
+        """
+        Queue a message for handling, waiting while the pipeline is full
+
+        Handling a message with a span is traced as its ws.dispatch child.
+        """
+        while self._pending >= self.max_pending:
+            self._space.clear()
+            await self._space.wait()
+        if self._closed:
+            return
+
+        self._pending += 1
+        self._idle.clear()
+        segment = self._segments[-1] if self._segments else None
+        if segment is None or segment.barrier is not _NO_BARRIER:
+            segment = _Segment()
+            self._segments.append(segment)
+
+        if key is None:
+            segment.barrier = (message, span)
+        else:
+            queue = segment.queues.get(key)
+            if queue is None:
+                queue = segment.queues[key] = deque()
+            queue.append((message, span))
+
+        if segment is self._segments[0]:
+            if key is None:
+                if not self._workers:
+                    self._advance()
+            elif key not in self._workers:
+                self._workers[key] = asyncio.create_task(self._drain(segment, key))
+
+    def _advance(self) -> None:
+        """Start on the first segment once its earlier work is done"""
+        while self._segments and not self._closed:
+            segment = self._segments[0]
+            if segment.queues:
+                for key in segment.queues:
+                    self._workers[key] = asyncio.create_task(self._drain(segment, key))
+                return
+            if segment.barrier is not _NO_BARRIER:
+                if self._barrier_task is None:
+                    self._barrier_task = asyncio.create_task(self._run_barrier(segment))
+                return
+            self._segments.popleft()
+
+    async def _drain(self, segment: _Segment, key: Hashable) -> None:
+        """Handle a key's queued messages in order"""
+        queue = segment.queues[key]
+        try:
+            while queue:
+                await self._handle(*queue.popleft())
+        finally:
+            del segment.queues[key]
+            del self._workers[key]
+            if not self._workers:
+                self._advance()
+
+    async def _run_barrier(self, segment: _Segment) -> None:
+        """Handle a barrier message, then move on to the next segment"""
+        try:
+            await self._handle(*segment.barrier)
+        finally:
+            self._barrier_task = None
+            if self._segments and self._segments[0] is segment:
+                self._segments.popleft()
+            self._advance()
+
+    async def _handle(self, message: Any, span: Optional[Span]) -> None:
+        try:
+            if span is None:
+                await self.handle(message)
+            else:
+                with span.child("ws.dispatch"):
+                    await self.handle(message)
+            self.handled += 1
+        except Exception as e:
+            self.on_error(e)
+        finally:
+            self._pending -= 1
+            if self._pending < self.max_pending:
+                self._space.set()
+            if not self._pending:
+                self._idle.set()
+
+    async def join(self) -> None:
+        """Wait until every submitted message was handled"""
+        await self._idle.wait()
+
+    async def close(self, timeout: float) -> None:
+        """Wait up to timeout seconds for submitted messages, then drop the rest"""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._closed = True
+        self._segments.clear()
+        for task in [*self._workers.values(), self._barrier_task]:
+            if task is not None:
+                task.cancel()
+        self._space.set()
@@ -0,0 +1,187 @@
+"""Server-side assignment of WebRTC offerers in mesh rooms"""
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from ...core.logger import get_logger
+
+logger = get_logger(__name__)
+
+Pair = Tuple[int, int]
+
+
+def _pair(a: int, b: int) -> Pair:
+    return (a, b) if a < b else (b, a)
+
+
+class NegotiationCoordinator:
+    """
+    Decides which peer sends the offer for every pair in a room
+
+    The newcomer is the offerer for each pair it forms with the peers
+    already in the room, unless the pair is already negotiating (e.g.
+    the caller of a 1:1 call offered before the callee joined). Only the
+    newcomer is told whom to offer to, so a join costs one offer and one
+    answer per pair.
+
+    Offers into a room are spread over time: every assigned offer takes
+    the next free slot of the room, offer_stagger_ms apart, so a burst of
+    joins does not make every peer create and answer offers at once.
+
+    Glare: while an offer of a pair is unanswered, an offer in the other
+    direction is not forwarded and its sender is told to expect the
+    pending one instead. Unanswered offers are forgotten once they are
+    older than pending_offer_timeout, and a pair's state once either
+    peer leaves the room.
+
+    Attributes:
+        max_mesh_size: Maximum participants of a room
+    """
+
+    def __init__(
+        self,
+        max_mesh_size: int = 8,
+        offer_stagger_ms: int = 150,
+        pending_offer_timeout: float = 10.0
+    ):
+        self.max_mesh_size = max_mesh_size
+        self.offer_stagger = offer_stagger_ms / 1000
+        self.pending_offer_timeout = pending_offer_timeout
+        # room_id -> pair -> offerer
+        self._offerers: Dict[UUID, Dict[Pair, int]] = {}
+        # room_id -> monotonic time of the next free offer slot
+        self._next_slot: Dict[UUID, float] = {}
+        # pair -> (offerer, monotonic time) of the unanswered offer
+        self._pending: Dict[Pair, Tuple[int, float]] = {}
+        # user_id -> rooms where the user has pairs
+        self._user_rooms: Dict[int, Set[UUID]] = {}
+        self._last_expiry = time.monotonic()
+
+    def can_join(self, participants: Set[int], user_id: int) -> bool:
+        """Check that user_id fits into a room with these participants"""
+        return user_id in participants or len(participants) < self.max_mesh_size
+
+    def plan_join(self, room_id: UUID, user_id: int, existing: Set[int]) -> List[Tuple[int, int]]:
+        """
+        Assign offerers for the pairs formed by a newcomer
+
+        Args:
+            room_id: Room joined
+            user_id: Newcomer
+            existing: Participants already in the room
+
+        Returns:
+            (peer, delay_ms) for every peer the newcomer should send an
+            offer to, in the order the offers should be created
+        """
+        offerers = self._offerers.get(room_id, {})
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(room_id, now))
+
+        plan = []
+        for peer in sorted(existing):
+            pair = _pair(user_id, peer)
+            if peer == user_id or pair in offerers:
+                continue
+            self._assign(room_id, pair, user_id)
+            plan.append((peer, round((slot - now) * 1000)))
+            slot += self.offer_stagger
+
+        if plan:
+            self._next_slot[room_id] = slot
+        return plan
+
+    def offerer(self, room_id: UUID, a: int, b: int) -> Optional[int]:
+        """Get the assigned offerer of a pair"""
+        return self._offerers.get(room_id, {}).get(_pair(a, b))
+
+    def on_offer(self, room_id: Optional[UUID], offerer: int, target: int) -> bool:
+        """
+        Record an offer
+
+        Returns:
+            False if the offer collides with an unanswered offer in the
+            other direction and must not be forwarded
+        """
+        pair = _pair(offerer, target)
+        now = time.monotonic()
+        if now - self._last_expiry >= self.pending_offer_timeout:
+            self._expire_pending(now)
+        pending = self._pending.get(pair)
+        if pending and pending[0] == target and now - pending[1] < self.pending_offer_timeout:
+            logger.info(f"Dropped offer from user {offerer} to user {target}: glare")
+            return False
+
+        self._pending[pair] = (offerer, now)
+        if room_id is not None and pair not in self._offerers.get(room_id, {}):
+            self._assign(room_id, pair, offerer)
+        return True
+
+    def _assign(self, room_id: UUID, pair: Pair, offerer: int) -> None:
+        """Record the offerer of a pair"""
+        self._offerers.setdefault(room_id, {})[pair] = offerer
+        for user_id in pair:
+            self._user_rooms.setdefault(user_id, set()).add(room_id)
+
+    def _expire_pending(self, now: float) -> None:
+        """Forget unanswered offers older than pending_offer_timeout"""
+        self._last_expiry = now
+        expired = [
+            pair for pair, (_, offered_at) in self._pending.items()
+            if now - offered_at >= self.pending_offer_timeout
+        ]
+        for pair in expired:
+            del self._pending[pair]
+
+    def on_answer(self, answerer: int, offerer: int) -> None:
+        """Record an answer, completing the pending offer of the pair"""
+        pair = _pair(answerer, offerer)
+        pending = self._pending.get(pair)
+        if pending and pending[0] == offerer:
+            del self._pending[pair]
+
+    def on_leave(self, room_id: UUID, user_id: int) -> None:
+        """Forget the pairs of a user that left a room, on both sides"""
+        self._discard_user_room(user_id, room_id)
+
+        offerers = self._offerers.get(room_id)
+        if offerers is None:
+            return
+        peers = set()
+        for pair in [pair for pair in offerers if user_id in pair]:
+            del offerers[pair]
+            self._pending.pop(pair, None)
+            peers.update(pair)
+        if not offerers:
+            del self._offerers[room_id]
+            self._next_slot.pop(room_id, None)
+
+        # Peers without pairs left in the room no longer index it
+        remaining = {peer for pair in offerers for peer in pair}
+        for peer in peers - remaining - {user_id}:
+            self._discard_user_room(peer, room_id)
+
+    def _discard_user_room(self, user_id: int, room_id: UUID) -> None:
+        """Remove a room from the rooms where a user has pairs"""
+        rooms = self._user_rooms.get(user_id)
+        if rooms is not None:
+            rooms.discard(room_id)
+            if not rooms:
+                del self._user_rooms[user_id]
+
+    def on_disconnect(self, user_id: int) -> None:
+        """Forget every pair of a disconnected user"""
+        for room_id in list(self._user_rooms.get(user_id, ())):
+            self.on_leave(room_id, user_id)
+        # Offers outside rooms (no room_id) are only in _pending
+        for pair in [pair for pair in self._pending if user_id in pair]:
+            del self._pending[pair]
+
+    def stats(self) -> Dict[str, int]:
+        """Get coordinator counters"""
+        return {
+            "rooms": len(self._offerers),
+            "pairs": sum(len(offerers) for offerers in self._offerers.values()),
+            "pending_offers": len(self._pending),
+            "users": len(self._user_rooms),
+        }
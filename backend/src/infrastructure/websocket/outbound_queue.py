@@ -0,0 +1,177 @@
+"""Prioritized outbound message queue of a WebSocket connection"""
+import asyncio
+from collections import deque
+from enum import IntEnum
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+from fastapi import WebSocket
+
+from ...core.tracing import Span
+
+
+class Lane(IntEnum):
+    """Priority class of an outbound message, lower is more urgent"""
+    CONTROL = 0
+    SDP = 1
+    ICE = 2
+    BACKGROUND = 3
+
+
+# Message type -> lane; other types go to the background lane
+MESSAGE_LANES: Dict[str, Lane] = {
+    "connected": Lane.CONTROL,
+    "error": Lane.CONTROL,
+    "reconnect": Lane.CONTROL,
+    "room-users": Lane.CONTROL,
+    "room-full": Lane.CONTROL,
+    "user-joined": Lane.CONTROL,
+    "user-left": Lane.CONTROL,
+    "call-rejected": Lane.CONTROL,
+    "call-invite": Lane.CONTROL,
+    "offer-collision": Lane.CONTROL,
+    "offer": Lane.SDP,
+    "answer": Lane.SDP,
+    "ice-candidate": Lane.ICE,
+    "call-invite-status": Lane.BACKGROUND,
+    "rooms-snapshot": Lane.BACKGROUND,
+    "room-opened": Lane.BACKGROUND,
+    "room-participants-changed": Lane.BACKGROUND,
+    "room-closed": Lane.BACKGROUND,
+}
+
+DEFAULT_LANE_WEIGHTS = (8, 4, 2, 1)
+
+
+def lane_of(message: Dict[str, Any]) -> Lane:
+    """Get the lane of an outbound message"""
+    return MESSAGE_LANES.get(message.get("type"), Lane.BACKGROUND)
+
+
+class OutboundQueue:
+    """
+    Sends a connection's messages in priority order
+
+    Messages wait in one FIFO lane per priority class, and a sender task
+    that only runs while messages are queued writes them to the socket.
+    The sender uses weighted round robin in priority order: within a
+    round, a backlogged lane sends at most its weight in messages, and
+    the most urgent lane with weight left always goes next. Control
+    messages therefore overtake a flood of ICE candidates, while every
+    backlogged lane still gets at least weight / sum(weights) of the
+    sends. Order within a lane is preserved.
+
+    When max_pending messages are queued, the oldest message of the
+    least urgent non-empty lane is dropped, unless the new message is
+    less urgent still, in which case it is dropped instead.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        on_error: Callable[[Exception], None],
+        weights: Sequence[int] = DEFAULT_LANE_WEIGHTS,
+        max_pending: int = 1000
+    ):
+        if len(weights) != len(Lane) or min(weights) <= 0:
+            raise ValueError(f"Expected {len(Lane)} positive lane weights")
+        self.websocket = websocket
+        self.on_error = on_error
+        self.weights = tuple(weights)
+        self.max_pending = max_pending
+        self._lanes: List[Deque[Tuple[Dict[str, Any], Optional[Span]]]] = [deque() for _ in Lane]
+        self._credits = list(self.weights)
+        self._pending = 0
+        self._task: Optional[asyncio.Task] = None
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.sent = 0
+        self.dropped = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of queued messages"""
+        return self._pending
+
+    def push(self, message: Dict[str, Any], lane: Lane, span: Optional[Span] = None) -> bool:
+        """
+        Queue a message
+
+        Returns:
+            False if the message was dropped because the queue is full
+        """
+        if self._pending >= self.max_pending and not self._drop_below(lane):
+            self.dropped += 1
+            return False
+
+        self._lanes[lane].append((message, span))
+        self._pending += 1
+        if self._task is None:
+            self._idle.clear()
+            self._task = asyncio.create_task(self._run())
+        return True
+
+    def _drop_below(self, lane: Lane) -> bool:
+        """Drop the oldest message of the least urgent lane not above lane"""
+        for candidate in range(len(Lane) - 1, lane - 1, -1):
+            if self._lanes[candidate]:
+                _, span = self._lanes[candidate].popleft()
+                if span is not None:
+                    span.set_attribute("error", "dropped")
+                    span.end()
+                self._pending -= 1
+                self.dropped += 1
+                return True
+        return False
+
+    def _next_lane(self) -> int:
+        """Pick the lane to send from next"""
+        for _ in range(2):
+            for lane, queue in enumerate(self._lanes):
+                if queue and self._credits[lane] > 0:
+                    self._credits[lane] -= 1
+                    return lane
+            # Every backlogged lane used up its share of this round
+            self._credits = list(self.weights)
+        raise RuntimeError("No queued message")
+
+    async def _run(self) -> None:
+        """Send queued messages until the queue is empty"""
+        try:
+            while self._pending:
+                message, span = self._lanes[self._next_lane()].popleft()
+                self._pending -= 1
+                send_span = None
+                if span is not None:
+                    span.end()
+                    send_span = span.child("ws.send")
+                try:
+                    await self.websocket.send_json(message)
+                    self.sent += 1
+                except Exception as e:
+                    if send_span is not None:
+                        send_span.set_attribute("error", f"{type(e).__name__}: {e}")
+                    self.clear()
+                    self.on_error(e)
+                    return
+                finally:
+                    if send_span is not None:
+                        send_span.end()
+        finally:
+            self._task = None
+            self._credits = list(self.weights)
+            self._idle.set()
+
+    async def join(self) -> None:
+        """Wait until every queued message was sent"""
+        await self._idle.wait()
+
+    def clear(self) -> None:
+        """Drop all queued messages"""
+        for queue in self._lanes:
+            queue.clear()
+        self._pending = 0
+
+    def close(self) -> None:
+        """Drop queued messages and stop sending"""
+        self.clear()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
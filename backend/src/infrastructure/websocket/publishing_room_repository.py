@@ -0,0 +1,136 @@
+"""Room repository decorator publishing changes to lobby subscribers"""
+from datetime import timedelta
+from typing import Optional, List, Dict, Tuple, Iterable
+from uuid import UUID
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...domain.entities.room import Room, RoomParticipant
+from ...domain.repositories.room_repository import RoomRepository
+from .room_feed import RoomFeed
+
+
+class PublishingRoomRepository(RoomRepository):
+    """
+    Room repository publishing room creation, participant changes and
+    closing to the room feed once the surrounding transaction commits
+
+    Rolled back changes are not published, unless the session commits
+    again later; that is harmless since the feed reads the rooms' state
+    before sending events.
+    """
+
+    def __init__(self, repository: RoomRepository, session: AsyncSession, feed: RoomFeed):
+        self.repository = repository
+        self.session = session
+        self.feed = feed
+
+    async def create(self, room: Room) -> Room:
+        """Create a new room"""
+        created_room = await self.repository.create(room)
+        self._publish_after_commit([created_room.id], opened=True)
+        return created_room
+
+    async def create_with_creator(self, room: Room) -> Room:
+        """Create a room with its creator as the first participant"""
+        created_room = await self.repository.create_with_creator(room)
+        self._publish_after_commit([created_room.id], opened=True)
+        return created_room
+
+    async def get_by_id(self, room_id: UUID) -> Optional[Room]:
+        """Get room by ID"""
+        return await self.repository.get_by_id(room_id)
+
+    async def get_many(self, room_ids: List[UUID]) -> List[Room]:
+        """Get several rooms by ID in one query"""
+        return await self.repository.get_many(room_ids)
+
+    async def get_with_participants(
+        self,
+        room_id: UUID
+    ) -> Optional[Tuple[Room, List[RoomParticipant]]]:
+        """Get room with its participants' profiles in one query"""
+        return await self.repository.get_with_participants(room_id)
+
+    async def list_active(self) -> List[Room]:
+        """List all active rooms"""
+        return await self.repository.list_active()
+
+    async def close_room(self, room_id: UUID) -> None:
+        """Close a room"""
+        await self.repository.close_room(room_id)
+        self._publish_after_commit([room_id])
+
+    async def add_participant(self, room_id: UUID, user_id: int) -> None:
+        """Add participant to room"""
+        await self.repository.add_participant(room_id, user_id)
+        self._publish_after_commit([room_id])
+
+    async def remove_participant(self, room_id: UUID, user_id: int) -> None:
+        """Remove participant from room"""
+        await self.repository.remove_participant(room_id, user_id)
+        self._publish_after_commit([room_id])
+
+    async def join_room(
+        self,
+        room_id: UUID,
+        user_id: int,
+        max_participants: Optional[int] = None
+    ) -> None:
+        """Atomically check room, user and participant limit and add participant"""
+        await self.repository.join_room(room_id, user_id, max_participants)
+        self._publish_after_commit([room_id])
+
+    async def leave_room(self, room_id: UUID, user_id: int) -> bool:
+        """Atomically remove participant and close room if empty"""
+        closed = await self.repository.leave_room(room_id, user_id)
+        self._publish_after_commit([room_id])
+        return closed
+
+    async def get_participants(self, room_id: UUID) -> List[int]:
+        """Get list of participant IDs in room"""
+        return await self.repository.get_participants(room_id)
+
+    async def get_participants_many(self, room_ids: List[UUID]) -> Dict[UUID, List[int]]:
+        """Get participant IDs of several rooms in one query"""
+        return await self.repository.get_participants_many(room_ids)
+
+    async def is_participant(self, room_id: UUID, user_id: int) -> bool:
+        """Check if user is participant in room"""
+        return await self.repository.is_participant(room_id, user_id)
+
+    async def list_open_participations(
+        self,
+        older_than: timedelta,
+        after: Optional[Tuple[UUID, int]],
+        limit: int
+    ) -> List[Tuple[UUID, int]]:
+        """List (room_id, user_id) of open participations, keyset-paginated"""
+        return await self.repository.list_open_participations(older_than, after, limit)
+
+    async def close_participations(self, participations: List[Tuple[UUID, int]]) -> int:
+        """Set left_at on given open participations"""
+        closed = await self.repository.close_participations(participations)
+        if closed:
+            self._publish_after_commit(list({room_id for room_id, _ in participations}))
+        return closed
+
+    async def close_empty_rooms(
+        self,
+        older_than: timedelta,
+        exclude_room_ids: Iterable[UUID],
+        limit: int
+    ) -> List[UUID]:
+        """Close active rooms without open participations"""
+        room_ids = await self.repository.close_empty_rooms(older_than, exclude_room_ids, limit)
+        if room_ids:
+            self._publish_after_commit(room_ids)
+        return room_ids
+
+    def _publish_after_commit(self, room_ids: List[UUID], opened: bool = False) -> None:
+        """Publish changed rooms once the session commits"""
+        def _on_commit(_session) -> None:
+            for room_id in room_ids:
+                self.feed.publish(room_id, opened)
+
+        event.listen(self.session.sync_session, "after_commit", _on_commit, once=True)
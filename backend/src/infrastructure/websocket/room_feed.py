@@ -0,0 +1,215 @@
+"""Push of active room list changes to lobby subscribers"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database.base import new_session
+from ..database.repositories.room_repository_impl import RoomRepositoryImpl
+from ...domain.entities.room import Room
+from ...domain.repositories.room_repository import RoomRepository
+from ...core.config import settings
+from ...core.logger import get_logger
+
+logger = get_logger(__name__)
+
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class RoomFeed:
+    """
+    Pushes changes of the active room list to subscribed sockets
+
+    Lobby clients send subscribe-rooms once instead of polling GET /rooms.
+    Room writes publish the room's ID once their transaction commits, see
+    PublishingRoomRepository; publishing is synchronous and O(1). A task
+    that only runs while there is work wakes up once per window, reads
+    the rooms changed during the window with two queries and sends every
+    subscriber one event per changed room:
+
+        - room-opened: room with its participants
+        - room-participants-changed: room ID with its participants
+        - room-closed: room ID
+
+    Events carry the state read at the end of the window, so any number
+    of changes to a room within a window become one event, and a room
+    opened and closed within a window none. New subscribers get a
+    rooms-snapshot of all active rooms from the same pass, read together
+    with the changes, so no event they receive is older than their
+    snapshot. Database load follows the rate of changes, not the number
+    of viewers.
+
+    Every event has the next sequence number, and a snapshot the number
+    of the last event before it. A client that sees a gap, e.g. because
+    its outbound queue dropped an event, subscribes again.
+
+    Only changes made by this process are seen; signaling, and with it
+    the lobby, runs in a single process.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        repository_factory: Callable[[AsyncSession], RoomRepository],
+        window_seconds: float = 0.25
+    ):
+        self.session_factory = session_factory
+        self.repository_factory = repository_factory
+        self.window_seconds = window_seconds
+        # user_id -> send function of the user's socket
+        self._subscribers: Dict[int, Send] = {}
+        # Subscribers waiting for their snapshot, and those whose snapshot is being read
+        self._joining: Dict[int, Send] = {}
+        self._reading: Dict[int, Send] = {}
+        # room_id -> True if the room was created during the window
+        self._changed: Dict[UUID, bool] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.seq = 0
+        self.flushes = 0
+        self.events_sent = 0
+        self.snapshots_sent = 0
+
+    def subscribe(self, user_id: int, send: Send) -> None:
+        """Send the user a snapshot with the next flush, and events from then on"""
+        self._subscribers.pop(user_id, None)
+        self._reading.pop(user_id, None)
+        self._joining[user_id] = send
+        self._wake()
+
+    def unsubscribe(self, user_id: int) -> None:
+        """Stop sending events to the user"""
+        self._subscribers.pop(user_id, None)
+        self._joining.pop(user_id, None)
+        self._reading.pop(user_id, None)
+
+    def publish(self, room_id: UUID, opened: bool = False) -> None:
+        """Record a committed change of a room"""
+        if not self._subscribers and not self._joining and not self._reading:
+            # Nobody to tell; a later subscriber reads the room in its snapshot
+            return
+        self._changed[room_id] = self._changed.get(room_id, False) or opened
+        self._wake()
+
+    def stats(self) -> Dict[str, int]:
+        """Get subscription and delivery counters"""
+        return {
+            "subscribers": len(self._subscribers) + len(self._joining) + len(self._reading),
+            "pending_rooms": len(self._changed),
+            "seq": self.seq,
+            "flushes": self.flushes,
+            "events_sent": self.events_sent,
+            "snapshots_sent": self.snapshots_sent,
+        }
+
+    async def stop(self) -> None:
+        """Stop delivering, dropping pending changes"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._changed.clear()
+
+    def _wake(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Flush once per window while changes or new subscribers are pending"""
+        while self._changed or self._joining:
+            await asyncio.sleep(self.window_seconds)
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Send events for the rooms changed since the last flush, and snapshots to new subscribers"""
+        changed, self._changed = self._changed, {}
+        self._reading, self._joining = self._joining, {}
+        if not changed and not self._reading:
+            return
+
+        try:
+            active = await self._read(list(changed), snapshot=bool(self._reading))
+        except Exception as e:
+            logger.error(f"Failed to read {len(changed)} changed rooms for lobby subscribers: {e}")
+            # Retry with the next window, merged with changes made meanwhile
+            for room_id, opened in changed.items():
+                self._changed[room_id] = self._changed.get(room_id, False) or opened
+            self._joining = {**self._reading, **self._joining}
+            self._reading = {}
+            return
+        self.flushes += 1
+
+        events = []
+        for room_id, opened in changed.items():
+            room = active.get(room_id)
+            if room is None:
+                if opened:
+                    # Opened and closed within the window: nobody saw it
+                    continue
+                event = {"type": "room-closed", "room_id": str(room_id)}
+            elif opened:
+                event = {"type": "room-opened", "room": room}
+            else:
+                event = {
+                    "type": "room-participants-changed",
+                    "room_id": str(room_id),
+                    "participants": room["participants"],
+                }
+            self.seq += 1
+            event["seq"] = self.seq
+            events.append(event)
+
+        for user_id, send in list(self._subscribers.items()):
+            for event in events:
+                if self._subscribers.get(user_id) is not send:
+                    break
+                await send(event)
+                self.events_sent += 1
+
+        # Those who unsubscribed or subscribed again during the read are gone from here
+        joining, self._reading = self._reading, {}
+        if joining:
+            snapshot = {"type": "rooms-snapshot", "seq": self.seq, "rooms": list(active.values())}
+            for user_id, send in joining.items():
+                await send(snapshot)
+                self._subscribers[user_id] = send
+                self.snapshots_sent += 1
+
+    async def _read(self, room_ids: List[UUID], snapshot: bool) -> Dict[UUID, Dict[str, Any]]:
+        """
+        Read active rooms with their participants
+
+        Returns:
+            Map of room ID to room payload, for all active rooms if
+            snapshot is set, otherwise for the active ones of room_ids
+        """
+        async with self.session_factory() as session:
+            repository = self.repository_factory(session)
+            if snapshot:
+                rooms = await repository.list_active()
+            else:
+                rooms = [room for room in await repository.get_many(room_ids) if room.is_active]
+            participants = await repository.get_participants_many([room.id for room in rooms])
+        return {room.id: _room_payload(room, participants[room.id]) for room in rooms}
+
+
+def _room_payload(room: Room, participants: List[int]) -> Dict[str, Any]:
+    """Room fields as sent to lobby subscribers, matching GET /rooms"""
+    return {
+        "id": str(room.id),
+        "creator_id": room.creator_id,
+        "is_active": room.is_active,
+        "created_at": room.created_at.isoformat(),
+        "closed_at": room.closed_at.isoformat() if room.closed_at else None,
+        "participants": participants,
+    }
+
+
+# Global room feed, fed by the room repositories of all requests and tasks
+room_feed = RoomFeed(
+    session_factory=new_session,
+    repository_factory=RoomRepositoryImpl,
+    window_seconds=settings.ROOM_FEED_WINDOW_SECONDS,
+)
@@ -0,0 +1,148 @@
+"""Background reconciliation of socket room membership with database state"""
+import asyncio
+import time
+from dataclasses import dataclass, asdict
+from datetime import timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .connection_manager import ConnectionManager
+from ...domain.repositories.room_repository import RoomRepository
+from ...core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ReconcileReport:
+    """Result of a reconciliation pass"""
+    closed_participations: int = 0
+    closed_rooms: int = 0
+    batches: int = 0
+    duration_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert report to dict"""
+        return asdict(self)
+
+
+class RoomReconciler:
+    """
+    Periodically closes database participations and rooms that have no
+    live socket membership
+
+    Socket join/leave only updates ConnectionManager.rooms, and a dying
+    socket never closes its room_participants row. This task diffs open
+    participations against live membership and fixes the drift with bulk
+    UPDATEs, one short transaction per batch.
+
+    Live membership is per process, so the reconciler must only run where
+    a single process serves all signaling sockets.
+
+    Attributes:
+        last_report: Report of the most recent pass
+    """
+
+    def __init__(
+        self,
+        manager: ConnectionManager,
+        session_factory: Callable[[], AsyncSession],
+        repository_factory: Callable[[AsyncSession], RoomRepository],
+        interval_seconds: float = 60.0,
+        grace_seconds: float = 120.0,
+        batch_size: int = 500,
+        max_batches: int = 20,
+        should_defer: Optional[Callable[[], bool]] = None
+    ):
+        self.manager = manager
+        self.session_factory = session_factory
+        self.repository_factory = repository_factory
+        self.interval_seconds = interval_seconds
+        # Participations and rooms younger than this are left alone, so a
+        # REST join is not closed before the socket join-room arrives
+        self.grace = timedelta(seconds=grace_seconds)
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        # Passes are skipped while this says the node is overloaded
+        self.should_defer = should_defer
+        self.last_report: Optional[ReconcileReport] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start periodic reconciliation"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop periodic reconciliation"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Reconciliation loop"""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            if self.should_defer is not None and self.should_defer():
+                logger.info("Node overloaded, skipping room reconciliation")
+                continue
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error(f"Room reconciliation failed: {e}")
+
+    async def reconcile(self) -> ReconcileReport:
+        """Run one reconciliation pass"""
+        started = time.perf_counter()
+        report = ReconcileReport()
+
+        cursor: Optional[Tuple[UUID, int]] = None
+        while report.batches < self.max_batches:
+            async with self.session_factory() as session:
+                repository = self.repository_factory(session)
+                participations = await repository.list_open_participations(
+                    self.grace, cursor, self.batch_size
+                )
+                if not participations:
+                    break
+
+                stale = [
+                    (room_id, user_id)
+                    for room_id, user_id in participations
+                    if user_id not in self.manager.rooms.get(room_id, ())
+                ]
+                report.closed_participations += await repository.close_participations(stale)
+                await session.commit()
+
+            report.batches += 1
+            cursor = participations[-1]
+            if len(participations) < self.batch_size:
+                break
+
+        while report.batches < self.max_batches:
+            async with self.session_factory() as session:
+                repository = self.repository_factory(session)
+                closed_room_ids = await repository.close_empty_rooms(
+                    self.grace, list(self.manager.rooms.keys()), self.batch_size
+                )
+                await session.commit()
+
+            report.batches += 1
+            report.closed_rooms += len(closed_room_ids)
+            if len(closed_room_ids) < self.batch_size:
+                break
+
+        report.duration_ms = round((time.perf_counter() - started) * 1000, 2)
+        self.last_report = report
+
+        if report.closed_participations or report.closed_rooms:
+            logger.info(
+                f"Room reconciliation closed {report.closed_participations} participations "
+                f"and {report.closed_rooms} rooms in {report.duration_ms}ms"
+            )
+        return report
@@ -0,0 +1,101 @@
+"""Hand-over of socket room membership between processes through Redis"""
+import json
+from typing import Dict, Optional, Set
+from uuid import UUID
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from ...core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RoomSnapshotStore:
+    """
+    Saves ConnectionManager.rooms on drain and loads it on startup
+
+    The snapshot is a Redis hash of room_id -> JSON list of user ids, so
+    several draining processes merge their rooms into one snapshot. It
+    expires after ttl_seconds, and is deleted by the process that loads
+    it. Redis failures are logged and treated as an empty snapshot, so a
+    restart without Redis only loses the hand-over.
+    """
+
+    KEY = "signaling:rooms"
+
+    def __init__(self, redis_url: Optional[str], ttl_seconds: int = 120):
+        self.ttl_seconds = ttl_seconds
+        self._redis_url = redis_url
+        self._redis: Optional[aioredis.Redis] = None
+
+    async def save(self, rooms: Dict[UUID, Set[int]]) -> int:
+        """
+        Save room membership
+
+        Args:
+            rooms: Map of room_id -> user ids
+
+        Returns:
+            Number of rooms saved
+        """
+        redis = self._get_redis()
+        if redis is None or not rooms:
+            return 0
+
+        mapping = {
+            str(room_id): json.dumps(sorted(user_ids))
+            for room_id, user_ids in rooms.items()
+            if user_ids
+        }
+        try:
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.hset(self.KEY, mapping=mapping)
+                pipe.expire(self.KEY, self.ttl_seconds)
+                await pipe.execute()
+        except (RedisError, OSError) as e:
+            logger.warning(f"Failed to save room snapshot: {e}")
+            return 0
+        return len(mapping)
+
+    async def load(self) -> Dict[UUID, Set[int]]:
+        """Take the saved room membership, deleting it from Redis"""
+        redis = self._get_redis()
+        if redis is None:
+            return {}
+
+        try:
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.hgetall(self.KEY)
+                pipe.delete(self.KEY)
+                raw, _ = await pipe.execute()
+        except (RedisError, OSError) as e:
+            logger.warning(f"Failed to load room snapshot: {e}")
+            return {}
+
+        rooms: Dict[UUID, Set[int]] = {}
+        for room_id, user_ids in raw.items():
+            try:
+                rooms[UUID(room_id)] = {int(user_id) for user_id in json.loads(user_ids)}
+            except (ValueError, TypeError):
+                logger.warning(f"Skipping malformed room snapshot entry {room_id!r}")
+        return rooms
+
+    async def close(self) -> None:
+        """Close the Redis client"""
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    def _get_redis(self) -> Optional[aioredis.Redis]:
+        """Get Redis client, or None if the snapshot is disabled"""
+        if not self._redis_url:
+            return None
+        if self._redis is None:
+            self._redis = aioredis.from_url(
+                self._redis_url,
+                decode_responses=True,
+                socket_connect_timeout=0.5,
+                socket_timeout=0.5,
+            )
+        return self._redis
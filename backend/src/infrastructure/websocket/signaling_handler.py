@@ -1,7 +1,12 @@
 """WebRTC signaling handler"""
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from uuid import UUID
 from .connection_manager import ConnectionManager
+from .call_session_tracker import CallSessionTracker
+from .call_stats import CallStatsAggregator
+from .negotiation_coordinator import NegotiationCoordinator
+from .call_invites import CallInviteService
+from .room_feed import RoomFeed
 from ...core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -17,10 +22,33 @@ class SignalingHandler:
         - answer: WebRTC answer (SDP)
         - ice-candidate: ICE candidate exchange
         - leave-room: User leaves a call room
+        - call-stats: Periodic WebRTC getStats summary per peer
+        - call-invite: Invite users to the room (socket or Telegram message)
+        - subscribe-rooms: Get the active room list and then its changes
+        - unsubscribe-rooms: Stop getting room list changes
+
+    With a negotiation coordinator, the server picks the offerer of every
+    peer pair: the newcomer gets the peers to offer to in room-users
+    (offer_to, with staggered delays); the others still get user-joined,
+    but must wait for the newcomer's offer. Without one, everyone gets
+    user-joined/room-users and clients decide.
     """
 
-    def __init__(self, manager: ConnectionManager):
+    def __init__(
+        self,
+        manager: ConnectionManager,
+        tracker: Optional[CallSessionTracker] = None,
+        call_stats: Optional[CallStatsAggregator] = None,
+        negotiation: Optional[NegotiationCoordinator] = None,
+        invites: Optional[CallInviteService] = None,
+        room_feed: Optional[RoomFeed] = None
+    ):
         self.manager = manager
+        self.tracker = tracker
+        self.call_stats = call_stats
+        self.negotiation = negotiation
+        self.invites = invites
+        self.room_feed = room_feed
 
     async def handle_message(self, message: Dict[str, Any], user_id: int):
         """Route incoming WebSocket message to appropriate handler"""
@@ -30,6 +58,12 @@ class SignalingHandler:
             logger.warning(f"Received message without type from user {user_id}")
             return
 
+        # Stats arrive from every participant every few seconds; keep them
+        # off the logging and dispatch path used by offer/answer
+        if msg_type == "call-stats":
+            self._handle_call_stats(message, user_id)
+            return
+
         logger.info(f"Handling message type '{msg_type}' from user {user_id}")
 
         handlers = {
@@ -39,6 +73,9 @@ class SignalingHandler:
             "ice-candidate": self._handle_ice_candidate,
             "leave-room": self._handle_leave_room,
             "call-rejected": self._handle_call_rejected,
+            "call-invite": self._handle_call_invite,
+            "subscribe-rooms": self._handle_subscribe_rooms,
+            "unsubscribe-rooms": self._handle_unsubscribe_rooms,
         }
 
         handler = handlers.get(msg_type)
@@ -70,6 +107,47 @@ class SignalingHandler:
         # Get existing participants before adding new user
         existing_participants = self.manager.get_room_participants(room_id)
 
+        if self.negotiation is not None:
+            if not self.negotiation.can_join(existing_participants, user_id):
+                await self.manager.send_personal_message(
+                    {
+                        "type": "room-full",
+                        "room_id": str(room_id),
+                        "max_participants": self.negotiation.max_mesh_size
+                    },
+                    user_id
+                )
+                logger.info(f"User {user_id} rejected from full room {room_id}")
+                return
+
+            self.manager.add_to_room(room_id, user_id)
+            plan = self.negotiation.plan_join(room_id, user_id, existing_participants)
+            # Informational only: peers must not offer on it, the newcomer
+            # offers to the peers listed in offer_to
+            await self.manager.broadcast_to_room(
+                {
+                    "type": "user-joined",
+                    "user_id": user_id,
+                    "room_id": str(room_id)
+                },
+                room_id,
+                exclude_user=user_id
+            )
+            await self.manager.send_personal_message(
+                {
+                    "type": "room-users",
+                    "room_id": str(room_id),
+                    "users": list(existing_participants),
+                    "offer_to": [
+                        {"user_id": peer, "delay_ms": delay_ms}
+                        for peer, delay_ms in plan
+                    ]
+                },
+                user_id
+            )
+            logger.info(f"User {user_id} joined room {room_id}, offering to {len(plan)} peers")
+            return
+
         # Add user to room
         self.manager.add_to_room(room_id, user_id)
 
@@ -106,6 +184,25 @@ class SignalingHandler:
             logger.warning(f"Missing target_user_id or sdp in offer from user {user_id}")
             return
 
+        room_uuid = None
+        if room_id:
+            try:
+                room_uuid = UUID(room_id)
+            except ValueError:
+                logger.warning(f"Invalid room_id format in offer from user {user_id}: {room_id}")
+
+        if self.negotiation and not self.negotiation.on_offer(room_uuid, user_id, target_user_id):
+            # The peer's offer is pending; this side answers it instead
+            await self.manager.send_personal_message(
+                {
+                    "type": "offer-collision",
+                    "target_user_id": target_user_id,
+                    "room_id": room_id
+                },
+                user_id
+            )
+            return
+
         await self.manager.send_personal_message(
             {
                 "type": "offer",
@@ -116,6 +213,9 @@ class SignalingHandler:
             target_user_id
         )
 
+        if self.tracker and (room_uuid is not None or not room_id):
+            self.tracker.on_offer(room_uuid, user_id, target_user_id)
+
         logger.info(f"Forwarded offer from user {user_id} to user {target_user_id}")
 
     async def _handle_answer(self, message: Dict, user_id: int):
@@ -136,6 +236,11 @@ class SignalingHandler:
             target_user_id
         )
 
+        if self.tracker:
+            self.tracker.on_answer(user_id, target_user_id)
+        if self.negotiation:
+            self.negotiation.on_answer(user_id, target_user_id)
+
         logger.info(f"Forwarded answer from user {user_id} to user {target_user_id}")
 
     async def _handle_ice_candidate(self, message: Dict, user_id: int):
@@ -175,6 +280,10 @@ class SignalingHandler:
 
         # Remove user from room
         self.manager.remove_from_room(room_id, user_id)
+        if self.tracker:
+            self.tracker.on_leave(room_id, user_id)
+        if self.negotiation:
+            self.negotiation.on_leave(room_id, user_id)
 
         # Notify other participants
         await self.manager.broadcast_to_room(
@@ -188,6 +297,75 @@ class SignalingHandler:
 
         logger.info(f"User {user_id} left room {room_id}")
 
+    def _handle_call_stats(self, message: Dict, user_id: int):
+        """Handle call quality stats report"""
+        if self.call_stats is None:
+            return
+
+        peers = message.get("peers")
+        try:
+            room_id = UUID(message.get("room_id"))
+        except (TypeError, ValueError):
+            logger.debug(f"Invalid room_id in call-stats from user {user_id}")
+            return
+
+        participants = self.manager.rooms.get(room_id, ())
+        if not isinstance(peers, list) or user_id not in participants:
+            logger.debug(f"Ignoring call-stats from user {user_id} for room {room_id}")
+            return
+
+        for report in peers[:self.call_stats.max_pairs_per_room]:
+            if isinstance(report, dict) and report.get("user_id") in participants:
+                self.call_stats.record(room_id, user_id, report["user_id"], report)
+
+    async def _handle_call_invite(self, message: Dict, user_id: int):
+        """Handle invitation of users to the inviter's room"""
+        if self.invites is None:
+            logger.warning(f"Ignoring call-invite from user {user_id}: invitations disabled")
+            return
+
+        try:
+            room_id = UUID(message.get("room_id"))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid room_id in call-invite from user {user_id}")
+            return
+
+        user_ids = message.get("user_ids")
+        if user_ids is None and message.get("target_user_id") is not None:
+            user_ids = [message.get("target_user_id")]
+        if not isinstance(user_ids, list) or not all(
+            isinstance(callee, int) and not isinstance(callee, bool) for callee in user_ids
+        ):
+            logger.warning(f"Invalid user_ids in call-invite from user {user_id}")
+            return
+
+        if user_id not in self.manager.rooms.get(room_id, ()):
+            raise ValueError("Join the room before inviting users to it")
+
+        callees = list(dict.fromkeys(callee for callee in user_ids if callee != user_id))
+        if len(callees) > self.invites.max_invitees:
+            raise ValueError(f"Cannot invite more than {self.invites.max_invitees} users at once")
+
+        # Delivery runs in the background; the inviter gets call-invite-status
+        self.invites.invite(room_id, user_id, callees, bool(message.get("video_enabled")))
+
+    async def _handle_subscribe_rooms(self, message: Dict, user_id: int):
+        """Handle lobby subscription to the active room list"""
+        if self.room_feed is None:
+            logger.warning(f"Ignoring subscribe-rooms from user {user_id}: room feed disabled")
+            return
+
+        async def send(event: Dict[str, Any]) -> None:
+            await self.manager.send_personal_message(event, user_id)
+
+        # rooms-snapshot follows within one feed window, then room events
+        self.room_feed.subscribe(user_id, send)
+
+    async def _handle_unsubscribe_rooms(self, message: Dict, user_id: int):
+        """Handle end of lobby subscription"""
+        if self.room_feed is not None:
+            self.room_feed.unsubscribe(user_id)
+
     async def _handle_call_rejected(self, message: Dict, user_id: int):
         """Handle call rejection"""
         target_user_id = message.get("target_user_id")
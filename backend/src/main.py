@@ -1,86 +1,206 @@
-"""FastAPI application entry point"""
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+"""
+FastAPI application entry point
+
+Use the create_app() factory, e.g. `uvicorn --factory src.main:create_app`.
+Importing this module only imports FastAPI: routers and their dependency
+graph are imported by create_app(), and the database engine, logging
+handlers and background tasks are created in lifespan.
+"""
 from contextlib import asynccontextmanager
 
-from .core.config import settings
-from .core.logger import logger
-from .presentation.api.v1 import api_router
-from .presentation.websocket import router as websocket_router
-from .infrastructure.database import engine, Base
+from fastapi import Depends, FastAPI, HTTPException, Query, Response, status
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+
+from .core.config import get_settings
+from .core.logger import configure_logging, get_logger
+from .core.profiling import (
+    LoopLagMonitor,
+    ProfilerBusyError,
+    ProfilerUnavailableError,
+    SamplingProfiler,
+)
+from .core.tracing import configure_tracing, tracer
+
+logger = get_logger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
+    from .core.security import get_webapp_secret_key
+    from .presentation.api.v1.routers.config import get_public_config
+    from .presentation.websocket import router as websocket_router
+    from .infrastructure.database import Base, get_engine, dispose_engine
+    from .infrastructure.cache import entity_cache
+
+    settings = get_settings()
+    configure_logging()
+    configure_tracing(
+        settings.TRACING_EXPORTER,
+        settings.TRACING_SAMPLE_RATIO,
+        settings.TRACING_FILE_PATH,
+        service_name=settings.APP_NAME,
+    )
+
     # Startup
     logger.info(f"Starting {settings.APP_NAME}")
     logger.info(f"Debug mode: {settings.DEBUG}")
 
+    # Derive Telegram init data secret once instead of per request
+    get_webapp_secret_key()
+
+    # Serialize the /config response once; it only changes on deploy
+    get_public_config()
+
     # Create database tables (in production, use Alembic migrations instead)
     if settings.DEBUG:
         logger.info("Creating database tables...")
-        async with engine.begin() as conn:
+        async with get_engine().begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
 
-    yield
+    if settings.LOOP_MONITOR_ENABLED:
+        app.state.loop_monitor.start()
+        websocket_router.admission.loop_monitor = app.state.loop_monitor
 
-    # Shutdown
-    logger.info(f"Shutting down {settings.APP_NAME}")
-    await engine.dispose()
+    if settings.CACHE_ENABLED:
+        await entity_cache.start()
 
+    # Rooms of calls that were in progress when the previous process drained
+    await websocket_router.restore_rooms()
 
-# Create FastAPI app
-app = FastAPI(
-    title=settings.APP_NAME,
-    debug=settings.DEBUG,
-    lifespan=lifespan,
-    docs_url="/docs" if settings.DEBUG else None,
-    redoc_url="/redoc" if settings.DEBUG else None,
-)
+    if settings.ROOM_RECONCILER_ENABLED:
+        websocket_router.reconciler.start()
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.ALLOWED_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    websocket_router.call_session_writer.start()
+    websocket_router.presence.start()
 
-# Include routers
-app.include_router(api_router, prefix=settings.API_V1_PREFIX)
-app.include_router(websocket_router.router)
+    if settings.CALL_INVITE_NOTIFICATIONS_ENABLED:
+        websocket_router.notifications.start()
 
+    yield
 
-# Health check endpoint
-@app.get("/health")
-async def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "app": settings.APP_NAME,
-        "debug": settings.DEBUG
-    }
+    # Shutdown
+    logger.info(f"Shutting down {settings.APP_NAME}")
+    await websocket_router.drain()
+    await websocket_router.call_session_writer.stop()
+    await websocket_router.presence.stop()
+    await websocket_router.call_invites.stop()
+    await websocket_router.room_feed.stop()
+    await websocket_router.notifications.stop()
+    await websocket_router.telegram_bot.close()
+    await websocket_router.room_snapshots.close()
+    await entity_cache.close()
+    await dispose_engine()
+    tracer.shutdown()
+    await app.state.loop_monitor.stop()
+
+
+def create_app() -> FastAPI:
+    """Create FastAPI application"""
+    from .presentation.api.v1 import api_router
+    from .presentation.websocket import router as websocket_router
+    from .infrastructure.cache import entity_cache
+    from .core.dependencies import require_admin_token
+
+    settings = get_settings()
+
+    app = FastAPI(
+        title=settings.APP_NAME,
+        debug=settings.DEBUG,
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+        docs_url="/docs" if settings.DEBUG else None,
+        redoc_url="/redoc" if settings.DEBUG else None,
+    )
 
+    app.state.loop_monitor = LoopLagMonitor(
+        interval=settings.LOOP_MONITOR_INTERVAL_SECONDS,
+        stall_threshold=settings.LOOP_MONITOR_STALL_THRESHOLD_SECONDS,
+        window_seconds=settings.LOOP_MONITOR_WINDOW_SECONDS,
+    )
+    app.state.profiler = SamplingProfiler(max_seconds=settings.PROFILER_MAX_SECONDS)
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.ALLOWED_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
 
-# Root endpoint
-@app.get("/")
-async def root():
-    """Root endpoint"""
-    return {
-        "message": f"Welcome to {settings.APP_NAME}",
-        "docs": "/docs" if settings.DEBUG else "disabled",
-        "health": "/health",
-        "api": settings.API_V1_PREFIX
-    }
+    # Include routers
+    app.include_router(api_router, prefix=settings.API_V1_PREFIX)
+    app.include_router(websocket_router.router)
+
+    # Health check endpoint
+    @app.get("/health")
+    async def health_check(response: Response):
+        """Health check endpoint, 503 while draining for a restart"""
+        if websocket_router.manager.draining:
+            response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+            return {"status": "draining", "app": settings.APP_NAME}
+        return {
+            "status": "healthy",
+            "app": settings.APP_NAME,
+            "debug": settings.DEBUG
+        }
+
+    # Cache metrics endpoint
+    @app.get("/cache/stats", dependencies=[Depends(require_admin_token)])
+    async def get_cache_stats():
+        """Get entity cache hit/miss statistics"""
+        return entity_cache.stats()
+
+    # Event loop diagnostics
+    @app.get("/admin/loop-lag", dependencies=[Depends(require_admin_token)])
+    async def get_loop_lag():
+        """Get event loop scheduling delay percentiles and the slowest stalls"""
+        return app.state.loop_monitor.stats()
+
+    @app.get(
+        "/admin/profile",
+        dependencies=[Depends(require_admin_token)],
+        response_class=PlainTextResponse,
+    )
+    async def profile_event_loop(
+        seconds: float = Query(10.0, gt=0, le=settings.PROFILER_MAX_SECONDS),
+        interval_ms: float = Query(5.0, ge=1, le=1000),
+    ):
+        """
+        Profile the event loop thread for a number of seconds
+
+        Returns sampled stacks in the folded format, e.g. for
+        `flamegraph.pl profile.txt > profile.svg` or speedscope.
+        """
+        try:
+            return await app.state.profiler.profile_loop(seconds, interval_ms / 1000)
+        except ProfilerBusyError as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        except ProfilerUnavailableError as e:
+            raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
+
+    # Root endpoint
+    @app.get("/")
+    async def root():
+        """Root endpoint"""
+        return {
+            "message": f"Welcome to {settings.APP_NAME}",
+            "docs": "/docs" if settings.DEBUG else "disabled",
+            "health": "/health",
+            "api": settings.API_V1_PREFIX
+        }
+
+    return app
 
 
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
-        "src.main:app",
+        "src.main:create_app",
+        factory=True,
         host="0.0.0.0",
         port=8000,
-        reload=settings.DEBUG
+        reload=get_settings().DEBUG
     )
@@ -1,11 +1,12 @@
 """Auth API router"""
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from .schemas import TelegramAuthRequest, TelegramAuthResponse
-from ......core.dependencies import get_db_session, get_create_user_use_case
+from ......core.dependencies import get_create_user_use_case
 from ......application.use_cases.user import CreateUserUseCase
 from ......application.dto.user_dto import CreateUserDTO
+from ......core.config import settings
+from ......core.security import verify_telegram_init_data, create_user_access_token
 from ......core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -16,36 +17,53 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 @router.post("/telegram", response_model=TelegramAuthResponse, status_code=status.HTTP_200_OK)
 async def telegram_auth(
     request: TelegramAuthRequest,
-    use_case: CreateUserUseCase = Depends(get_create_user_use_case),
-    session: AsyncSession = Depends(get_db_session)
+    use_case: CreateUserUseCase = Depends(get_create_user_use_case)
 ):
     """
     Authenticate user via Telegram Mini App
 
-    Creates a new user if doesn't exist, otherwise returns existing user.
+    Creates a new user if doesn't exist, otherwise returns existing user
+    with username, name and photo refreshed from Telegram.
     """
     try:
-        # TODO: Verify init_data signature
-        # if request.init_data:
-        #     if not verify_telegram_init_data(request.init_data):
-        #         raise HTTPException(status_code=401, detail="Invalid Telegram init data")
+        if request.init_data:
+            init_data = verify_telegram_init_data(request.init_data)
+            if not init_data:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid Telegram init data"
+                )
+            telegram_user = init_data.get("user")
+            if not isinstance(telegram_user, dict) or telegram_user.get("id") != request.telegram_id:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Telegram init data does not match user"
+                )
+            # Profile fields come from the signed data, not the request body
+            dto = CreateUserDTO(
+                telegram_id=telegram_user["id"],
+                username=telegram_user.get("username"),
+                first_name=telegram_user.get("first_name"),
+                last_name=telegram_user.get("last_name"),
+                photo_url=telegram_user.get("photo_url")
+            )
+        elif settings.DEBUG:
+            # Unsigned logins are only allowed for local development
+            dto = CreateUserDTO(
+                telegram_id=request.telegram_id,
+                username=request.username,
+                first_name=request.first_name,
+                last_name=request.last_name,
+                photo_url=request.photo_url
+            )
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Telegram init data is required"
+            )
 
         # Create or get user
-        dto = CreateUserDTO(
-            telegram_id=request.telegram_id,
-            username=request.username,
-            first_name=request.first_name,
-            last_name=request.last_name,
-            photo_url=request.photo_url
-        )
-
-        # Check if user already existed
-        from ......infrastructure.database.repositories import UserRepositoryImpl
-        user_repo = UserRepositoryImpl(session)
-        existing_user = await user_repo.get_by_telegram_id(request.telegram_id)
-        is_new_user = existing_user is None
-
-        user = await use_case.execute(dto)
+        user, is_new_user = await use_case.execute(dto)
 
         logger.info(
             f"User {'created' if is_new_user else 'authenticated'}: "
@@ -58,9 +76,12 @@ async def telegram_auth(
             username=user.username,
             first_name=user.first_name,
             display_name=user.display_name,
-            is_new_user=is_new_user
+            is_new_user=is_new_user,
+            access_token=create_user_access_token(user.id, user.telegram_id)
         )
 
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.warning(f"Invalid auth request: {e}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -21,3 +21,5 @@ class TelegramAuthResponse(BaseModel):
     first_name: str
     display_name: str
     is_new_user: bool = Field(description="True if user was just created")
+    access_token: str = Field(description="Bearer token for REST and WebSocket requests")
+    token_type: str = "bearer"
@@ -1,4 +1,4 @@
 """Config router"""
-from .router import router
+from .router import router, get_public_config
 
-__all__ = ["router"]
+__all__ = ["router", "get_public_config"]
@@ -1,18 +1,44 @@
 """Config router - returns application configuration"""
-from fastapi import APIRouter
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Response, status
 from .schemas import ConfigResponse
+from ....responses import etag_matches
+from ......core.cache import TTLCache
 from ......core.config import settings
+from ......core.dependencies import get_optional_current_user_id
+from ......core.security import get_turn_credentials
 
 router = APIRouter(prefix="/config", tags=["config"])
 
 
-@router.get("", response_model=ConfigResponse)
-async def get_config() -> ConfigResponse:
-    """
-    Get application configuration including ICE servers
+@dataclass(frozen=True)
+class RenderedConfig:
+    """Serialized config response with its validators"""
+    body: bytes
+    etag: str
+    # Unix time the response stops being fresh, None if it only changes on deploy
+    fresh_until: Optional[int] = None
 
-    Returns TURN/STUN server configuration for WebRTC
-    """
+
+# Response without per-user TURN credentials, rendered once per process
+_public_config: Optional[RenderedConfig] = None
+
+# Responses with per-user TURN credentials: TURN username -> rendered config
+_user_configs: TTLCache[RenderedConfig] = TTLCache(
+    maxsize=settings.TURN_CREDENTIAL_CACHE_SIZE,
+    ttl=settings.TURN_CREDENTIAL_TTL_SECONDS
+)
+
+
+def build_config(
+    username: Optional[str],
+    credential: Optional[str],
+    expires_at: Optional[int] = None
+) -> ConfigResponse:
+    """Build config with STUN servers, and TURN servers if credentials are given"""
     ice_servers = []
 
     # Add STUN servers
@@ -20,11 +46,84 @@ async def get_config() -> ConfigResponse:
         ice_servers.append({"urls": stun_url})
 
     # Add TURN servers with credentials
-    for turn_url in settings.TURN_URLS:
-        ice_servers.append({
-            "urls": turn_url,
-            "username": settings.TURN_USERNAME,
-            "credential": settings.TURN_PASSWORD
-        })
-
-    return ConfigResponse(ice_servers=ice_servers)
+    if username is not None:
+        for turn_url in settings.TURN_URLS:
+            ice_servers.append({
+                "urls": turn_url,
+                "username": username,
+                "credential": credential
+            })
+
+    return ConfigResponse(ice_servers=ice_servers, expires_at=expires_at)
+
+
+def render_config(config: ConfigResponse, fresh_until: Optional[int] = None) -> RenderedConfig:
+    """Serialize config and compute its strong ETag"""
+    body = config.model_dump_json().encode()
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    return RenderedConfig(body=body, etag=etag, fresh_until=fresh_until)
+
+
+def get_public_config() -> RenderedConfig:
+    """
+    Get config served without per-user credentials
+
+    Contains static TURN credentials if TURN_SECRET is not set, otherwise
+    STUN servers only.
+    """
+    global _public_config
+    if _public_config is None:
+        if not settings.TURN_SECRET:
+            config = build_config(settings.TURN_USERNAME, settings.TURN_PASSWORD)
+        else:
+            config = build_config(None, None)
+        _public_config = render_config(config)
+    return _public_config
+
+
+def get_user_config(user_id: int) -> RenderedConfig:
+    """Get config with the user's TURN credentials for the current window"""
+    username, credential, expires_at = get_turn_credentials(user_id)
+
+    rendered = _user_configs.get(username)
+    if rendered is None:
+        # Credentials are reissued once the window ends, a full TTL before expiry
+        fresh_until = expires_at - settings.TURN_CREDENTIAL_TTL_SECONDS
+        rendered = render_config(build_config(username, credential, expires_at), fresh_until)
+        _user_configs.set(username, rendered, ttl=max(fresh_until - time.time(), 0))
+    return rendered
+
+
+@router.get("", response_model=ConfigResponse)
+async def get_config(
+    if_none_match: Optional[str] = Header(None),
+    current_user_id: Optional[int] = Depends(get_optional_current_user_id)
+) -> Response:
+    """
+    Get application configuration including ICE servers
+
+    Returns TURN/STUN server configuration for WebRTC. When TURN_SECRET is
+    set, TURN servers get time-limited per-user credentials and are only
+    returned to authenticated users.
+
+    Responses are serialized ahead of time and carry a strong ETag, so
+    revalidation with If-None-Match is answered with 304 Not Modified.
+    """
+    if settings.TURN_SECRET and current_user_id is not None:
+        rendered = get_user_config(current_user_id)
+    else:
+        rendered = get_public_config()
+
+    max_age = settings.CONFIG_CACHE_MAX_AGE_SECONDS
+    if rendered.fresh_until is not None:
+        max_age = max(min(max_age, rendered.fresh_until - int(time.time())), 0)
+
+    headers = {
+        "ETag": rendered.etag,
+        "Cache-Control": f"private, max-age={max_age}",
+        "Vary": "Authorization",
+    }
+
+    if etag_matches(if_none_match, rendered.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=rendered.body, media_type="application/json", headers=headers)
@@ -13,3 +13,4 @@ class ICEServer(BaseModel):
 class ConfigResponse(BaseModel):
     """Configuration response"""
     ice_servers: List[ICEServer]
+    expires_at: Optional[int] = None  # Unix time TURN credentials expire at
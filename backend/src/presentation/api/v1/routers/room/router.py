@@ -1,21 +1,26 @@
 """Room API router"""
-from fastapi import APIRouter, Depends, HTTPException, status, Path
-from sqlalchemy.ext.asyncio import AsyncSession
+import hashlib
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status, Path
+from typing import List, Optional, Set
 from uuid import UUID
 
 from .schemas import (
     CreateRoomRequest,
     RoomResponse,
     RoomListResponse,
+    RoomSnapshotResponse,
     JoinRoomRequest,
     LeaveRoomRequest
 )
+from ....responses import etag_matches, etag_version, model_response, version_etag
+from .....websocket.router import manager
 from ......core.dependencies import (
-    get_db_session,
+    get_current_user_id,
     get_create_room_use_case,
     get_join_room_use_case,
     get_leave_room_use_case,
     get_get_room_info_use_case,
+    get_get_room_snapshot_use_case,
     get_list_active_rooms_use_case
 )
 from ......application.use_cases.room import (
@@ -23,45 +28,71 @@ from ......application.use_cases.room import (
     JoinRoomUseCase,
     LeaveRoomUseCase,
     GetRoomInfoUseCase,
+    GetRoomSnapshotUseCase,
     ListActiveRoomsUseCase
 )
+from ......domain.entities.room import Room, RoomParticipant
 from ......domain.exceptions import (
     RoomNotFoundException,
     UserNotFoundException,
     RoomAlreadyClosedException,
-    ParticipantAlreadyInRoomException
+    RoomFullException,
+    ParticipantAlreadyInRoomException,
+    ParticipantNotInRoomException
 )
 from ......core.logger import get_logger
 
 logger = get_logger(__name__)
 
-router = APIRouter(prefix="/rooms", tags=["Rooms"])
+router = APIRouter(
+    prefix="/rooms",
+    tags=["Rooms"],
+    dependencies=[Depends(get_current_user_id)]
+)
+
+
+def _resolve_user_id(claimed_user_id: Optional[int], current_user_id: int) -> int:
+    """Check that a user ID sent in the body matches the authenticated user"""
+    if claimed_user_id is not None and claimed_user_id != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Cannot act on behalf of another user"
+        )
+    return current_user_id
+
+
+def _snapshot_etag(room: Room, participants: List[RoomParticipant], connected: Set[int]) -> str:
+    """
+    Strong ETag of a room snapshot
+
+    The room version covers membership and status. Profiles and live
+    presence change without it, so the participants' versions and
+    connection state are folded in as a short digest.
+    """
+    state = repr([
+        (participant.user.id, participant.user.version, participant.user.id in connected)
+        for participant in participants
+    ])
+    digest = hashlib.blake2b(state.encode(), digest_size=8).hexdigest()
+    return f'"{room.version}-{digest}"'
 
 
 @router.post("", response_model=RoomResponse, status_code=status.HTTP_201_CREATED)
 async def create_room(
-    request: CreateRoomRequest,
-    use_case: CreateRoomUseCase = Depends(get_create_room_use_case),
-    session: AsyncSession = Depends(get_db_session)
+    request: Optional[CreateRoomRequest] = None,
+    current_user_id: int = Depends(get_current_user_id),
+    use_case: CreateRoomUseCase = Depends(get_create_room_use_case)
 ):
-    """Create a new room"""
+    """Create a new room owned by the authenticated user"""
+    creator_id = _resolve_user_id(request and request.creator_id, current_user_id)
     try:
-        room = await use_case.execute(request.creator_id)
-
-        # Get participants
-        from ......infrastructure.database.repositories import RoomRepositoryImpl
-        room_repo = RoomRepositoryImpl(session)
-        participants = await room_repo.get_participants(room.id)
-
-        logger.info(f"Room created: {room.id} by user {request.creator_id}")
-
-        return RoomResponse(
-            id=room.id,
-            creator_id=room.creator_id,
-            is_active=room.is_active,
-            created_at=room.created_at,
-            closed_at=room.closed_at,
-            participants=participants
+        room, participants = await use_case.execute(creator_id)
+
+        logger.info(f"Room created: {room.id} by user {creator_id}")
+
+        return model_response(
+            RoomResponse.from_room(room, participants),
+            status_code=status.HTTP_201_CREATED
         )
     except UserNotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -75,32 +106,13 @@ async def create_room(
 
 @router.get("", response_model=RoomListResponse)
 async def list_active_rooms(
-    use_case: ListActiveRoomsUseCase = Depends(get_list_active_rooms_use_case),
-    session: AsyncSession = Depends(get_db_session)
+    use_case: ListActiveRoomsUseCase = Depends(get_list_active_rooms_use_case)
 ):
     """List all active rooms"""
     try:
         rooms = await use_case.execute()
 
-        # Get participants for each room
-        from ......infrastructure.database.repositories import RoomRepositoryImpl
-        room_repo = RoomRepositoryImpl(session)
-
-        room_responses = []
-        for room in rooms:
-            participants = await room_repo.get_participants(room.id)
-            room_responses.append(
-                RoomResponse(
-                    id=room.id,
-                    creator_id=room.creator_id,
-                    is_active=room.is_active,
-                    created_at=room.created_at,
-                    closed_at=room.closed_at,
-                    participants=participants
-                )
-            )
-
-        return RoomListResponse(rooms=room_responses, total=len(room_responses))
+        return model_response(RoomListResponse.from_rooms(rooms))
     except Exception as e:
         logger.error(f"Error listing rooms: {e}")
         raise HTTPException(
@@ -112,20 +124,23 @@ async def list_active_rooms(
 @router.get("/{room_id}", response_model=RoomResponse)
 async def get_room(
     room_id: UUID,
+    if_none_match: Optional[str] = Header(None),
     use_case: GetRoomInfoUseCase = Depends(get_get_room_info_use_case)
-):
-    """Get room by ID"""
+) -> Response:
+    """
+    Get room by ID
+
+    The ETag is the room's version. When a client revalidates with the
+    current one, participants are not queried and 304 Not Modified is
+    returned; with the entity cache holding the room, no query runs at all.
+    """
     try:
-        room, participants = await use_case.execute(room_id)
+        room, participants = await use_case.execute(room_id, etag_version(if_none_match))
 
-        return RoomResponse(
-            id=room.id,
-            creator_id=room.creator_id,
-            is_active=room.is_active,
-            created_at=room.created_at,
-            closed_at=room.closed_at,
-            participants=participants
-        )
+        headers = {"ETag": version_etag(room.version), "Cache-Control": "private, no-cache"}
+        if participants is None or etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return model_response(RoomResponse.from_room(room, participants), headers=headers)
     except RoomNotFoundException:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -139,23 +154,68 @@ async def get_room(
         )
 
 
+@router.get("/{room_id}/snapshot", response_model=RoomSnapshotResponse)
+async def get_room_snapshot(
+    room_id: UUID,
+    if_none_match: Optional[str] = Header(None),
+    use_case: GetRoomSnapshotUseCase = Depends(get_get_room_snapshot_use_case)
+) -> Response:
+    """
+    Get room with its participants' profiles, join times and live presence
+
+    Built from one query plus the in-memory connection registry. The
+    response carries an ETag, so polling with If-None-Match is answered
+    with 304 Not Modified until the room, a profile or presence changes.
+    """
+    try:
+        room, participants = await use_case.execute(room_id)
+    except RoomNotFoundException:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Room {room_id} not found"
+        )
+    except Exception as e:
+        logger.error(f"Error getting snapshot of room {room_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get room snapshot"
+        )
+
+    connected = {
+        participant.user.id
+        for participant in participants
+        if manager.is_user_online(participant.user.id)
+    }
+    etag = _snapshot_etag(room, participants, connected)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return model_response(
+        RoomSnapshotResponse.from_snapshot(room, participants, connected),
+        headers=headers
+    )
+
+
 @router.post("/{room_id}/join", status_code=status.HTTP_200_OK)
 async def join_room(
     room_id: UUID,
-    request: JoinRoomRequest,
+    request: Optional[JoinRoomRequest] = None,
+    current_user_id: int = Depends(get_current_user_id),
     use_case: JoinRoomUseCase = Depends(get_join_room_use_case)
 ):
-    """Join a room"""
+    """Join a room as the authenticated user"""
+    user_id = _resolve_user_id(request and request.user_id, current_user_id)
     try:
-        await use_case.execute(room_id, request.user_id)
+        await use_case.execute(room_id, user_id)
 
-        logger.info(f"User {request.user_id} joined room {room_id}")
+        logger.info(f"User {user_id} joined room {room_id}")
         return {"message": "Successfully joined room"}
     except (RoomNotFoundException, UserNotFoundException) as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except RoomAlreadyClosedException as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except ParticipantAlreadyInRoomException as e:
+    except (ParticipantAlreadyInRoomException, RoomFullException) as e:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except Exception as e:
         logger.error(f"Error joining room {room_id}: {e}")
@@ -168,17 +228,21 @@ async def join_room(
 @router.post("/{room_id}/leave", status_code=status.HTTP_200_OK)
 async def leave_room(
     room_id: UUID,
-    request: LeaveRoomRequest,
+    request: Optional[LeaveRoomRequest] = None,
+    current_user_id: int = Depends(get_current_user_id),
     use_case: LeaveRoomUseCase = Depends(get_leave_room_use_case)
 ):
-    """Leave a room"""
+    """Leave a room as the authenticated user"""
+    user_id = _resolve_user_id(request and request.user_id, current_user_id)
     try:
-        await use_case.execute(room_id, request.user_id)
+        await use_case.execute(room_id, user_id)
 
-        logger.info(f"User {request.user_id} left room {room_id}")
+        logger.info(f"User {user_id} left room {room_id}")
         return {"message": "Successfully left room"}
     except RoomNotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ParticipantNotInRoomException as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except Exception as e:
         logger.error(f"Error leaving room {room_id}: {e}")
         raise HTTPException(
@@ -1,13 +1,18 @@
 """Room API schemas"""
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 from uuid import UUID
 from datetime import datetime
 
+from ..user.schemas import UserResponse
+from ......domain.entities.room import Room, RoomParticipant
+
 
 class CreateRoomRequest(BaseModel):
     """Request to create a new room"""
-    creator_id: int = Field(..., gt=0, description="ID of user creating the room")
+    creator_id: Optional[int] = Field(
+        None, gt=0, description="Deprecated: creator is taken from the access token"
+    )
 
 
 class RoomResponse(BaseModel):
@@ -19,18 +24,78 @@ class RoomResponse(BaseModel):
     closed_at: Optional[datetime]
     participants: List[int]
 
+    @classmethod
+    def from_room(cls, room: Room, participants: List[int]) -> "RoomResponse":
+        """Map a room entity and its participant IDs in one validation pass"""
+        return cls.model_validate(_room_fields(room, participants))
+
 
 class RoomListResponse(BaseModel):
     """List of rooms response"""
     rooms: List[RoomResponse]
     total: int
 
+    @classmethod
+    def from_rooms(cls, rooms: List[Tuple[Room, List[int]]]) -> "RoomListResponse":
+        """Map (room, participant IDs) pairs in one validation pass"""
+        return cls.model_validate({
+            "rooms": [_room_fields(room, participants) for room, participants in rooms],
+            "total": len(rooms),
+        })
+
+
+class ParticipantSnapshotResponse(BaseModel):
+    """Participant of a room snapshot"""
+    user: UserResponse
+    joined_at: datetime
+    connected: bool
+
+
+class RoomSnapshotResponse(BaseModel):
+    """Room with its participants' profiles and live presence"""
+    id: UUID
+    creator_id: int
+    is_active: bool
+    created_at: datetime
+    closed_at: Optional[datetime]
+    version: int
+    participants: List[ParticipantSnapshotResponse]
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        room: Room,
+        participants: List[RoomParticipant],
+        connected: Set[int]
+    ) -> "RoomSnapshotResponse":
+        """Map a room, its participants and the IDs of connected users in one validation pass"""
+        return cls.model_validate({
+            **vars(room),
+            "participants": [
+                {
+                    "user": participant.user,
+                    "joined_at": participant.joined_at,
+                    "connected": participant.user.id in connected,
+                }
+                for participant in participants
+            ],
+        }, from_attributes=True)
+
+
+def _room_fields(room: Room, participants: List[int]) -> Dict[str, Any]:
+    """Room entity fields plus participants, without copying through setattr"""
+    return {**vars(room), "participants": participants}
+
 
 class JoinRoomRequest(BaseModel):
     """Request to join a room"""
-    user_id: int = Field(..., gt=0, description="ID of user joining")
+    user_id: Optional[int] = Field(
+        None, gt=0, description="Deprecated: user is taken from the access token"
+    )
 
 
 class LeaveRoomRequest(BaseModel):
     """Request to leave a room"""
-    user_id: int = Field(..., gt=0, description="ID of user leaving")
+    user_id: Optional[int] = Field(
+        None, gt=0, description="Deprecated: user is taken from the access token"
+    )
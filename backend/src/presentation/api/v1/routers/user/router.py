@@ -1,8 +1,10 @@
 """User API router"""
-from fastapi import APIRouter, Depends, HTTPException, status, Path
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status, Path, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .schemas import UserResponse, UserListResponse
+from ....responses import etag_matches, model_response, version_etag
 from ......core.dependencies import (
     get_db_session,
     get_get_user_use_case,
@@ -10,6 +12,7 @@ from ......core.dependencies import (
 )
 from ......application.use_cases.user import GetUserUseCase, ListOnlineUsersUseCase
 from ......domain.exceptions import UserNotFoundException
+from ......core.config import settings
 from ......core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -17,6 +20,44 @@ logger = get_logger(__name__)
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
+def _parse_user_ids(ids: str) -> List[int]:
+    """Parse comma-separated user IDs, rejecting malformed or too many IDs"""
+    try:
+        user_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        user_ids = []
+    if not user_ids or min(user_ids) <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="ids must be a comma-separated list of positive user IDs"
+        )
+    if len(user_ids) > settings.USERS_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Cannot get more than {settings.USERS_BATCH_MAX_IDS} users at once"
+        )
+    return user_ids
+
+
+@router.get("", response_model=UserListResponse)
+async def get_users(
+    ids: str = Query(..., description="Comma-separated user IDs, e.g. room participants"),
+    use_case: GetUserUseCase = Depends(get_get_user_use_case)
+):
+    """Get several users by ID with one query; unknown IDs are left out"""
+    user_ids = _parse_user_ids(ids)
+    try:
+        users = await use_case.execute_many(user_ids)
+
+        return model_response(UserListResponse.from_users(users))
+    except Exception as e:
+        logger.error(f"Error getting users {user_ids}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get users"
+        )
+
+
 @router.get("/online", response_model=UserListResponse)
 async def list_online_users(
     use_case: ListOnlineUsersUseCase = Depends(get_list_online_users_use_case)
@@ -25,22 +66,7 @@ async def list_online_users(
     try:
         users = await use_case.execute()
 
-        return UserListResponse(
-            users=[
-                UserResponse(
-                    id=u.id,
-                    telegram_id=u.telegram_id,
-                    username=u.username,
-                    first_name=u.first_name,
-                    last_name=u.last_name,
-                    photo_url=u.photo_url,
-                    is_online=u.is_online,
-                    display_name=u.display_name
-                )
-                for u in users
-            ],
-            total=len(users)
-        )
+        return model_response(UserListResponse.from_users(users))
     except Exception as e:
         logger.error(f"Error listing online users: {e}")
         raise HTTPException(
@@ -52,22 +78,23 @@ async def list_online_users(
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int = Path(..., gt=0),
+    if_none_match: Optional[str] = Header(None),
     use_case: GetUserUseCase = Depends(get_get_user_use_case)
-):
-    """Get user by ID"""
+) -> Response:
+    """
+    Get user by ID
+
+    The ETag is the user's version, so revalidation with If-None-Match is
+    answered with 304 Not Modified, from the entity cache when it holds
+    the user.
+    """
     try:
         user = await use_case.execute_by_id(user_id)
 
-        return UserResponse(
-            id=user.id,
-            telegram_id=user.telegram_id,
-            username=user.username,
-            first_name=user.first_name,
-            last_name=user.last_name,
-            photo_url=user.photo_url,
-            is_online=user.is_online,
-            display_name=user.display_name
-        )
+        headers = {"ETag": version_etag(user.version), "Cache-Control": "no-cache"}
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return model_response(UserResponse.model_validate(user), headers=headers)
     except UserNotFoundException:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,11 +1,15 @@
 """User API schemas"""
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
 from datetime import datetime
 
+from ......domain.entities.user import User
+
 
 class UserResponse(BaseModel):
     """User response schema"""
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     telegram_id: int
     username: Optional[str]
@@ -20,3 +24,8 @@ class UserListResponse(BaseModel):
     """List of users response"""
     users: List[UserResponse]
     total: int
+
+    @classmethod
+    def from_users(cls, users: List[User]) -> "UserListResponse":
+        """Map user entities by attribute in one validation pass"""
+        return cls.model_validate({"users": users, "total": len(users)}, from_attributes=True)
@@ -1,84 +1,382 @@
 """WebSocket router for signaling"""
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
-from ...infrastructure.websocket import ConnectionManager, SignalingHandler
+import json
+import math
+from typing import Any, Dict, Optional
+from uuid import UUID
+from fastapi import (
+    APIRouter,
+    WebSocket,
+    WebSocketDisconnect,
+    Query,
+    Path,
+    Depends,
+    HTTPException,
+    status,
+)
+from ...infrastructure.websocket import (
+    ConnectionManager,
+    SignalingHandler,
+    RoomReconciler,
+    CallSessionTracker,
+    CallStatsAggregator,
+    RoomSnapshotStore,
+    NegotiationCoordinator,
+    CallInviteService,
+    AdmissionController,
+    InboundPipeline,
+    ordering_key,
+    room_feed,
+)
+from ...infrastructure.telegram import TelegramBotApi, NotificationQueue
+from ...infrastructure.database.base import new_session, get_pool_utilization
+from ...infrastructure.database.call_session_writer import CallSessionWriter
+from ...infrastructure.database.presence_writer import PresenceWriter
+from ...infrastructure.database.repositories import CallSessionRepositoryImpl
+from ...core.config import settings
 from ...core.logger import get_logger
-from ...core.dependencies import get_db_session
-from ...infrastructure.database.repositories import UserRepositoryImpl
+from ...core.tracing import tracer
+from ...core.dependencies import (
+    get_current_user_id,
+    require_admin_token,
+    build_user_repository,
+    build_room_repository,
+)
+from ...core.security import get_user_id_from_token
 
 logger = get_logger(__name__)
 
 router = APIRouter(tags=["WebSocket"])
 
 # Global connection manager and signaling handler
-manager = ConnectionManager()
-signaling = SignalingHandler(manager)
+manager = ConnectionManager(
+    lane_weights=settings.OUTBOUND_LANE_WEIGHTS,
+    max_pending_per_connection=settings.OUTBOUND_MAX_PENDING,
+)
+admission = AdmissionController(
+    manager,
+    pool_utilization=get_pool_utilization,
+    max_connections=settings.ADMISSION_MAX_CONNECTIONS,
+    max_loop_lag_ms=settings.ADMISSION_MAX_LOOP_LAG_MS,
+    max_pool_utilization=settings.ADMISSION_MAX_DB_POOL_UTILIZATION,
+    accepts_per_second=settings.ADMISSION_ACCEPTS_PER_SECOND,
+    retry_after_min=settings.ADMISSION_RETRY_AFTER_MIN_SECONDS,
+    retry_after_max=settings.ADMISSION_RETRY_AFTER_MAX_SECONDS,
+)
+presence = PresenceWriter(
+    session_factory=new_session,
+    repository_factory=build_user_repository,
+    flush_interval=settings.PRESENCE_FLUSH_INTERVAL_SECONDS,
+    batch_size=settings.PRESENCE_BATCH_SIZE,
+    max_defer=settings.PRESENCE_MAX_DEFER_SECONDS,
+    should_defer=lambda: admission.overloaded,
+)
+call_session_writer = CallSessionWriter(
+    session_factory=new_session,
+    repository_factory=CallSessionRepositoryImpl,
+    flush_interval=settings.CALL_SESSION_FLUSH_INTERVAL_SECONDS,
+    batch_size=settings.CALL_SESSION_BATCH_SIZE,
+    max_pending=settings.CALL_SESSION_MAX_PENDING,
+)
+call_sessions = CallSessionTracker(call_session_writer)
+call_stats = CallStatsAggregator(
+    max_rooms=settings.CALL_STATS_MAX_ROOMS,
+    max_pairs_per_room=settings.CALL_STATS_MAX_PAIRS_PER_ROOM,
+    relative_accuracy=settings.CALL_STATS_RELATIVE_ACCURACY,
+)
+# Call stats of a room are kept while anybody is in it
+manager.on_room_empty = call_stats.discard_room
+negotiation = NegotiationCoordinator(
+    max_mesh_size=settings.SIGNALING_MAX_MESH_SIZE,
+    offer_stagger_ms=settings.SIGNALING_OFFER_STAGGER_MS,
+    pending_offer_timeout=settings.SIGNALING_PENDING_OFFER_TIMEOUT_SECONDS,
+)
+telegram_bot = TelegramBotApi(settings.TELEGRAM_BOT_TOKEN, base_url=settings.TELEGRAM_API_URL)
+notifications = NotificationQueue(
+    telegram_bot,
+    per_chat_interval=settings.NOTIFICATION_PER_CHAT_INTERVAL_SECONDS,
+    max_per_second=settings.NOTIFICATION_MAX_PER_SECOND,
+    batch_size=settings.NOTIFICATION_BATCH_SIZE,
+    max_attempts=settings.NOTIFICATION_MAX_ATTEMPTS,
+    dedup_ttl=settings.NOTIFICATION_DEDUP_TTL_SECONDS,
+    max_pending=settings.NOTIFICATION_MAX_PENDING,
+)
+call_invites = CallInviteService(
+    manager,
+    session_factory=new_session,
+    repository_factory=build_user_repository,
+    notifications=notifications if settings.CALL_INVITE_NOTIFICATIONS_ENABLED else None,
+    invite_url=settings.CALL_INVITE_URL,
+    max_invitees=settings.CALL_INVITE_MAX_USERS,
+)
+signaling = SignalingHandler(
+    manager, call_sessions, call_stats, negotiation, call_invites, room_feed=room_feed
+)
+reconciler = RoomReconciler(
+    manager,
+    session_factory=new_session,
+    repository_factory=build_room_repository,
+    interval_seconds=settings.ROOM_RECONCILER_INTERVAL_SECONDS,
+    grace_seconds=settings.ROOM_RECONCILER_GRACE_SECONDS,
+    batch_size=settings.ROOM_RECONCILER_BATCH_SIZE,
+    max_batches=settings.ROOM_RECONCILER_MAX_BATCHES,
+    should_defer=lambda: admission.overloaded,
+)
+room_snapshots = RoomSnapshotStore(
+    redis_url=settings.REDIS_URL if settings.ROOM_SNAPSHOT_ENABLED else None,
+    ttl_seconds=settings.ROOM_SNAPSHOT_TTL_SECONDS,
+)
+# Result of the drain, once one has started
+drain_report: Optional[Dict[str, Any]] = None
+
+
+async def restore_rooms() -> None:
+    """Restore room membership handed over by the previous process"""
+    rooms = await room_snapshots.load()
+    if rooms:
+        manager.restore_rooms(rooms, reconnect_window=settings.ROOM_SNAPSHOT_TTL_SECONDS)
+
+
+async def drain() -> Dict[str, Any]:
+    """
+    Hand signaling over to the next process
+
+    Stops accepting sockets and reconciling rooms, saves room membership
+    for the next process, sends every peer a reconnect hint with a
+    jittered delay, closes the sockets with 1012 and flushes pending
+    call session writes. Runs once; later calls return the same report.
+    """
+    global drain_report
+    if drain_report is not None:
+        return drain_report
+
+    manager.draining = True
+    drain_report = {}
+    await reconciler.stop()
+
+    rooms = {room_id: set(user_ids) for room_id, user_ids in manager.rooms.items()}
+    drain_report["rooms_saved"] = await room_snapshots.save(rooms)
+    drain_report["reconnect_hints_sent"] = await manager.send_reconnect_hints(
+        max_delay=settings.DRAIN_RECONNECT_MAX_DELAY_SECONDS,
+        timeout=settings.DRAIN_SEND_TIMEOUT_SECONDS,
+    )
+    await manager.close_all(timeout=settings.DRAIN_SEND_TIMEOUT_SECONDS)
+    drain_report["call_sessions_flushed"] = await call_session_writer.flush()
+
+    logger.info(f"Signaling drained: {drain_report}")
+    return drain_report
+
+
+async def handle_frame(frame: Dict[str, Any], user_id: int, inbound: InboundPipeline) -> None:
+    """
+    Parse one inbound ASGI WebSocket message and submit it for handling
+
+    The message is handled by the connection's inbound pipeline, in order
+    with earlier messages to the same peer (see ordering_key). Sampled
+    frames get a correlation id, which is the trace id of a ws.frame span
+    with ws.receive and ws.parse children; handling the frame is traced
+    as a ws.dispatch span of the same trace, and sends made while
+    handling it as ws.queue and ws.send spans. Unsampled frames skip the
+    spans.
+    """
+    if frame["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(frame.get("code", status.WS_1000_NORMAL_CLOSURE))
+
+    root = tracer.start_trace("ws.frame", user_id=user_id)
+    if root is None:
+        text = frame.get("text")
+        data = json.loads(text if text is not None else frame["bytes"].decode("utf-8"))
+        await inbound.submit(data, ordering_key(data))
+        return
+
+    with root:
+        with tracer.span("ws.receive"):
+            text = frame.get("text")
+            if text is None:
+                text = frame["bytes"].decode("utf-8")
+        with tracer.span("ws.parse", size=len(text)):
+            data = json.loads(text)
+        if isinstance(data, dict):
+            root.set_attribute("message_type", str(data.get("type")))
+        await inbound.submit(data, ordering_key(data), root)
+
+
+def new_inbound_pipeline(user_id: int) -> InboundPipeline:
+    """Create the inbound pipeline of a user's socket"""
+    def on_error(error: Exception) -> None:
+        logger.error(f"Error handling message from user {user_id}: {error}")
+
+    return InboundPipeline(
+        lambda message: signaling.handle_message(message, user_id),
+        on_error=on_error,
+        max_pending=settings.INBOUND_MAX_PENDING,
+    )
+
+
+async def reject_overloaded(websocket: WebSocket, retry_after: float) -> None:
+    """
+    Turn a socket away with a retry hint
+
+    The socket is accepted first: a close before the handshake completes
+    reaches the client as a failed handshake, without code or hint.
+    """
+    try:
+        await websocket.accept()
+        await websocket.send_json({
+            "type": "reconnect",
+            "reason": "overloaded",
+            "delay_ms": int(retry_after * 1000),
+        })
+        await websocket.close(
+            code=status.WS_1013_TRY_AGAIN_LATER,
+            reason=f"retry-after={math.ceil(retry_after)}",
+        )
+    except Exception as e:
+        logger.debug(f"Failed to reject socket: {e}")
 
 
 @router.websocket("/ws")
 async def websocket_endpoint(
     websocket: WebSocket,
-    user_id: int = Query(..., gt=0, description="User ID for this connection"),
-    db: AsyncSession = Depends(get_db_session)
+    token: str = Query(..., description="Access token issued by /auth/telegram"),
 ):
     """
     WebSocket endpoint for WebRTC signaling
 
+    The user is identified by the access token passed as a query
+    parameter, since browsers cannot set headers on WebSocket handshakes.
+
     Handles:
     - join-room: Join a call room
     - offer: WebRTC offer (SDP)
     - answer: WebRTC answer (SDP)
     - ice-candidate: ICE candidate exchange
     - leave-room: Leave a call room
+    - call-stats: Report call quality for peers in a room
+    - call-invite: Invite users to a room the sender is in
+    - subscribe-rooms: Get rooms-snapshot, then room-opened, room-closed
+      and room-participants-changed events with sequence numbers
+    - unsubscribe-rooms: Stop getting room list events
+
+    The server assigns the offerer of every peer pair: a newcomer gets
+    room-users with offer_to, peers already in the room get user-joined
+    and wait for its offer, and rooms are limited to SIGNALING_MAX_MESH_SIZE participants.
+
+    While the process is draining, new sockets are closed with 1012 so
+    that clients retry against the next process. While it is overloaded
+    or a reconnect storm exceeds ADMISSION_ACCEPTS_PER_SECOND, new sockets
+    get a reconnect hint with a jittered delay and are closed with 1013;
+    users rejoining a call kept over a restart are always admitted.
     """
-    # Update user status to online in database
-    user_repo = UserRepositoryImpl(db)
-    try:
-        await user_repo.update_online_status(user_id, True)
-        await db.commit()
-    except Exception as e:
-        logger.error(f"Failed to set user {user_id} online: {e}")
+    if manager.draining:
+        await websocket.close(code=status.WS_1012_SERVICE_RESTART)
+        return
+
+    user_id = get_user_id_from_token(token)
+    if user_id is None:
+        logger.warning("Rejected WebSocket connection with invalid token")
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    if not manager.has_restored_rooms(user_id):
+        retry_after = admission.admit()
+        if retry_after is not None:
+            await reject_overloaded(websocket, retry_after)
+            return
 
     await manager.connect(websocket, user_id)
+    presence.record(user_id, True)
+    inbound = new_inbound_pipeline(user_id)
 
     try:
         # Send welcome message
-        await websocket.send_json({
+        await manager.send_personal_message({
             "type": "connected",
             "user_id": user_id,
-            "message": "WebSocket connected successfully"
-        })
+            "message": "WebSocket connected successfully",
+            # Rooms kept from before a server restart
+            "rooms": [str(room_id) for room_id in manager.claim_restored_rooms(user_id)],
+        }, user_id)
 
-        # Message handling loop
+        # Message handling loop; handling runs in the inbound pipeline
         while True:
-            data = await websocket.receive_json()
-            await signaling.handle_message(data, user_id)
+            await handle_frame(await websocket.receive(), user_id, inbound)
 
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected: user_id={user_id}")
+        await inbound.close(timeout=settings.INBOUND_DRAIN_TIMEOUT_SECONDS)
         manager.disconnect(user_id)
-        # Update user status to offline
-        try:
-            await user_repo.update_online_status(user_id, False)
-            await db.commit()
-        except Exception as e:
-            logger.error(f"Failed to set user {user_id} offline: {e}")
+        room_feed.unsubscribe(user_id)
+        call_sessions.on_disconnect(user_id)
+        negotiation.on_disconnect(user_id)
+        presence.record(user_id, False)
     except Exception as e:
         logger.error(f"WebSocket error for user {user_id}: {e}")
+        await inbound.close(timeout=settings.INBOUND_DRAIN_TIMEOUT_SECONDS)
         manager.disconnect(user_id)
-        # Update user status to offline
-        try:
-            await user_repo.update_online_status(user_id, False)
-            await db.commit()
-        except Exception as e:
-            logger.error(f"Failed to set user {user_id} offline: {e}")
+        room_feed.unsubscribe(user_id)
+        call_sessions.on_disconnect(user_id)
+        negotiation.on_disconnect(user_id)
+        presence.record(user_id, False)
         raise
 
 
-@router.get("/ws/stats")
+@router.get("/ws/stats", dependencies=[Depends(require_admin_token)])
 async def get_websocket_stats():
     """Get WebSocket connection statistics"""
     return {
+        "draining": manager.draining,
         "online_users": manager.get_online_users_count(),
-        "active_rooms": manager.get_active_rooms_count()
+        "active_rooms": manager.get_active_rooms_count(),
+        "active_calls": call_sessions.active_count,
+        "pending_call_session_writes": call_session_writer.pending,
+        "admission": admission.stats(),
+        "outbound": manager.outbound_stats(),
+        "presence": presence.stats(),
+        "call_stats": call_stats.stats(),
+        "negotiation": negotiation.stats(),
+        "notifications": notifications.stats(),
+        "room_feed": room_feed.stats(),
+        "last_reconcile": reconciler.last_report.to_dict() if reconciler.last_report else None
     }
+
+
+@router.post("/ws/drain", dependencies=[Depends(require_admin_token)])
+async def drain_signaling():
+    """
+    Drain signaling before a restart
+
+    Call from the deploy's pre-stop step, before the process receives
+    SIGTERM: the server closes remaining sockets itself on shutdown,
+    before the application gets a chance to drain them.
+    """
+    return await drain()
+
+
+@router.get("/ws/rooms/{room_id}/call-stats")
+async def get_room_call_stats(
+    room_id: UUID = Path(..., description="Room ID"),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    """
+    Get call quality of a room
+
+    Returns p50/p95 of RTT, jitter, packet loss and bitrate reported via
+    call-stats messages, for the whole room and for each peer pair.
+    Only users in the room, or who reported stats for it, may read them;
+    stats are dropped once the room is empty.
+    """
+    if (
+        current_user_id not in manager.get_room_participants(room_id)
+        and not call_stats.has_reporter(room_id, current_user_id)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not a participant of this room"
+        )
+    summary = call_stats.get_room_summary(room_id)
+    if summary is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No call stats for room {room_id}"
+        )
+    return summary
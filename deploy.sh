@@ -118,9 +118,24 @@ stop() {
     log_info "Services stopped."
 }
 
+# Hand signaling sockets over before the backend stops: clients get a
+# jittered reconnect hint and room membership is saved to Redis
+drain_backend() {
+    log_info "Draining backend signaling..."
+    docker-compose -f $COMPOSE_FILE exec -T backend python -c "
+import os, urllib.request
+request = urllib.request.Request(
+    'http://localhost:8000/ws/drain', method='POST',
+    headers={'X-Admin-Token': os.environ.get('ADMIN_TOKEN', '')},
+)
+print(urllib.request.urlopen(request, timeout=30).read().decode())
+" || log_warn "Drain failed (is ADMIN_TOKEN set?), restarting without it"
+}
+
 # Restart services
 restart() {
     log_info "Restarting services..."
+    drain_backend
     docker-compose -f $COMPOSE_FILE restart
     log_info "Services restarted."
 }
@@ -174,7 +189,9 @@ update() {
     # Rebuild and restart
     log_info "Rebuilding services..."
     export $(cat .env | grep -v '^#' | xargs)
-    docker-compose -f $COMPOSE_FILE up -d --build
+    docker-compose -f $COMPOSE_FILE build
+    drain_backend
+    docker-compose -f $COMPOSE_FILE up -d
 
     log_info "Update completed!"
 }
@@ -23,12 +23,6 @@ export const TelegramProvider: React.FC<TelegramProviderProps> = ({
   useEffect(() => {
     const initializeTelegram = async () => {
       try {
-        // Load ICE servers from backend
-        console.log('[TelegramProvider] Loading ICE servers from backend')
-        const iceServers = await configApi.getConfig()
-        console.log('[TelegramProvider] ICE servers loaded:', iceServers)
-        setIceServers(iceServers)
-
         // Initialize Telegram SDK
         telegramSDK.init()
 
@@ -48,12 +42,20 @@ export const TelegramProvider: React.FC<TelegramProviderProps> = ({
             created_at: new Date().toISOString(),
           }
           setCurrentUser(mockUser)
+          setIceServers(await configApi.getConfig())
           setIsInitialized(true)
           return
         }
 
         // Authenticate with backend
         const authResponse = await authApi.telegramAuth(userData)
+        localStorage.setItem('auth_token', authResponse.access_token)
+
+        // Load ICE servers from backend (TURN credentials are issued per user)
+        console.log('[TelegramProvider] Loading ICE servers from backend')
+        const iceServers = await configApi.getConfig()
+        console.log('[TelegramProvider] ICE servers loaded:', iceServers)
+        setIceServers(iceServers)
 
         // Set current user
         setCurrentUser({
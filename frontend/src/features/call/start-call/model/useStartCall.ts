@@ -34,6 +34,14 @@ export function useStartCall() {
         room_id: room_id,
       })
 
+      // Ring the callee; if they are offline the bot messages them in Telegram
+      wsClient.send({
+        type: 'call-invite',
+        room_id: room_id,
+        target_user_id: targetUserId,
+        video_enabled: videoEnabled,
+      })
+
       // Step 3: Get user media (audio always, video optional)
       const localStream = await mediaStreamManager.getUserMedia({
         audio: true,
@@ -223,6 +223,41 @@ export const CallPage: React.FC = () => {
             }
             break
 
+          case 'room-users':
+            // The server picks who offers; offer to the peers it assigned to us
+            for (const { user_id, delay_ms } of message.offer_to ?? []) {
+              if (!peerConnection || user_id !== remoteUserId) {
+                continue
+              }
+              console.log(`[CallPage] Offering to user ${user_id} in ${delay_ms}ms`)
+              setTimeout(async () => {
+                try {
+                  const offer = await peerConnection.createOffer()
+                  wsClient.send({
+                    type: 'offer',
+                    room_id: roomId ?? undefined,
+                    target_user_id: user_id,
+                    sdp: offer,
+                    video_enabled: useCallStore.getState().isVideoEnabled,
+                  })
+                } catch (error) {
+                  console.error('[CallPage] Error creating assigned offer:', error)
+                }
+              }, delay_ms)
+            }
+            break
+
+          case 'offer-collision':
+            // Our offer crossed the peer's; the server forwards theirs and we answer it
+            console.log('[CallPage] Offer collided with offer of user', message.target_user_id)
+            break
+
+          case 'room-full':
+            console.log('[CallPage] Room is full:', message.max_participants)
+            useCallStore.getState().setError('Комната заполнена')
+            useCallStore.getState().setStatus('failed')
+            break
+
           case 'user-left':
             // Other user left, end call
             console.log('[CallPage] Other user left the call')
@@ -28,6 +28,14 @@ export const usersApi = {
     )
     return response.users
   },
+  // One request and one query for all users of a room
+  getUsers: async (ids: number[]) => {
+    if (ids.length === 0) return []
+    const response = await httpClient.get<{ users: User[]; total: number }>(
+      `${API_ENDPOINTS.users.list}?ids=${ids.join(',')}`
+    )
+    return response.users
+  },
   listOnlineUsers: async () => {
     const response = await httpClient.get<{ users: User[]; total: number }>(
       API_ENDPOINTS.users.online
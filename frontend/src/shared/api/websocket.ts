@@ -13,13 +13,16 @@ class WebSocketClient {
   private reconnectAttempts = 0
   private maxReconnectAttempts = 5
   private reconnectDelay = 1000
+  // Delay requested by the server before it restarts or when it is overloaded
+  private reconnectHintMs: number | null = null
   private userId: number | null = null
 
   connect(userId: number): Promise<void> {
     return new Promise((resolve, reject) => {
       try {
         this.userId = userId
-        const wsUrl = `${API_ENDPOINTS.websocket}?user_id=${userId}`
+        const token = localStorage.getItem('auth_token') ?? ''
+        const wsUrl = `${API_ENDPOINTS.websocket}?token=${encodeURIComponent(token)}`
         this.ws = new WebSocket(wsUrl)
 
         this.ws.onopen = () => {
@@ -31,6 +34,9 @@ class WebSocketClient {
         this.ws.onmessage = (event) => {
           try {
             const message: WebSocketMessage = JSON.parse(event.data)
+            if (message.type === 'reconnect') {
+              this.reconnectHintMs = message.delay_ms ?? 0
+            }
             this.notifyHandlers(message)
           } catch (error) {
             console.error('Failed to parse WebSocket message:', error)
@@ -44,7 +50,11 @@ class WebSocketClient {
 
         this.ws.onclose = () => {
           console.log('WebSocket closed')
-          this.attemptReconnect()
+          if (this.reconnectHintMs !== null) {
+            this.reconnectAfterRestart(this.reconnectHintMs)
+          } else {
+            this.attemptReconnect()
+          }
         }
       } catch (error) {
         reject(error)
@@ -83,6 +93,24 @@ class WebSocketClient {
     })
   }
 
+  /**
+   * Reconnect after the jittered delay sent by a draining or overloaded
+   * server, so that clients do not all reconnect at once
+   */
+  private reconnectAfterRestart(delayMs: number) {
+    this.reconnectHintMs = null
+    this.reconnectAttempts = 0
+    console.log(`Server asked to reconnect in ${delayMs}ms...`)
+
+    setTimeout(() => {
+      if (this.userId !== null) {
+        this.connect(this.userId).catch((error) => {
+          console.error('Reconnect failed:', error)
+        })
+      }
+    }, delayMs)
+  }
+
   private attemptReconnect() {
     if (
       this.reconnectAttempts < this.maxReconnectAttempts &&
@@ -130,6 +130,7 @@ class TelegramSDK {
       first_name: user.first_name,
       last_name: user.last_name,
       photo_url: user.photo_url,
+      init_data: this.webApp.initData,
     }
   }
 
@@ -64,7 +64,12 @@ export type WebSocketMessageType =
   | 'ice-candidate'
   | 'user-joined'
   | 'user-left'
+  | 'room-users'
+  | 'room-full'
+  | 'offer-collision'
   | 'call-rejected'
+  | 'reconnect'
+  | 'call-invite'
 
 export interface WebSocketMessage {
   type: WebSocketMessageType
@@ -75,6 +80,16 @@ export interface WebSocketMessage {
   sdp?: RTCSessionDescriptionInit
   candidate?: RTCIceCandidateInit
   video_enabled?: boolean
+  // reconnect: wait this long before reconnecting
+  delay_ms?: number
+  // reconnect: 'server-restart' or 'overloaded'
+  reason?: string
+  // room-users: participants already in the room
+  users?: number[]
+  // room-users: peers this client must send offers to, after delay_ms each
+  offer_to?: { user_id: number; delay_ms: number }[]
+  // room-full: participant limit of the room
+  max_participants?: number
 }
 
 // API Response types
@@ -95,6 +110,7 @@ export interface TelegramAuthData {
   first_name: string
   last_name?: string
   photo_url?: string
+  init_data?: string
 }
 
 export interface AuthResponse {
@@ -103,4 +119,6 @@ export interface AuthResponse {
   username?: string
   display_name: string
   is_new_user: boolean
+  access_token: string
+  token_type: string
 }